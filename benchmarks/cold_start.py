@@ -0,0 +1,85 @@
+"""Cold time-to-first-paint of a freshly started server on a synthetic era.
+
+Each measurement starts ``streamlit run`` in a new process (as after a
+container restart), opens one session of ``app.py`` over the websocket and
+records:
+
+* ready: until the server answers its health check;
+* paint: until the first element of the page arrives;
+* done: until the Home page run finished (leaderboards drawn).
+
+Runs are made without and then with the era's derived-data snapshot
+(``cricket_vision.derived``); ``--compare REV`` adds a checkout of ``REV``::
+
+    python benchmarks/cold_start.py --tier large --compare HEAD~1
+"""
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.interaction_cpu import Session, free_port, start_server  # noqa: E402
+from benchmarks.page_latency import TIERS, synthetic_era  # noqa: E402
+from cricket_vision.derived import ARTIFACT_DIRNAME  # noqa: E402
+from cricket_vision.session import DEFAULT_ERA  # noqa: E402
+
+
+def first_paint(app_dir, data_dir):
+    port = free_port()
+    start = time.perf_counter()
+    proc = start_server(app_dir, data_dir, port)
+    ready = time.perf_counter() - start
+    try:
+        session = Session(port)
+        session.rerun()
+        done = time.perf_counter() - start
+        paint = session.first_delta_at - start
+        session.close()
+    finally:
+        proc.terminate()
+        proc.wait()
+    return ready, paint, done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tier", choices=list(TIERS), default="large")
+    parser.add_argument("--compare", metavar="REV", help="also measure this git revision")
+    args = parser.parse_args()
+
+    from cricket_vision.store import build_store
+
+    n_players, n_matches, n_bbb = TIERS[args.tier]
+    data_dir = Path(tempfile.mkdtemp(prefix=f"cv-cold-{args.tier}-"))
+    print(f"Building {args.tier} era ({n_players:,} players)...", flush=True)
+    build_store({DEFAULT_ERA: synthetic_era(n_players, n_matches, n_bbb)}, data_dir=data_dir)
+
+    runs = [("working tree, no snapshot", ROOT, True), ("working tree, snapshot", ROOT, False)]
+    worktree = None
+    if args.compare:
+        worktree = tempfile.mkdtemp(prefix="cv-cold-rev-")
+        subprocess.run(["git", "-C", str(ROOT), "worktree", "add", "--detach", worktree, args.compare],
+                       check=True, stdout=subprocess.DEVNULL)
+        runs.insert(0, (args.compare, Path(worktree), True))
+
+    print(f"\n{'':30s}{'ready s':>10s}{'paint s':>10s}{'done s':>10s}")
+    try:
+        for name, app_dir, clear in runs:
+            # The Arrow table snapshot is kept throughout: only derived data is under test.
+            if clear:
+                shutil.rmtree(data_dir / ARTIFACT_DIRNAME / "derived", ignore_errors=True)
+            ready, paint, done = first_paint(app_dir, data_dir)
+            print(f"{name:30s}{ready:10.2f}{paint:10.2f}{done:10.2f}", flush=True)
+    finally:
+        if worktree:
+            subprocess.run(["git", "-C", str(ROOT), "worktree", "remove", "--force", worktree], check=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Lookup latency while one era is reloaded after its files change.
+
+Writes two synthetic eras (see ``page_latency.py``) to a temporary store,
+warms the resources a page session uses for both, then rewrites the first
+era's files while a reader thread keeps looking both eras up through
+``cricket_vision.session``. Reports how long the watcher took to switch
+the era to its new version and the lookup latencies on each side of the
+switch; lookups never wait on the rebuild, so only GIL contention with it
+shows up::
+
+    python benchmarks/era_refresh.py --tier medium
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.page_latency import TIERS, synthetic_era
+
+CHANGED, OTHER = "benchA", "benchB"
+
+
+def session_reads(session, key, team):
+    session.get_derived(key).leaderboards
+    session.get_match_season_span(key)
+    session.run_query(key, "team_venues", team=team)
+    session.get_winprob_table(key)
+    session.get_h2h_matrix_figure(key)
+    session.get_similarity_index()
+
+
+def summary(times):
+    ms = np.array(times) * 1000
+    return f"{len(ms):6d} lookups  p50 {np.median(ms):7.3f}  p99 {np.percentile(ms, 99):7.3f}  max {ms.max():7.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tier", choices=list(TIERS), default="medium")
+    parser.add_argument("--interval", type=float, default=0.2, help="watcher poll interval, seconds")
+    args = parser.parse_args()
+
+    data_dir = Path(tempfile.mkdtemp(prefix=f"cv-refresh-{args.tier}-"))
+    os.environ["CRICKET_VISION_DATA_DIR"] = str(data_dir)
+    os.environ["CRICKET_VISION_WATCH_SECONDS"] = str(args.interval)
+    logging.disable(logging.WARNING)  # Streamlit's bare-mode warnings
+
+    from cricket_vision import session
+    from cricket_vision.store import write_era
+
+    print(f"Building two {args.tier} eras...", flush=True)
+    for order, key in enumerate((CHANGED, OTHER)):
+        write_era(key, synthetic_era(*TIERS[args.tier], seed=order), data_dir=data_dir, order=order)
+    teams = {key: session.get_era(key).teams[0] for key in (CHANGED, OTHER)}
+    start = time.perf_counter()
+    for key in (CHANGED, OTHER):
+        session_reads(session, key, teams[key])
+    print(f"Cold load of both eras: {time.perf_counter() - start:.2f} s")
+
+    old_version = session.RESOURCES.version(CHANGED)
+    times = {(key, phase): [] for key in (CHANGED, OTHER) for phase in ("before switch", "after switch")}
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            for key in (CHANGED, OTHER):
+                phase = "before switch" if session.RESOURCES.version(CHANGED) == old_version else "after switch"
+                start = time.perf_counter()
+                session_reads(session, key, teams[key])
+                times[key, phase].append(time.perf_counter() - start)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    session.get_watcher()
+    time.sleep(0.5)
+    write_era(CHANGED, synthetic_era(*TIERS[args.tier], seed=7), data_dir=data_dir, order=0)
+    start = time.perf_counter()
+    while session.RESOURCES.version(CHANGED) == old_version:
+        time.sleep(0.01)
+    print(f"{CHANGED} rewritten; switched to the new version after {time.perf_counter() - start:.2f} s "
+          f"(two polls of {args.interval} s, then hashing and rebuilding)")
+    time.sleep(0.5)
+    done.set()
+    thread.join()
+
+    for (key, phase), samples in times.items():
+        print(f"{key} {phase:14s}{summary(samples)}")
+
+
+if __name__ == "__main__":
+    main()
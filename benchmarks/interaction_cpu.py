@@ -0,0 +1,214 @@
+"""Server CPU per widget interaction, measured against a real Streamlit server.
+
+``streamlit.testing.v1.AppTest`` reruns the whole script even when the
+changed widget lives in an ``st.fragment``, so it cannot show what fragments
+save. This benchmark instead starts ``streamlit run`` on a synthetic era
+(see ``page_latency.py``) and talks to it over the same websocket protocol
+the browser uses:
+
+1. open a session and go to a page (the era is stored under the default
+   era key, so a fresh session starts on it);
+2. find the widget by its label, along with the fragment it belongs to;
+3. flip it between two values ``--interactions`` times, sending the
+   fragment id like the browser does, and wait for each run to finish.
+
+Per interaction it reports the wall time until the run finished and the
+server's CPU time (user + system, from ``/proc``; Linux only). With
+``--compare REV`` the same interactions also run against a checkout of
+``REV`` (a temporary ``git worktree``) on the same data::
+
+    python benchmarks/interaction_cpu.py --tier medium --compare HEAD~1
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.page_latency import RESULTS_DIR, TIERS, synthetic_era  # noqa: E402
+from cricket_vision.session import DEFAULT_ERA  # noqa: E402
+
+# (page url, widget label, widget state field, two values to flip between; None = first two options)
+INTERACTIONS = [
+    ("", "Player type", "string_array_value", (["Batsman"], ["Bowler"])),
+    ("Player_Analysis", "Select a Batsman", "string_value", None),
+    ("Match_Predictor", "Target", "int_value", (170, 190)),
+    ("Team_Strategy", "Select Team for Phase Analysis", "string_value", None),
+    ("Player_vs_Player", "Rank by", "string_value", None),
+]
+
+
+# --- Server ---
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app_dir, data_dir, port):
+    env = {**os.environ, "CRICKET_VISION_DATA_DIR": str(data_dir), "CRICKET_VISION_PROFILE": "0"}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(Path(app_dir) / "app.py"),
+         "--server.headless", "true", "--server.port", str(port), "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        cwd=app_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("streamlit server did not start")
+
+
+def cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+# --- Websocket client ---
+class Session:
+    def __init__(self, port):
+        from websockets.sync.client import connect
+
+        self.ws = connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"],
+                          max_size=None, open_timeout=30).__enter__()
+        self.widgets = {}  # label -> (widget proto, fragment id)
+        self.first_delta_at = None  # perf_counter() when the first element arrived
+
+    def rerun(self, page_name="", widgets=(), fragment_id=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.page_name = page_name
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.widget_states.widgets.extend(widgets)
+        self.ws.send(msg.SerializeToString())
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(self.ws.recv(timeout=600))
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and self.first_delta_at is None:
+                self.first_delta_at = time.perf_counter()
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                widget = getattr(element, element.WhichOneof("type"))
+                if hasattr(widget, "label") and hasattr(widget, "id"):
+                    self.widgets[widget.label] = (widget, fwd.delta.fragment_id)
+            elif kind == "script_finished":
+                if fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return fwd.script_finished
+
+    def set_widget(self, label, field, value, page_name=""):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget, fragment_id = self.widgets[label]
+        state = WidgetState(id=widget.id)
+        if field == "string_array_value":
+            state.string_array_value.data.extend(value)
+        else:
+            setattr(state, field, value)
+        return self.rerun(page_name, [state], fragment_id)
+
+    def close(self):
+        self.ws.close()
+
+
+def measure_interaction(port, pid, page, label, field, values, n):
+    session = Session(port)
+    try:
+        session.rerun()  # Home sets the session's era
+        if page:
+            session.rerun(page)
+        widget, fragment_id = session.widgets[label]
+        if values is None:
+            values = tuple(widget.options[:2])
+        for value in values:  # warm the caches for both values
+            session.set_widget(label, field, value, page)
+        wall, cpu = [], []
+        for i in range(n):
+            start_cpu, start = cpu_seconds(pid), time.perf_counter()
+            session.set_widget(label, field, values[i % 2], page)
+            wall.append(time.perf_counter() - start)
+            cpu.append(cpu_seconds(pid) - start_cpu)
+    finally:
+        session.close()
+    return {"page": page or "Home", "widget": label, "fragment": bool(fragment_id),
+            "wall_ms": statistics.median(wall) * 1000, "cpu_ms": sum(cpu) / n * 1000}
+
+
+def measure(app_dir, data_dir, n):
+    port = free_port()
+    proc = start_server(app_dir, data_dir, port)
+    try:
+        return [measure_interaction(port, proc.pid, page, label, field, values, n)
+                for page, label, field, values in INTERACTIONS]
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tier", choices=list(TIERS), default="medium")
+    parser.add_argument("--interactions", type=int, default=20)
+    parser.add_argument("--compare", metavar="REV", help="also measure this git revision")
+    args = parser.parse_args()
+
+    from cricket_vision.store import build_store
+
+    n_players, n_matches, n_bbb = TIERS[args.tier]
+    data_dir = Path(tempfile.mkdtemp(prefix=f"cv-interact-{args.tier}-"))
+    print(f"Building {args.tier} era ({n_players:,} players)...", flush=True)
+    build_store({DEFAULT_ERA: synthetic_era(n_players, n_matches, n_bbb)}, data_dir=data_dir)
+
+    runs = {"working tree": ROOT}
+    worktree = None
+    if args.compare:
+        worktree = tempfile.mkdtemp(prefix="cv-interact-rev-")
+        subprocess.run(["git", "-C", str(ROOT), "worktree", "add", "--detach", worktree, args.compare],
+                       check=True, stdout=subprocess.DEVNULL)
+        runs = {args.compare: Path(worktree), **runs}
+
+    results = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "tier": args.tier,
+               "interactions": args.interactions, "runs": {}}
+    try:
+        for name, app_dir in runs.items():
+            print(f"Measuring {name}...", flush=True)
+            results["runs"][name] = measure(app_dir, data_dir, args.interactions)
+    finally:
+        if worktree:
+            subprocess.run(["git", "-C", str(ROOT), "worktree", "remove", "--force", worktree], check=False)
+
+    print(f"\n{'page':18s}{'widget':34s}" + "".join(f"{name[:24]:>26s}" for name in runs))
+    print(f"{'':52s}" + "".join(f"{'cpu / wall ms':>26s}" for _ in runs))
+    for i, (page, label, _, _) in enumerate(INTERACTIONS):
+        row = f"{page or 'Home':18s}{label:34s}"
+        for name in runs:
+            stats = results["runs"][name][i]
+            cell = f"{stats['cpu_ms']:.0f} / {stats['wall_ms']:.0f}" + (" (fragment)" if stats["fragment"] else "")
+            row += f"{cell:>26s}"
+        print(row)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = RESULTS_DIR / f"interaction_cpu-{results['timestamp'].replace(':', '')}.json"
+    out_path.write_text(json.dumps(results, indent=2))
+    print(f"\nSaved {out_path.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Headless rerun latency of every page on synthetic eras of increasing size.
+
+Each tier generates one era in the nested ``get_datasets()`` layout, writes
+it to a temporary store and drives ``app.py`` and every page under
+``pages/`` through ``streamlit.testing.v1.AppTest`` in a fresh process:
+
+* cold: first run of the page with ``st.cache_resource`` cleared, so it
+  pays for loading the era and building its derived indexes;
+* warm: median of ``--warm-runs`` reruns of the same session;
+* peak: high-water resident memory while the page ran (Linux).
+
+Results are saved under ``benchmarks/results/`` and compared with the
+baseline in ``benchmarks/baselines/page_latency.json``; the script exits
+non-zero if a warm rerun got slower than ``--tolerance`` allows::
+
+    python benchmarks/page_latency.py --tiers small medium
+    python benchmarks/page_latency.py --tiers large --warm-runs 1 --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+BASELINE = ROOT / "benchmarks" / "baselines" / "page_latency.json"
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+ERA_KEY = "benchData"
+# tier -> (players, matches, matches with ball-by-ball data)
+TIERS = {
+    "small": (10, 100, 10),
+    "medium": (1_000, 10_000, 100),
+    "large": (50_000, 100_000, 1_000),
+}
+TEAMS = [f"Team {chr(ord('A') + i)}" for i in range(10)]
+VENUES = [f"Ground {i}" for i in range(20)]
+
+
+def pages():
+    return [ROOT / "app.py", *sorted((ROOT / "pages").glob("*.py"))]
+
+
+# --- Synthetic data ---
+def synthetic_era(n_players, n_matches, n_ball_by_ball, seed=0):
+    """One era in the ``get_datasets()`` layout (plus ``deliveries``)."""
+    rng = np.random.default_rng(seed)
+    types = rng.choice(["Batsman", "Bowler", "All-Rounder"], n_players, p=[0.5, 0.35, 0.15])
+    names = [f"Player {i:05d}" for i in range(n_players)]
+    bowlers = [name for name, t in zip(names, types) if t != "Batsman"] or names
+    first_season = 2008
+    players = {}
+    for name, ptype in zip(names, types):
+        n_seasons = int(rng.integers(1, 9))
+        start = first_season + int(rng.integers(0, 17 - n_seasons + 1))
+        wickets_seasons = ptype == "Bowler"
+        seasons = {start + j: int(rng.integers(5, 35) if wickets_seasons else rng.integers(100, 750))
+                   for j in range(n_seasons)}
+        stats = {}
+        if ptype != "Bowler":
+            stats.update(runs=int(rng.integers(200, 7000)), avg=round(float(rng.normal(30, 6)), 2),
+                         sr=round(float(rng.normal(135, 12)), 2), dismissals=int(rng.integers(10, 200)))
+        if ptype != "Batsman":
+            bowl = {"wickets": int(rng.integers(10, 180)), "econ": round(float(rng.normal(7.8, 0.6)), 2),
+                    "overs": round(float(rng.integers(50, 600)) + 0.1 * int(rng.integers(0, 6)), 1)}
+            bowl["bowl_avg" if ptype == "All-Rounder" else "avg"] = round(float(rng.normal(25, 4)), 2)
+            stats.update(bowl)
+        player = {"type": ptype, "seasons": seasons, "stats": stats}
+        if ptype != "Bowler":
+            faced = rng.choice(bowlers, min(5, len(bowlers)), replace=False)
+            player["h2h"] = {str(b): {"runs": int(r), "balls": int(r * 0.8 + 1), "dismissals": int(d)}
+                             for b, r, d in zip(faced, rng.integers(5, 150, len(faced)), rng.integers(0, 5, len(faced)))}
+        players[name] = player
+
+    pairs = rng.integers(0, len(TEAMS), (n_matches, 2))
+    pairs[:, 1] = (pairs[:, 0] + 1 + pairs[:, 1] % (len(TEAMS) - 1)) % len(TEAMS)
+    matches = [
+        {"match_id": i, "season": first_season + i * 17 // max(n_matches, 1),
+         "team1": TEAMS[a], "team2": TEAMS[b], "winner": TEAMS[a if rng.random() < 0.5 else b],
+         "venue": VENUES[int(rng.integers(len(VENUES)))]}
+        for i, (a, b) in enumerate(pairs)
+    ]
+
+    deliveries = []
+    for m in matches[:n_ball_by_ball]:
+        for innings, (bat, bowl) in enumerate(((m["team1"], m["team2"]), (m["team2"], m["team1"])), start=1):
+            runs = rng.choice([0, 1, 2, 3, 4, 6], 120, p=[0.38, 0.36, 0.07, 0.01, 0.12, 0.06])
+            wicket = rng.random(120) < 0.05
+            for ball in range(120):
+                deliveries.append({
+                    "match_id": m["match_id"], "innings": innings, "over": ball // 6, "ball": ball % 6 + 1,
+                    "batting_team": bat, "bowling_team": bowl,
+                    "batsman": names[int(rng.integers(n_players))], "bowler": bowlers[int(rng.integers(len(bowlers)))],
+                    "runs_batter": int(runs[ball]), "extras": 0, "legal": True, "is_wicket": bool(wicket[ball]),
+                })
+
+    return {
+        "name": f"Benchmark Era ({n_players:,} players)",
+        "teams": TEAMS,
+        "players": players,
+        "matches": matches,
+        "deliveries": deliveries,
+    }
+
+
+# --- Measurement (runs in a child process per tier) ---
+def peak_rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+def reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass  # peak then covers the whole process so far
+
+
+def measure_tier(tier, warm_runs):
+    n_players, n_matches, n_bbb = TIERS[tier]
+    data_dir = tempfile.mkdtemp(prefix=f"cv-bench-{tier}-")
+    os.environ["CRICKET_VISION_DATA_DIR"] = data_dir
+
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    from cricket_vision.store import build_store
+
+    start = time.perf_counter()
+    build_store({ERA_KEY: synthetic_era(n_players, n_matches, n_bbb)}, data_dir=Path(data_dir))
+    result = {"players": n_players, "matches": n_matches, "ball_by_ball_matches": n_bbb,
+              "build_store_s": time.perf_counter() - start, "pages": {}}
+
+    for page in pages():
+        st.cache_resource.clear()
+        reset_peak_rss()
+        at = AppTest.from_file(str(page), default_timeout=600)
+        at.session_state.active_data_key = ERA_KEY
+        start = time.perf_counter()
+        at.run()
+        cold = time.perf_counter() - start
+        warm = []
+        for _ in range(warm_runs):
+            start = time.perf_counter()
+            at.run()
+            warm.append(time.perf_counter() - start)
+        result["pages"][page.name] = {
+            "cold_ms": cold * 1000,
+            "warm_ms": statistics.median(warm) * 1000 if warm else None,
+            "peak_mb": peak_rss_mb(),
+            "errors": [str(e.value) for e in at.exception],
+        }
+    return result
+
+
+# --- Reporting ---
+def report(results):
+    tiers = list(results["tiers"])
+    print(f"\n{'page':34s}" + "".join(f"{t:>22s}" for t in tiers))
+    print(f"{'':34s}" + "".join(f"{'cold / warm ms':>22s}" for _ in tiers))
+    for page in pages():
+        row = f"{page.name:34s}"
+        for tier in tiers:
+            stats = results["tiers"][tier]["pages"].get(page.name)
+            cell = "-" if stats is None else f"{stats['cold_ms']:.0f} / {stats['warm_ms']:.0f}"
+            if stats and stats["errors"]:
+                cell += " !"
+            row += f"{cell:>22s}"
+        print(row)
+    peaks = [max(p["peak_mb"] or 0 for p in results["tiers"][t]["pages"].values()) for t in tiers]
+    print(f"{'peak RSS (MB)':34s}" + "".join(f"{p:>22.0f}" for p in peaks))
+
+
+def plot(results, path):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    tiers = list(results["tiers"])
+    sizes = [results["tiers"][t]["players"] for t in tiers]
+    for page in pages():
+        warm = [results["tiers"][t]["pages"].get(page.name, {}).get("warm_ms") for t in tiers]
+        fig.add_trace(go.Scatter(x=sizes, y=warm, mode="lines+markers", name=page.stem))
+    fig.update_layout(title="Warm rerun latency by era size", xaxis_title="Players", yaxis_title="ms",
+                      xaxis_type="log", yaxis_type="log")
+    fig.write_html(path)
+
+
+def regressions(results, baseline, tolerance, floor_ms):
+    found = []
+    for tier, tier_result in results["tiers"].items():
+        base_pages = baseline.get("tiers", {}).get(tier, {}).get("pages", {})
+        for page, stats in tier_result["pages"].items():
+            base = base_pages.get(page, {}).get("warm_ms")
+            now = stats["warm_ms"]
+            if base is None or now is None:
+                continue
+            if now > base * (1 + tolerance) and now - base > floor_ms:
+                found.append(f"{tier} {page}: warm {now:.0f} ms vs baseline {base:.0f} ms")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tiers", nargs="+", choices=list(TIERS), default=list(TIERS))
+    parser.add_argument("--warm-runs", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed warm slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--floor-ms", type=float, default=10.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--plot", action="store_true", help="also write an HTML scaling chart")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        Path(args.out).write_text(json.dumps(measure_tier(args.worker, args.warm_runs)))
+        return
+
+    results = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+               "machine": platform.machine(), "cpus": os.cpu_count(), "tiers": {}}
+    for tier in args.tiers:
+        print(f"Running tier {tier} ({TIERS[tier][0]:,} players, {TIERS[tier][1]:,} matches)...", flush=True)
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as out:
+            out_path = out.name
+        # A fresh process per tier keeps cold runs and peak memory honest.
+        subprocess.run([sys.executable, __file__, "--worker", tier, "--out", out_path,
+                        "--warm-runs", str(args.warm_runs)], check=True)
+        results["tiers"][tier] = json.loads(Path(out_path).read_text())
+        os.unlink(out_path)
+
+    report(results)
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = RESULTS_DIR / f"page_latency-{results['timestamp'].replace(':', '')}.json"
+    out_path.write_text(json.dumps(results, indent=2))
+    print(f"\nSaved {out_path.relative_to(ROOT)}")
+    if args.plot:
+        plot(results, out_path.with_suffix(".html"))
+
+    if args.save_baseline:
+        # Only the tiers just run are replaced, so the slow tier can be refreshed on its own.
+        baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {"tiers": {}}
+        baseline.update({k: v for k, v in results.items() if k != "tiers"})
+        baseline["tiers"].update(results["tiers"])
+        BASELINE.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE.write_text(json.dumps(baseline, indent=2))
+        print(f"Baseline updated: {BASELINE.relative_to(ROOT)}")
+    elif BASELINE.exists():
+        found = regressions(results, json.loads(BASELINE.read_text()), args.tolerance, args.floor_ms)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Time the per-era phase aggregation on a large synthetic delivery table.
+
+    python benchmarks/phase_aggregation.py --deliveries 1200000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cricket_vision.phases import build_phase_table
+from cricket_vision.store import SCHEMAS
+
+
+def synthetic_deliveries(n, n_teams=10, seed=0):
+    rng = np.random.default_rng(seed)
+    teams = np.array([f"Team {i}" for i in range(n_teams)])
+    balls_per_match = 240
+    n_matches = -(-n // balls_per_match)
+    batting = rng.integers(0, n_teams, n)
+    bowling = (batting + rng.integers(1, n_teams, n)) % n_teams
+    df = pd.DataFrame({
+        "match_id": np.repeat(np.arange(n_matches), balls_per_match)[:n],
+        "innings": np.tile(np.repeat([1, 2], 120), n_matches)[:n],
+        "over": np.tile(np.repeat(np.arange(20), 6), 2 * n_matches)[:n],
+        "ball": np.tile(np.arange(1, 7), 40 * n_matches)[:n],
+        "batting_team": teams[batting],
+        "bowling_team": teams[bowling],
+        "batsman": "batter",
+        "bowler": "bowler",
+        "runs_batter": rng.choice([0, 1, 2, 3, 4, 6], n, p=[0.38, 0.36, 0.08, 0.01, 0.12, 0.05]),
+        "extras": (rng.random(n) < 0.05).astype(int),
+        "legal": rng.random(n) > 0.03,
+        "is_wicket": rng.random(n) < 0.05,
+    })
+    return df.astype(SCHEMAS["deliveries"]), list(teams)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deliveries", type=int, default=1_200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    deliveries, teams = synthetic_deliveries(args.deliveries)
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        table = build_phase_table(deliveries, teams)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"{len(deliveries):,} deliveries, {len(table)} teams: "
+          f"best {min(timings):.1f} ms, median {sorted(timings)[len(timings) // 2]:.1f} ms")
+
+    start = time.perf_counter()
+    table[teams[0]]["batting"]
+    print(f"team lookup: {(time.perf_counter() - start) * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Memory held by an era's derived player structures, at 50k players by default.
+
+Builds a synthetic era (see ``page_latency.py``), writes its derived-data
+snapshot (``cricket_vision.derived``) and then, in a fresh interpreter,
+loads the snapshot the way a server process does. Reported per snapshot
+field, and for the whole snapshot:
+
+* MB: memory still allocated after loading (``tracemalloc``);
+* objects: Python objects the garbage collector tracks for it.
+
+A field is measured on its own, so names it shares with the roster count
+against it; the snapshot total counts them once. ``--compare REV`` measures
+a checkout of ``REV`` on the same era::
+
+    python benchmarks/player_memory.py --compare HEAD~1
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FIELDS = ("roster", "search", "player_lists", "player_groups", "leaderboards", "season_index", "matchup_matrix")
+
+
+def measure(code_root, data_dir, era_key):
+    """Runs in the child process, importing ``cricket_vision`` from ``code_root``."""
+    sys.path.insert(0, str(code_root))
+    import gc
+    import pickle
+    import tracemalloc
+
+    from cricket_vision.derived import load_or_build, snapshot_path
+    from cricket_vision.store import load_era
+
+    era = load_era(era_key, data_dir)
+    load_or_build(era, data_dir)  # make sure the snapshot exists
+    path = snapshot_path(era, data_dir)
+
+    def held(load):
+        gc.collect()
+        before = len(gc.get_objects())
+        tracemalloc.start()
+        start = time.perf_counter()
+        obj = load()
+        seconds = time.perf_counter() - start
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return obj, {"mb": size / 2**20, "objects": len(gc.get_objects()) - before, "seconds": seconds}
+
+    derived, results = held(lambda: pickle.loads(path.read_bytes()))
+    results = {"snapshot": results}
+    for field in FIELDS:
+        if hasattr(derived, field):
+            blob = pickle.dumps(getattr(derived, field), protocol=pickle.HIGHEST_PROTOCOL)
+            results[field] = held(lambda: pickle.loads(blob))[1]
+    return results
+
+
+def run_child(code_root, data_dir, era_key):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", str(code_root), str(data_dir), era_key],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        print(json.dumps(measure(*sys.argv[2:5])))
+        return
+
+    sys.path.insert(0, str(ROOT))
+    from benchmarks.page_latency import TIERS, synthetic_era
+    from cricket_vision.store import build_store
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tier", choices=list(TIERS), default="large")
+    parser.add_argument("--compare", metavar="REV", help="also measure this git revision")
+    args = parser.parse_args()
+
+    n_players, n_matches, n_bbb = TIERS[args.tier]
+    data_dir = Path(tempfile.mkdtemp(prefix=f"cv-player-mem-{args.tier}-"))
+    era_key = "benchData"
+    print(f"Building {args.tier} era ({n_players:,} players)...", flush=True)
+    build_store({era_key: synthetic_era(n_players, n_matches, n_bbb)}, data_dir=data_dir)
+
+    runs = {"working tree": ROOT}
+    worktree = None
+    if args.compare:
+        worktree = tempfile.mkdtemp(prefix="cv-player-mem-rev-")
+        subprocess.run(["git", "-C", str(ROOT), "worktree", "add", "--detach", worktree, args.compare],
+                       check=True, stdout=subprocess.DEVNULL)
+        runs = {args.compare: Path(worktree), **runs}
+
+    results = {}
+    try:
+        for name, code_root in runs.items():
+            print(f"Measuring {name} (builds its snapshot first)...", flush=True)
+            results[name] = run_child(code_root, data_dir, era_key)
+    finally:
+        if worktree:
+            subprocess.run(["git", "-C", str(ROOT), "worktree", "remove", "--force", worktree], check=False)
+
+    print(f"\n{'':16s}" + "".join(f"{name[:26]:>28s}" for name in runs))
+    print(f"{'':16s}" + "".join(f"{'MB / objects':>28s}" for _ in runs))
+    for field in ("snapshot",) + FIELDS:
+        row = f"{field:16s}"
+        for name in runs:
+            stats = results[name].get(field)
+            cell = f"{stats['mb']:.1f} / {stats['objects']:,}" if stats else "-"
+            row += f"{cell:>28s}"
+        print(row)
+    print(f"{'load s':16s}" + "".join(f"{results[name]['snapshot']['seconds']:>28.2f}" for name in runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Time building and querying the player search index at scale.
+
+Generates ``--players`` unique names in the archive's styles ("V Kohli",
+"Rohit Sharma", "RG Sharma 12"), builds the index, then times each query
+(the median of ``--repeats`` runs) against a 60% allowed-players mask, as a
+picker restricted to one player type would be.
+
+    python benchmarks/player_search.py --players 50000
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cricket_vision.search import RESULTS, PlayerSearch
+
+FIRST = ["Virat", "Rohit", "Ravindra", "Shikhar", "Kane", "Steve", "David", "Joe", "Ben", "Jos", "Quinton",
+         "Faf", "Rashid", "Trent", "Pat", "Mitchell", "Glenn", "Hardik", "Jasprit", "Ishan", "Shubman"]
+LAST = ["Kohli", "Sharma", "Jadeja", "Dhawan", "Williamson", "Smith", "Warner", "Root", "Stokes", "Buttler",
+        "de Kock", "du Plessis", "Khan", "Boult", "Cummins", "Starc", "Maxwell", "Pandya", "Bumrah", "Yadav",
+        "Gill", "Pant", "Samson", "Chahal", "Patel", "Singh", "Iyer", "Rahul", "Gayle", "de Villiers"]
+QUERIES = ["", "s", "sh", "sharma", "r sharma", "rg sharma", "sharma rg", "vk", "v kohli", "virat kohli",
+           "de kock", "a.b. de", "kohly", "pandya 12"]
+
+
+def synthetic_names(n, seed=0):
+    rng = np.random.default_rng(seed)
+    names = set()
+    while len(names) < n:
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        initials = "".join(rng.choice(list("ABCDEFGHJKLMNPRSTVY"), rng.integers(1, 3)))
+        style = rng.integers(3)
+        if style == 0:
+            names.add(f"{initials} {last}")
+        elif style == 1:
+            names.add(f"{first} {last} {rng.integers(100_000)}")
+        else:
+            names.add(f"{initials} {last} {rng.integers(1000)}")
+    return sorted(names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=50_000)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    names = synthetic_names(args.players)
+    start = time.perf_counter()
+    index = PlayerSearch(names)
+    print(f"build: {time.perf_counter() - start:.2f} s for {len(index):,} players")
+
+    allowed = np.random.default_rng(1).random(len(names)) < 0.6
+    print(f"\n{'query':16s}{'ms':>8s}  top matches (of up to {RESULTS})")
+    for query in QUERIES:
+        times = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            found = index.search(query, allowed=allowed)
+            times.append(time.perf_counter() - start)
+        print(f"{query!r:16s}{statistics.median(times) * 1000:8.3f}  {', '.join(found[:3])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Resident memory added by each extra browser session.
+
+Builds a scaled-up copy of the recorded seed eras in a temporary data directory, then
+opens ``--sessions`` headless sessions of ``app.py`` in this process (the same
+way a Streamlit server holds many sessions) and reports resident set size
+after each one. The per-session figure is the average growth after the first.
+
+``--compare REV`` also measures the tree at git revision ``REV`` (extracted
+with ``git archive``, its store built into the copy's own ``data/``), each
+tree in a fresh process, so a before/after figure can be reproduced::
+
+    python benchmarks/session_memory.py --players 20000 --sessions 8
+    python benchmarks/session_memory.py --players 50000 --sessions 6 --compare 1a5ef72^
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmRSS not available on this platform")
+
+
+def scaled_datasets(n_players):
+    """Clone every recorded seed player with a numeric suffix until each era has ``n_players``."""
+    from cricket_vision import seed
+
+    # Older trees have only get_datasets(), with every era hand-entered.
+    datasets = getattr(seed, "recorded_datasets", seed.get_datasets)()
+    for era in datasets.values():
+        seed_players = list(era["players"].items())
+        players = {}
+        for i in range(n_players):
+            name, data = seed_players[i % len(seed_players)]
+            players[f"{name} {i}"] = data
+        era["players"] = players
+        era["matches"] = era["matches"] * max(1, n_players // 10)
+    return datasets
+
+
+def measure(tree, data_dir, n_players, n_sessions, era):
+    os.environ["CRICKET_VISION_DATA_DIR"] = str(data_dir)
+    sys.path.insert(0, str(tree))
+
+    from cricket_vision.store import build_store
+    from streamlit.testing.v1 import AppTest
+
+    build_store(scaled_datasets(n_players), data_dir=Path(data_dir))
+
+    sessions, readings = [], []
+    for _ in range(n_sessions):
+        at = AppTest.from_file(str(Path(tree) / "app.py"), default_timeout=120)
+        at.session_state.active_data_key = era
+        at.run()
+        sessions.append(at)
+        readings.append(rss_mb())
+        print(f"sessions={len(sessions):3d}  rss={readings[-1]:8.1f} MB", flush=True)
+    return readings
+
+
+def run_tree(label, tree, data_dir, args):
+    print(f"{label} ({tree})", flush=True)
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as out:
+        out_path = out.name
+    subprocess.run([sys.executable, __file__, "--worker", str(tree), "--data-dir", str(data_dir), "--out", out_path,
+                    "--players", str(args.players), "--sessions", str(args.sessions), "--era", args.era], check=True)
+    readings = json.loads(Path(out_path).read_text())
+    os.unlink(out_path)
+    if len(readings) > 1:
+        per_session = (readings[-1] - readings[0]) / (len(readings) - 1)
+        print(f"~{per_session:.1f} MB resident per added session ({args.players} players/era)\n")
+        return per_session
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--era", default="modernData")
+    parser.add_argument("--compare", metavar="REV", help="also measure this git revision")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        readings = measure(args.worker, args.data_dir, args.players, args.sessions, args.era)
+        Path(args.out).write_text(json.dumps(readings))
+        return
+
+    results = {"working tree": run_tree("working tree", ROOT, tempfile.mkdtemp(prefix="cv-session-mem-"), args)}
+    if args.compare:
+        tree = Path(tempfile.mkdtemp(prefix="cv-session-mem-rev-"))
+        archive = subprocess.run(["git", "-C", str(ROOT), "archive", args.compare], check=True, capture_output=True)
+        subprocess.run(["tar", "-x", "-C", str(tree)], input=archive.stdout, check=True)
+        # Trees from before CRICKET_VISION_DATA_DIR only read their own data/.
+        results[args.compare] = run_tree(args.compare, tree, tree / "data", args)
+        for label, per_session in results.items():
+            print(f"{label:>16s}: ~{per_session:.1f} MB per added session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Time building and querying the similar-players index at scale.
+
+Generates ``--players`` synthetic players per era (with 3-10 seasons each)
+for ``--eras`` eras, builds the index, then times single-player queries and
+the blocked all-pairs ``query_many``.
+
+    python benchmarks/similar_players.py --players 20000 --eras 3
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cricket_vision.similar import SimilarityIndex
+
+
+class SyntheticEra:
+    def __init__(self, key, n_players, seed):
+        rng = np.random.default_rng(seed)
+        names = np.array([f"Player {key}-{i}" for i in range(n_players)], dtype=object)
+        kind = rng.choice(["Batsman", "Bowler", "All-Rounder"], n_players, p=[0.5, 0.35, 0.15])
+        bats, bowls = kind != "Bowler", kind != "Batsman"
+        self.key = self.name = key
+        self.players = pd.DataFrame({
+            "type": pd.Categorical(kind),
+            "runs": np.where(bats, rng.integers(100, 7000, n_players), np.nan),
+            "bat_avg": np.where(bats, rng.normal(30, 8, n_players), np.nan),
+            "sr": np.where(bats, rng.normal(135, 15, n_players), np.nan),
+            "dismissals": np.where(bats, rng.integers(5, 200, n_players), np.nan),
+            "wickets": np.where(bowls, rng.integers(5, 200, n_players), np.nan),
+            "econ": np.where(bowls, rng.normal(7.8, 0.8, n_players), np.nan),
+            "bowl_avg": np.where(bowls, rng.normal(26, 5, n_players), np.nan),
+            "overs": np.where(bowls, rng.integers(20, 600, n_players), np.nan),
+        }, index=pd.Index(names, name="player"))
+        n_seasons = rng.integers(3, 11, n_players)
+        player = np.repeat(names, n_seasons)
+        season = 2000 + np.concatenate([np.arange(n) for n in n_seasons])
+        self.seasons = pd.DataFrame({"player": player, "season": season,
+                                     "value": rng.integers(0, 700, len(player))})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=20000, help="players per era")
+    parser.add_argument("--eras", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    eras = [SyntheticEra(f"era{i}", args.players, seed=i) for i in range(args.eras)]
+    start = time.perf_counter()
+    index = SimilarityIndex.from_eras(eras)
+    print(f"build: {time.perf_counter() - start:.2f} s for {len(index):,} players")
+
+    rng = np.random.default_rng(0)
+    picks = rng.integers(0, len(index), args.queries)
+    for same_era in (True, False):
+        start = time.perf_counter()
+        for i in picks:
+            row = index.labels.iloc[i]
+            index.query(row["era"], row["player"], k=10, same_era=same_era)
+        per_query = (time.perf_counter() - start) / args.queries * 1000
+        print(f"query (same_era={same_era}): {per_query:.2f} ms")
+
+    start = time.perf_counter()
+    index.query_many(k=10)
+    print(f"query_many: {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Filtered aggregations: the era's SQLite file against pandas scans.
+
+Builds a synthetic era (see ``page_latency.py``) and its SQLite file
+(``cricket_vision.sqlstore``), then times each named query against the
+same aggregation done the way the pages otherwise would: mask the era
+DataFrames, then group. Times are the median of ``--repeats`` runs, and
+each pair of results is checked to agree::
+
+    python benchmarks/sql_queries.py --tier large
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.page_latency import TIERS, synthetic_era
+from cricket_vision import sqlstore
+from cricket_vision.store import build_store, load_era
+
+
+def in_seasons(df, first, last):
+    return df["season"].isna() | df["season"].between(first, last) if first is not None else pd.Series(True, df.index)
+
+
+def scan_team(era, team, first=None, last=None):
+    matches = era.matches
+    mask = ((matches["team1"] == team) | (matches["team2"] == team)) & in_seasons(matches, first, last)
+    played = matches[mask]
+    return pd.DataFrame({
+        "venue": played["venue"].astype(object),
+        "season": played["season"].astype(object),
+        "won": (played["winner"] == team).astype(int),
+    })
+
+
+def scan_team_venues(era, team, first=None, last=None):
+    return scan_team(era, team, first, last).groupby("venue")["won"].agg(["size", "sum"])
+
+
+def scan_team_seasons(era, team, first=None, last=None):
+    return scan_team(era, team, first, last).dropna(subset=["season"]).groupby("season")["won"].agg(["size", "sum"])
+
+
+def scan_player_venues(era, column, player, first=None, last=None):
+    balls = era.deliveries[era.deliveries[column] == player]
+    balls = balls.merge(era.matches[["match_id", "season", "venue"]], on="match_id", how="left")
+    balls = balls[in_seasons(balls, first, last)]
+    return balls.groupby(balls["venue"].astype(object)).agg(Matches=("match_id", "nunique"), Runs=("runs_batter", "sum"))
+
+
+def timed(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tier", choices=list(TIERS), default="medium")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    data_dir = Path(tempfile.mkdtemp(prefix=f"cv-sql-{args.tier}-"))
+    print(f"Building {args.tier} era...", flush=True)
+    build_store({"benchData": synthetic_era(*TIERS[args.tier])}, data_dir=data_dir)
+    era = load_era("benchData", data_dir)
+    start = time.perf_counter()
+    db = sqlstore.load_or_build(era, data_dir)
+    print(f"SQLite build: {time.perf_counter() - start:.2f} s, {db.path.stat().st_size / 2**20:.1f} MB")
+
+    team, batter, bowler = era.teams[0], str(era.deliveries["batsman"].iloc[0]), str(era.deliveries["bowler"].iloc[0])
+    first = int(era.matches["season"].min())
+    window = (first + 2, first + 5)
+    cases = [
+        ("team_venues", {"team": team}, lambda: scan_team_venues(era, team), "Matches", "size"),
+        ("team_venues", {"team": team, "first": window[0], "last": window[1]},
+         lambda: scan_team_venues(era, team, *window), "Matches", "size"),
+        ("team_seasons", {"team": team}, lambda: scan_team_seasons(era, team), "Won", "sum"),
+        ("batter_venues", {"player": batter}, lambda: scan_player_venues(era, "batsman", batter), "Runs", "Runs"),
+        ("bowler_venues", {"player": bowler, "first": window[0], "last": window[1]},
+         lambda: scan_player_venues(era, "bowler", bowler, *window), "Matches", "Matches"),
+    ]
+    print(f"\n{'query':16s}{'filter':>14s}{'pandas ms':>12s}{'sql ms':>10s}{'speedup':>10s}")
+    for name, params, scan, sql_column, scan_column in cases:
+        expected, scan_ms = timed(scan, args.repeats)
+        got, sql_ms = timed(lambda: db.query(name, **params), args.repeats)
+        assert sorted(got[sql_column].tolist()) == sorted(expected[scan_column].tolist()), name
+        seasons = f"{params['first']}-{params['last']}" if "first" in params else "all"
+        print(f"{name:16s}{seasons:>14s}{scan_ms:12.2f}{sql_ms:10.2f}{scan_ms / sql_ms:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Data layer and analytics engines behind the Cricket Vision pages."""
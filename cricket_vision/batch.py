@@ -0,0 +1,149 @@
+"""Score a file of match states offline with the Match Predictor models.
+
+Input is CSV or Parquet with columns ``score``, ``overs`` and ``wickets``,
+plus an optional ``target``. Every row gets ``projected_score`` (first-innings
+projection) with its range in ``projected_low`` / ``projected_high`` and, where a target is given, ``win_prob`` for the chasing side.
+Rows are read in chunks, scored across a process pool with a bounded number
+of chunks in flight, and written in input order, so memory stays flat however
+large the file is::
+
+    python -m cricket_vision.batch states.parquet -o scored.parquet --era modernData
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cricket_vision import projection
+from cricket_vision.predictor import chase_win_probability, project_first_innings
+from cricket_vision.store import DATA_DIR, load_era
+from cricket_vision.wptable import load_or_build, load_table, table_path
+
+REQUIRED_COLUMNS = ("score", "overs", "wickets")
+
+_table = None  # per worker process
+_projection = None
+
+
+def _init_worker(table_file, projection_file):
+    global _table, _projection
+    # The parent has already built the table and trained the projection for
+    # one version of the era, so this only memory-maps / loads those files.
+    _table = load_table(table_file)
+    _projection = projection.load_model(projection_file)
+
+
+def score_chunk(chunk, table=None, projection_model=None):
+    table = table if table is not None else _table
+    projection_model = projection_model if projection_model is not None else _projection
+    out = chunk.copy()
+    projected, low, high = project_first_innings(
+        chunk["score"].to_numpy(dtype=np.int64), chunk["overs"].to_numpy(dtype=np.float64),
+        chunk["wickets"].to_numpy(dtype=np.int64), projection_model,
+    )
+    out["projected_score"], out["projected_low"], out["projected_high"] = projected, low, high
+    if "target" in chunk:
+        has_target = chunk["target"].notna().to_numpy()
+        win_prob = np.full(len(chunk), np.nan)
+        if has_target.any():
+            rows = chunk[has_target]
+            win_prob[has_target] = chase_win_probability(
+                table, rows["target"].to_numpy(dtype=np.int64), rows["score"].to_numpy(dtype=np.int64),
+                rows["overs"].to_numpy(dtype=np.float64), rows["wickets"].to_numpy(dtype=np.int64),
+            )
+        out["win_prob"] = win_prob
+    return out
+
+
+def read_chunks(path, chunk_size):
+    path = Path(path)
+    if path.suffix == ".parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class _Writer:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._parquet = None
+        self._first = True
+
+    def write(self, df):
+        if self.path.suffix == ".parquet":
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def run(input_path, output_path, era_key, chunk_size=250_000, workers=None, data_dir=DATA_DIR):
+    """Score ``input_path`` into ``output_path``; returns ``(rows, seconds)``."""
+    # Build (or validate) the era's table once before any worker maps it.
+    era = load_era(era_key, data_dir)
+    load_or_build(era, data_dir)
+    projection.load_or_train(era, data_dir)
+    artifacts = (table_path(era, data_dir), projection.model_path(era, data_dir))
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    rows, start = 0, time.perf_counter()
+    # The writer is closed however the run ends, so a failed run still
+    # leaves a readable file of the rows scored so far.
+    with _Writer(output_path) as writer, ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=artifacts) as pool:
+        pending = deque()
+        for chunk in read_chunks(input_path, chunk_size):
+            missing = [c for c in REQUIRED_COLUMNS if c not in chunk]
+            if missing:
+                raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+            pending.append(pool.submit(score_chunk, chunk))
+            # Write finished chunks in order; never hold more than a few.
+            while len(pending) >= max_in_flight or (pending and pending[0].done()):
+                scored = pending.popleft().result()
+                writer.write(scored)
+                rows += len(scored)
+        for future in pending:
+            scored = future.result()
+            writer.write(scored)
+            rows += len(scored)
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score match states with the Match Predictor models.")
+    parser.add_argument("input", help="CSV or Parquet file of match states")
+    parser.add_argument("-o", "--output", required=True, help="output .csv or .parquet file")
+    parser.add_argument("--era", default="modernData", help="era whose ball-outcome and projection models to use")
+    parser.add_argument("--chunk-size", type=int, default=250_000)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    rows, seconds = run(args.input, args.output, args.era, chunk_size=args.chunk_size, workers=args.workers)
+    print(f"Scored {rows:,} rows in {seconds:.2f} s ({rows / max(seconds, 1e-9):,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Prebuilt snapshot of each era's derived structures.
+
+The roster (``roster.Roster``), the player search index, leaderboards, the
+season and matchup indexes, the phase table and the team ratings are all pure functions of an era's tables.
+Building them is most of a cold start on a large era (the leaderboards
+alone take seconds at 50k players), so they are built once, pickled to
+``data/.artifacts/derived/<era>-<version>-f<FORMAT>.pickle`` and loaded from
+there by every later process. ``version`` is the era's content hash
+(``store.era_version``), so a snapshot is rebuilt exactly when the data
+changes; ``FORMAT`` is bumped when any snapshotted class changes shape.
+
+Build them ahead of time (e.g. in the container image) with
+``python -m cricket_vision.derived [era ...]``.
+"""
+import gc
+import os
+import pickle
+import sys
+import tempfile
+from collections import namedtuple
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from cricket_vision.h2h import TeamH2HIndex
+from cricket_vision.leaderboards import Leaderboards
+from cricket_vision.matchups import MatchupMatrix
+from cricket_vision.phases import build_phase_table
+from cricket_vision.ratings import EloRatings
+from cricket_vision.roster import Roster
+from cricket_vision.search import PlayerSearch
+from cricket_vision.seasons import SeasonIndex
+from cricket_vision.store import BATTING_TYPES, BOWLING_TYPES
+
+FORMAT = 4
+ARTIFACT_DIRNAME = ".artifacts"
+
+# Bool arrays over roster ids: who each of the pages' player pickers offers.
+PlayerGroups = namedtuple("PlayerGroups", "batsmen bowlers batsmen_with_h2h")
+
+
+@dataclass(frozen=True)
+class Derived:
+    roster: Roster
+    search: PlayerSearch
+    player_groups: PlayerGroups
+    bowler_mask: object  # bool array over roster ids; season figures are wickets for these
+    leaderboards: Leaderboards
+    season_index: SeasonIndex
+    h2h_index: TeamH2HIndex
+    matchup_matrix: MatchupMatrix
+    phase_table: dict
+    ratings: EloRatings
+
+
+def player_groups(roster, h2h_batsmen):
+    is_batter = roster.type_mask(BATTING_TYPES)
+    return PlayerGroups(
+        batsmen=is_batter,
+        bowlers=roster.type_mask(BOWLING_TYPES),
+        batsmen_with_h2h=is_batter & pd.Index(roster.names).isin(h2h_batsmen),
+    )
+
+
+def build_derived(era):
+    roster = Roster.from_players(era.players)
+    matchup_matrix = MatchupMatrix.from_h2h(era.h2h)
+    # Everything indexed by roster id is taken before the leaderboards,
+    # which may add players that only appear in the seasons table.
+    search = PlayerSearch(list(roster.names))
+    groups = player_groups(roster, matchup_matrix.batsmen)
+    bowler_mask = roster.type_mask(("Bowler",))
+    season_index = SeasonIndex.from_seasons(pd.Index(roster.names), era.seasons)
+    return Derived(
+        roster=roster,
+        search=search,
+        player_groups=groups,
+        bowler_mask=bowler_mask,
+        leaderboards=Leaderboards.from_era(era, roster),
+        season_index=season_index,
+        h2h_index=TeamH2HIndex.from_matches(era.matches),
+        matchup_matrix=matchup_matrix,
+        phase_table=build_phase_table(era.deliveries, era.teams),
+        ratings=EloRatings.from_matches(era.matches),
+    )
+
+
+def snapshot_path(era, data_dir):
+    return Path(data_dir) / ARTIFACT_DIRNAME / "derived" / f"{era.key}-{era.version}-f{FORMAT}.pickle"
+
+
+def save_derived(derived, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(suffix=".pickle", dir=path.parent)
+    with os.fdopen(fd, "wb") as f:
+        pickle.dump(derived, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load_derived(path):
+    # The snapshot is millions of small objects; pausing the cyclic GC while
+    # they are created roughly halves the load time.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def load_or_build(era, data_dir):
+    """Load the era's snapshot, building and saving it first if the data changed."""
+    path = snapshot_path(era, data_dir)
+    if path.exists():
+        try:
+            return load_derived(path)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            pass  # unreadable or from older code under the same FORMAT: rebuild
+    derived = build_derived(era)
+    save_derived(derived, path)
+    return derived
+
+
+if __name__ == "__main__":
+    from cricket_vision.store import DATA_DIR, list_eras, load_era
+
+    for era_key in sys.argv[1:] or list(list_eras()):
+        era = load_era(era_key)
+        load_or_build(era, DATA_DIR)
+        print(f"{era_key}: {snapshot_path(era, DATA_DIR)}")
@@ -0,0 +1,125 @@
+"""Plotly figure builders for the pages.
+
+The builders are plain functions of the data. The Streamlit layer
+(``session.py``) caches their results per era and selection, so a rerun
+reuses the figure instead of rebuilding it. Data goes in as NumPy arrays,
+which Plotly serializes as compact base64 typed arrays instead of JSON
+number lists.
+
+The archetype scatter scales by switching representation:
+- up to ``LEGEND_LIMIT`` players: one coloured trace per player with a
+  legend, as before;
+- beyond that: one WebGL (``Scattergl``) trace per player type;
+- beyond ``MAX_POINTS``: only the highest run scorers are drawn as points,
+  and everyone else is aggregated server-side into a 2D density layer, so
+  the payload stops growing with the number of players.
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+LEGEND_LIMIT = 30
+MAX_POINTS = 2000
+DENSITY_BINS = 60
+BUBBLE_SIZE_MAX = 60
+
+
+def archetype_figure(players):
+    """Average vs strike rate bubbles (size = runs) for batting players ``players``.
+
+    ``players`` is indexed by name with ``bat_avg``, ``sr``, ``runs`` and ``type``.
+    """
+    title = "Batsman Archetypes: Average vs. Strike Rate"
+    avg = players["bat_avg"].to_numpy(dtype=np.float64, na_value=0.0)
+    sr = players["sr"].to_numpy(dtype=np.float64, na_value=0.0)
+    runs = players["runs"].to_numpy(dtype=np.float64, na_value=1.0)  # 1 keeps the bubble visible
+    names = players.index.to_numpy(dtype=object)
+
+    if len(players) <= LEGEND_LIMIT:
+        df = pd.DataFrame({"Player": names, "Average": avg, "Strike Rate": sr, "Runs": runs})
+        fig = px.scatter(df, x="Average", y="Strike Rate", size="Runs", color="Player",
+                         hover_name="Player", size_max=BUBBLE_SIZE_MAX, title=title)
+        fig.update_layout(height=500)
+        return fig
+
+    fig = go.Figure()
+    shown = np.arange(len(players))
+    if len(players) > MAX_POINTS:
+        shown = np.argpartition(-runs, MAX_POINTS)[:MAX_POINTS]
+        rest = np.setdiff1d(np.arange(len(players)), shown, assume_unique=True)
+        counts, x_edges, y_edges = np.histogram2d(avg[rest], sr[rest], bins=DENSITY_BINS)
+        fig.add_trace(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=np.where(counts.T > 0, counts.T, np.nan).astype(np.float32),
+            colorscale="Greys", showscale=False, opacity=0.6, name=f"Other {len(rest):,} players",
+            hovertemplate="Avg %{x:.1f}, SR %{y:.1f}: %{z:.0f} players<extra></extra>",
+        ))
+
+    sizeref = 2 * runs[shown].max() / BUBBLE_SIZE_MAX ** 2
+    types = players["type"].astype(object).to_numpy()
+    for player_type in pd.unique(types[shown]):
+        rows = shown[types[shown] == player_type]
+        fig.add_trace(go.Scattergl(
+            x=avg[rows].astype(np.float32), y=sr[rows].astype(np.float32), mode="markers", name=player_type,
+            hovertext=names[rows], hovertemplate="<b>%{hovertext}</b><br>Avg %{x:.2f}, SR %{y:.2f}<extra></extra>",
+            marker=dict(size=runs[rows].astype(np.float32), sizemode="area", sizeref=sizeref, sizemin=2,
+                        opacity=0.7, line=dict(width=0)),
+        ))
+    subtitle = f" (top {len(shown):,} by runs, others as density)" if len(shown) < len(players) else ""
+    fig.update_layout(title=title + subtitle, xaxis_title="Average", yaxis_title="Strike Rate", height=500)
+    return fig
+
+
+def season_figure(seasons, player, label, kind="line"):
+    """Per-season ``label`` for ``player`` from a ``season`` / ``value`` frame."""
+    df = seasons.set_axis(["Season", label], axis=1)
+    if kind == "bar":
+        fig = px.bar(df, x="Season", y=label, title=f"{label} per Season for {player}")
+    else:
+        fig = px.line(df, x="Season", y=label, title=f"{label} per Season for {player}", markers=True)
+    fig.update_layout(height=300)
+    return fig
+
+
+def h2h_pie(team1, team2, team1_wins, team2_wins):
+    win_data = pd.DataFrame({"Team": [team1, team2], "Wins": [team1_wins, team2_wins]})
+    fig = px.pie(
+        win_data,
+        names="Team",
+        values="Wins",
+        title=f"H2H Win Distribution: {team1} vs {team2}",
+        color="Team",
+        color_discrete_map={team1: "#2563EB", team2: "#F59E0B"},
+    )
+    fig.update_layout(height=350)
+    return fig
+
+
+def rating_history_figure(histories, base):
+    """Rating after each match for every team in ``histories`` (team -> ``EloRatings.history``)."""
+    fig = go.Figure()
+    for team, history in histories.items():
+        fig.add_trace(go.Scatter(
+            x=history["Match"].to_numpy(), y=history["Rating"].to_numpy(), mode="lines", name=team,
+            customdata=history["Season"].to_numpy(dtype=np.int32, na_value=0),  # typed array; 0 = unknown
+            hovertemplate=f"<b>{team}</b><br>Match %{{x}} (season %{{customdata}})<br>Rating %{{y:.0f}}<extra></extra>",
+        ))
+    fig.add_hline(y=base, line_dash="dot", line_color="grey")
+    fig.update_layout(title="Rating after each match", xaxis_title="Match (in played order)", yaxis_title="Rating",
+                      height=400)
+    return fig
+
+
+def outcome_donut(title, labels, values):
+    fig = go.Figure(data=[go.Pie(labels=labels, values=values, hole=.4,
+                                 marker_colors=["#a0aec0", "#4299e1", "#38b2ac", "#ed64a6"])])
+    fig.update_layout(title_text=title, height=400)
+    return fig
+
+
+def grid_heatmap(grid, height, **kwargs):
+    """``px.imshow`` of a labelled DataFrame grid (H2H and matchup matrices)."""
+    fig = px.imshow(grid, aspect="auto", **kwargs)
+    fig.update_layout(height=height)
+    return fig
@@ -0,0 +1,119 @@
+"""Team-pair head-to-head index.
+
+Match results are folded into per-pair tallies once per era, so a head-to-head
+lookup is a dict access instead of a scan over every match. Pairs are stored
+under their sorted team names, so ``(A, B)`` and ``(B, A)`` share one entry.
+"""
+from collections import Counter
+
+import pandas as pd
+
+
+class Tally:
+    __slots__ = ("total", "wins")
+
+    def __init__(self):
+        self.total = 0
+        self.wins = Counter()
+
+    def add(self, winner, n=1):
+        self.total += n
+        if winner:
+            self.wins[winner] += n
+
+
+class PairStats:
+    __slots__ = ("overall", "by_venue", "by_season")
+
+    def __init__(self):
+        self.overall = Tally()
+        self.by_venue = {}
+        self.by_season = {}
+
+
+def _pair_key(team1, team2):
+    return (team1, team2) if team1 <= team2 else (team2, team1)
+
+
+class TeamH2HIndex:
+    def __init__(self):
+        self._pairs = {}
+
+    @classmethod
+    def from_matches(cls, matches_df):
+        index = cls()
+        index.extend(matches_df)
+        return index
+
+    def _stats(self, team1, team2):
+        key = _pair_key(team1, team2)
+        stats = self._pairs.get(key)
+        if stats is None:
+            stats = self._pairs[key] = PairStats()
+        return stats
+
+    # --- Updates ---
+    def add_match(self, team1, team2, winner, venue=None, season=None):
+        """Fold one appended match into the index in O(1)."""
+        stats = self._stats(team1, team2)
+        stats.overall.add(winner)
+        if venue:
+            stats.by_venue.setdefault(venue, Tally()).add(winner)
+        if season is not None and not pd.isna(season):
+            stats.by_season.setdefault(int(season), Tally()).add(winner)
+
+    def extend(self, matches_df):
+        """Fold a batch of matches in with grouped counts rather than per-row updates."""
+        if matches_df.empty:
+            return
+        team1, team2 = matches_df["team1"].astype(str), matches_df["team2"].astype(str)
+        swap = team1 > team2
+        keyed = pd.DataFrame({
+            "a": team1.where(~swap, team2),
+            "b": team2.where(~swap, team1),
+            "winner": matches_df["winner"].astype(object),
+            "venue": matches_df["venue"].astype(object),
+            "season": matches_df["season"].astype(object),
+        })
+        keyed["winner"] = keyed["winner"].where(keyed["winner"].notna(), "")
+
+        counts = keyed.groupby(["a", "b", "winner"], sort=False).size()
+        for (a, b, winner), n in counts.items():
+            self._stats(a, b).overall.add(winner, n)
+        for field, attr in (("venue", "by_venue"), ("season", "by_season")):
+            counts = keyed.groupby(["a", "b", field, "winner"], sort=False, dropna=True).size()
+            for (a, b, value, winner), n in counts.items():
+                bucket = getattr(self._stats(a, b), attr)
+                if field == "season":
+                    value = int(value)
+                bucket.setdefault(value, Tally()).add(winner, n)
+
+    # --- Queries ---
+    def lookup(self, team1, team2):
+        """Totals and wins for both sides, or ``None`` if the teams never met."""
+        stats = self._pairs.get(_pair_key(team1, team2))
+        if stats is None:
+            return None
+        return {
+            "total": stats.overall.total,
+            "wins": {team1: stats.overall.wins[team1], team2: stats.overall.wins[team2]},
+            "by_venue": self._breakdown(stats.by_venue, team1, team2, "Venue"),
+            "by_season": self._breakdown(stats.by_season, team1, team2, "Season"),
+        }
+
+    @staticmethod
+    def _breakdown(buckets, team1, team2, label):
+        rows = [
+            {label: value, "Matches": tally.total, team1: tally.wins[team1], team2: tally.wins[team2]}
+            for value, tally in sorted(buckets.items())
+        ]
+        return pd.DataFrame(rows, columns=[label, "Matches", team1, team2])
+
+    def win_matrix(self, teams):
+        """Wins of each row team against each column team, read straight from the index."""
+        matrix = pd.DataFrame(0, index=list(teams), columns=list(teams), dtype="int64")
+        for (a, b), stats in self._pairs.items():
+            if a in matrix.index and b in matrix.index:
+                matrix.at[a, b] = stats.overall.wins[a]
+                matrix.at[b, a] = stats.overall.wins[b]
+        return matrix
@@ -0,0 +1,258 @@
+"""Tournament leaderboards kept in rank order.
+
+Every board is a list of ``(sort_key, player id)`` pairs held sorted with
+``bisect``, plus a dict of each entry's current key. Ingesting a
+performance moves only the entries it touches (a binary search and a list
+insert), and ``top(k)`` reads the first k entries, so a Home page rerun never sorts
+anything. Boards are kept separately per player type, so a type filter is a
+``heapq.merge`` of the chosen boards; team and season-range filters walk the
+merged order from the top and stop after ``k`` matches.
+
+Season values in the store are runs for batsmen and all-rounders and
+wickets for bowlers, so they feed ``season_runs`` and ``season_wickets``
+respectively.
+
+Names, types and career stats are held once, in the era's
+``roster.Roster``; boards refer to players by roster id, and season boards
+pack the player id and the season into one int per entry.
+"""
+import heapq
+import sys
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from cricket_vision.roster import INTEGER_STATS, NO_TYPE, STATS, TYPES, Roster
+
+# metric -> highest first?
+BOARDS = {
+    "runs": True,
+    "wickets": True,
+    "sr": True,
+    "bat_avg": True,
+    "econ": False,
+    "bowl_avg": False,
+}
+SEASON_BOARDS = ("season_runs", "season_wickets")
+# Rate stats only rank players with enough volume behind them.
+QUALIFIERS = {
+    "sr": ("runs", 250),
+    "bat_avg": ("runs", 250),
+    "econ": ("overs", 50),
+    "bowl_avg": ("wickets", 20),
+}
+
+
+class RankedBoard:
+    def __init__(self, descending=True):
+        self.descending = descending
+        self._entries = []  # sorted (sort_key, player id)
+        self._key_index = {}
+
+    @property
+    def _keys(self):
+        # Each entry's current key, for moving it. Only ingestion needs
+        # this, so a board loaded from a snapshot builds it on first use.
+        if self._key_index is None:
+            self._key_index = {name: key for key, name in self._entries}
+        return self._key_index
+
+    def __len__(self):
+        return len(self._entries)
+
+    def set(self, name, value):
+        """Insert, move or (for a missing value) drop ``name``."""
+        old = self._keys.pop(name, None)
+        if old is not None:
+            del self._entries[bisect_left(self._entries, (old, name))]
+        if value is None or pd.isna(value):
+            return
+        key = -value if self.descending else value
+        self._keys[name] = key
+        insort(self._entries, (key, name))
+
+    def fill(self, values, names):
+        """Add many entries at once (one sort); ``names`` must not be on the board yet."""
+        sign = -1 if self.descending else 1
+        added = [(sign * value, name) for value, name in zip(values, names)]
+        self._keys.update((name, key) for key, name in added)
+        self._entries = sorted(self._entries + added) if self._entries else sorted(added)
+
+    def get(self, name):
+        key = self._keys.get(name)
+        if key is None:
+            return None
+        return -key if self.descending else key
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    # Pickled without ``_keys``, which is rebuilt from the entries.
+    def __getstate__(self):
+        return self.descending, self._entries
+
+    def __setstate__(self, state):
+        self.descending, self._entries = state
+        self._key_index = None
+
+
+def merged_top(boards, k, where=None):
+    """Up to ``k`` ``(name, value)`` pairs, best first, across same-direction ``boards``."""
+    if not boards:
+        return []
+    sign = -1 if boards[0].descending else 1
+    entries = heapq.merge(*boards) if len(boards) > 1 else iter(boards[0])
+    if where is not None:
+        entries = (entry for entry in entries if where(entry[1]))
+    return [(name, sign * key) for key, name in islice(entries, k)]
+
+
+@dataclass(frozen=True)
+class Filter:
+    types: tuple = None  # player types to keep
+    team: str = None
+    seasons: tuple = None  # inclusive (first, last), season boards only
+
+
+# Season board entries are one int per (player id, season).
+SEASON_BITS = 16
+
+
+def season_entry(pid, season):
+    return (pid << SEASON_BITS) | season
+
+
+def split_season_entry(entry):
+    return entry >> SEASON_BITS, entry & ((1 << SEASON_BITS) - 1)
+
+
+class Leaderboards:
+    def __init__(self, roster=None):
+        self.roster = roster if roster is not None else Roster()  # names, types and career stats by id
+        self.boards = {}  # (metric, player type) -> RankedBoard of player ids
+        self.teams = {}  # team -> bool array over player ids, when ball-by-ball data says
+
+    @classmethod
+    def from_era(cls, era, roster=None):
+        boards = cls(roster if roster is not None else Roster.from_players(era.players))
+        roster = boards.roster
+        # Boards are filled in one sort each rather than entry by entry.
+        types = np.frombuffer(roster.types, dtype=np.int8).copy()
+        for metric in BOARDS:
+            values = boards._qualified_column(metric)
+            for code, player_type in [*enumerate(TYPES), (NO_TYPE, None)]:
+                ids = np.flatnonzero((types == code) & ~np.isnan(values))
+                if not len(ids):
+                    continue
+                column = values[ids].astype(np.int64) if metric in INTEGER_STATS else values[ids]
+                boards._board(metric, player_type).fill(column.tolist(), ids.tolist())
+        if len(era.seasons):
+            ids = np.array([roster.add(player) for player in era.seasons["player"].astype(object)], dtype=np.int64)
+            types = np.frombuffer(roster.types, dtype=np.int8).copy()  # seasons may name unknown players
+            entries = pd.DataFrame({
+                "entry": (ids << SEASON_BITS) | era.seasons["season"].to_numpy(dtype=np.int64),
+                "value": era.seasons["value"].to_numpy(dtype=np.int64),
+                "type": types[ids],
+            })
+            # A repeated (player, season) keeps its last value, as ingest_season would.
+            entries = entries.drop_duplicates("entry", keep="last")
+            for code, group in entries.groupby("type", sort=False):
+                player_type = None if code == NO_TYPE else TYPES[code]
+                metric = "season_wickets" if player_type == "Bowler" else "season_runs"
+                boards._board(metric, player_type).fill(group["value"].tolist(), group["entry"].tolist())
+        if len(era.deliveries):
+            n_players = len(roster)
+            for column, team_column in (("batsman", "batting_team"), ("bowler", "bowling_team")):
+                pairs = era.deliveries[[column, team_column]].drop_duplicates()
+                ids = pd.Index(roster.names).get_indexer(pairs[column].astype(object))
+                known = ids >= 0
+                for team, rows in pd.Series(ids[known]).groupby(pairs[team_column].astype(object).to_numpy()[known]):
+                    members = boards.teams.get(team)
+                    if members is None:
+                        members = boards.teams[sys.intern(team)] = np.zeros(n_players, dtype=bool)
+                    members[rows.to_numpy()] = True
+        return boards
+
+    def _board(self, metric, player_type):
+        board = self.boards.get((metric, player_type))
+        if board is None:
+            board = self.boards[metric, player_type] = RankedBoard(BOARDS.get(metric, True))
+        return board
+
+    # --- Ingestion ---
+    def ingest_player(self, player, player_type=None, **stats):
+        """Set career stats for ``player`` (only the ones given) and re-rank them."""
+        roster = self.roster
+        pid = roster.add(player)
+        old_type = roster.type(pid)
+        if player_type is not None and player_type != old_type:
+            if old_type is not None:
+                for (metric, board_type), board in self.boards.items():
+                    if board_type == old_type and metric in BOARDS:
+                        board.set(pid, None)
+            roster.set_type(pid, player_type)
+            stats = {**{stat: roster.get(pid, stat) for stat in STATS}, **stats}  # re-rank everything under the new type
+        player_type = roster.type(pid)
+        for stat, value in stats.items():
+            roster.set(pid, stat, value)
+        touched = set(stats) | {metric for metric, (volume, _) in QUALIFIERS.items() if volume in stats}
+        for metric in touched & set(BOARDS):
+            self._board(metric, player_type).set(pid, self._qualified_value(pid, metric))
+
+    def ingest_season(self, player, season, value, add=False):
+        """Record a season figure; ``add=True`` accumulates (e.g. one match at a time)."""
+        pid = self.roster.add(player)
+        player_type = self.roster.type(pid)
+        board = self._board("season_wickets" if player_type == "Bowler" else "season_runs", player_type)
+        key = season_entry(pid, season)
+        if add:
+            value += board.get(key) or 0
+        board.set(key, value)
+
+    def _qualified_value(self, pid, metric):
+        value = self.roster.get(pid, metric)
+        if value != value:
+            return None
+        if metric in QUALIFIERS:
+            volume, minimum = QUALIFIERS[metric]
+            have = self.roster.get(pid, volume)
+            if not have >= minimum:  # NaN counts as no volume
+                return None
+        return value
+
+    def _qualified_column(self, metric):
+        values = self.roster.column(metric)
+        if metric in QUALIFIERS:
+            volume, minimum = QUALIFIERS[metric]
+            with np.errstate(invalid="ignore"):
+                values[~(self.roster.column(volume) >= minimum)] = np.nan
+        return values
+
+    # --- Queries ---
+    def top(self, metric, k=5, flt=None):
+        """Top ``k`` as a DataFrame with ``Player`` and ``Value`` (and ``Season`` for season boards)."""
+        flt = flt or Filter()
+        names = self.roster.names
+        boards = [board for (board_metric, player_type), board in self.boards.items()
+                  if board_metric == metric and (flt.types is None or player_type in flt.types)]
+        on_team = None
+        if flt.team is not None:
+            members = self.teams.get(flt.team, np.zeros(0, dtype=bool))
+            on_team = lambda pid: pid < len(members) and bool(members[pid])
+        if metric in SEASON_BOARDS:
+            first, last = flt.seasons or (None, None)
+
+            def where(entry):
+                pid, season = split_season_entry(entry)
+                in_range = (first is None or season >= first) and (last is None or season <= last)
+                return in_range and (on_team is None or on_team(pid))
+
+            rows = [(names[pid], season, value)
+                    for pid, season, value in ((*split_season_entry(entry), value)
+                                               for entry, value in merged_top(boards, k, where))]
+            return pd.DataFrame(rows, columns=["Player", "Season", "Value"])
+        rows = [(names[pid], value) for pid, value in merged_top(boards, k, on_team)]
+        return pd.DataFrame(rows, columns=["Player", "Value"])
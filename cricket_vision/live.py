@@ -0,0 +1,264 @@
+"""Live ball-by-ball ingestion for the Match Predictor.
+
+A feed is a stream of JSON lines, one per delivery, with the same fields as
+the ``deliveries`` table (``innings``, ``batting_team``, ``bowling_team``,
+``runs_batter``, ``extras``, ``legal``, ``is_wicket``, ...). It can come from
+a file that is being appended to (``file:/path/feed.jsonl`` or just a path)
+or a TCP socket (``tcp://host:port``).
+
+``LiveMatchService`` tails the feed on an asyncio loop in a background
+thread. Each delivery updates the innings state and the chase win
+probability in O(1); readers (the Streamlit page) just take the latest
+immutable ``LiveSnapshot``.
+
+A delivery may also carry ``target`` when the feed joins a chase already in
+progress. A stored match can be replayed into a file to stand in for a real feed::
+
+    CRICKET_VISION_FEED_DIR=/tmp/feeds streamlit run app.py
+    python -m cricket_vision.live replay modernData 0 /tmp/feeds/match.jsonl --delay 1
+
+Any visitor can type a feed into the page, so only configured feeds are
+followed: files inside ``CRICKET_VISION_FEED_DIR`` and sockets listed in
+``CRICKET_VISION_FEED_HOSTS`` (``host:port,host:port``). Both are unset by
+default, which turns live feeds off. A follower gives up, with the reason
+in ``error``, when its file never appears or the feed goes quiet.
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from cricket_vision.predictor import project_first_innings
+from cricket_vision.winprob import BALLS_PER_INNINGS
+
+
+@dataclass(frozen=True)
+class LiveSnapshot:
+    innings: int = 0
+    batting_team: str = ""
+    bowling_team: str = ""
+    runs: int = 0
+    wickets: int = 0
+    balls: int = 0  # legal deliveries bowled
+    target: int = None  # set once the second innings starts
+    win_prob: float = None  # chasing side, second innings only
+    projected_score: int = None  # first innings only
+    projected_range: tuple = None  # (low, high) around projected_score
+    deliveries_seen: int = 0
+    last_update: float = 0.0
+
+    @property
+    def overs(self):
+        """Overs in cricket notation (10.3 = 10 overs, 3 balls)."""
+        return self.balls // 6 + (self.balls % 6) / 10
+
+
+class LiveInnings:
+    """Mutable innings state; every update is O(1)."""
+
+    def __init__(self, win_table=None, projection=None):
+        self.win_table = win_table
+        self.projection = projection  # projection.ProjectionModel; None = the untrained prior
+        self.snapshot = LiveSnapshot()
+
+    def apply(self, delivery):
+        snap = self.snapshot
+        innings = int(delivery.get("innings", 1))
+        if innings != snap.innings:
+            target = snap.runs + 1 if snap.innings == 1 else snap.target
+            snap = LiveSnapshot(innings=innings, target=target if innings == 2 else None)
+        if delivery.get("target") is not None:
+            snap = replace(snap, target=int(delivery["target"]))
+        runs = snap.runs + int(delivery.get("runs_batter", 0)) + int(delivery.get("extras", 0))
+        wickets = snap.wickets + bool(delivery.get("is_wicket", False))
+        balls = snap.balls + bool(delivery.get("legal", True))
+        snap = replace(
+            snap,
+            batting_team=delivery.get("batting_team", snap.batting_team),
+            bowling_team=delivery.get("bowling_team", snap.bowling_team),
+            runs=runs,
+            wickets=wickets,
+            balls=balls,
+            deliveries_seen=snap.deliveries_seen + 1,
+            last_update=time.time(),
+        )
+        if snap.target is not None and self.win_table is not None:
+            snap = replace(snap, win_prob=self.win_table.lookup(
+                snap.target - runs, BALLS_PER_INNINGS - balls, 10 - wickets))
+        elif snap.innings == 1:
+            projected, low, high = project_first_innings(runs, snap.overs, wickets, self.projection)
+            snap = replace(snap, projected_score=projected, projected_range=(low, high))
+        self.snapshot = snap
+        return snap
+
+
+# --- Feed sources ---
+FEED_DIR = os.environ.get("CRICKET_VISION_FEED_DIR") or None
+FEED_HOSTS = frozenset(filter(None, os.environ.get("CRICKET_VISION_FEED_HOSTS", "").split(",")))
+MISSING_TIMEOUT = 60.0  # seconds a feed file may take to appear
+IDLE_TIMEOUT = 900.0  # seconds without a new line before a follower gives up
+
+
+def feeds_enabled(feed_dir=FEED_DIR, hosts=FEED_HOSTS):
+    return feed_dir is not None or bool(hosts)
+
+
+def resolve_source(source, feed_dir=FEED_DIR, hosts=FEED_HOSTS):
+    """``source`` in canonical form; ``ValueError`` unless it is an allowed feed."""
+    source = source.strip()
+    if source.startswith("tcp://"):
+        if source[len("tcp://"):] not in hosts:
+            raise ValueError(f"{source} is not an allowed feed host")
+        return source
+    if feed_dir is None:
+        raise ValueError("file feeds are off (no CRICKET_VISION_FEED_DIR)")
+    root = Path(feed_dir).resolve()
+    # Resolving first means neither ".." nor a symlink can leave the directory.
+    path = (root / source.removeprefix("file:")).resolve()
+    if path == root or not path.is_relative_to(root):
+        raise ValueError(f"feed files must be inside {root}")
+    return f"file:{path}"
+
+
+async def tail_file(path, poll_interval=0.25, missing_timeout=MISSING_TIMEOUT, idle_timeout=IDLE_TIMEOUT):
+    """Yield lines from ``path`` as they are appended, starting at the beginning."""
+    path = Path(path)
+    started = time.monotonic()
+    while not path.exists():
+        if time.monotonic() - started > missing_timeout:
+            raise TimeoutError(f"{path} did not appear within {missing_timeout:.0f} s")
+        await asyncio.sleep(poll_interval)
+    with open(path, encoding="utf-8") as f:
+        buffer = ""
+        last_line = time.monotonic()
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                if time.monotonic() - last_line > idle_timeout:
+                    raise TimeoutError(f"no new deliveries for {idle_timeout:.0f} s")
+                await asyncio.sleep(poll_interval)
+                continue
+            last_line = time.monotonic()
+            buffer += chunk
+            if buffer.endswith("\n"):  # ignore a half-written last line until it completes
+                yield buffer
+                buffer = ""
+
+
+async def read_socket(host, port, idle_timeout=IDLE_TIMEOUT):
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), MISSING_TIMEOUT)
+    try:
+        while True:
+            try:
+                line = await asyncio.wait_for(reader.readline(), idle_timeout)
+            except TimeoutError:
+                raise TimeoutError(f"no new deliveries for {idle_timeout:.0f} s") from None
+            if not line:
+                break
+            yield line.decode("utf-8")
+    finally:
+        writer.close()
+
+
+def open_source(source):
+    """Line iterator for a source already checked by ``resolve_source``."""
+    if source.startswith("tcp://"):
+        host, _, port = source[len("tcp://"):].rpartition(":")
+        return read_socket(host, int(port))
+    return tail_file(source.removeprefix("file:"))
+
+
+# --- Service ---
+class LiveMatchService:
+    """Follows one feed on a background event loop; ``latest`` is safe to read from any thread."""
+
+    def __init__(self, source, win_table=None, projection=None):
+        self.source = source
+        self.error = None
+        self._innings = LiveInnings(win_table, projection)
+        self._loop = None
+        self._task = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"live-feed {source}", daemon=True)
+
+    @property
+    def latest(self):
+        return self._innings.snapshot
+
+    @property
+    def finished(self):
+        """Whether the follower has stopped (feed ended, timed out or failed; see ``error``)."""
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop following the feed; ``latest`` keeps the last snapshot.
+
+        Safe to call before the follower's loop is running: it then returns
+        without reading the feed.
+        """
+        self._stopped.set()
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:  # already finished and its loop closed
+                pass
+
+    def _run(self):
+        try:
+            asyncio.run(self._follow())
+        except Exception as exc:  # surfaced on the page instead of killing the server
+            self.error = exc
+
+    async def _follow(self):
+        self._loop, self._task = asyncio.get_running_loop(), asyncio.current_task()
+        # Set before checking, so a stop() that missed the loop is seen here.
+        if self._stopped.is_set():
+            return
+        try:
+            await self._consume()
+        except asyncio.CancelledError:
+            pass
+
+    async def _consume(self):
+        async for line in open_source(self.source):
+            line = line.strip()
+            if line:
+                self._innings.apply(json.loads(line))
+
+
+# --- Replay ---
+def replay(era_key, match_id, out_path, delay=1.0):
+    """Append a stored match's deliveries to ``out_path`` one by one."""
+    from cricket_vision.store import load_era
+
+    deliveries = load_era(era_key).deliveries
+    match = deliveries[deliveries["match_id"] == match_id]
+    if match.empty:
+        raise SystemExit(f"No deliveries for match {match_id} in {era_key}")
+    columns = ["innings", "over", "ball", "batting_team", "bowling_team", "batsman", "bowler",
+               "runs_batter", "extras", "legal", "is_wicket"]
+    with open(out_path, "w", encoding="utf-8") as f:
+        for record in match[columns].astype(object).to_dict("records"):
+            f.write(json.dumps({k: (v.item() if hasattr(v, "item") else v) for k, v in record.items()}) + "\n")
+            f.flush()
+            time.sleep(delay)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live feed tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rp = sub.add_parser("replay", help="replay a stored match into a JSON-lines feed file")
+    rp.add_argument("era")
+    rp.add_argument("match_id", type=int)
+    rp.add_argument("out")
+    rp.add_argument("--delay", type=float, default=1.0, help="seconds between deliveries")
+    args = parser.parse_args()
+    replay(args.era, args.match_id, args.out, args.delay)
@@ -0,0 +1,178 @@
+"""Sparse batsman x bowler matchup matrix.
+
+Only pairs that actually met are stored, as parallel arrays (COO layout)
+sorted by batsman then bowler, with integer codes into one batsman and one
+bowler name index. A row offset array (CSR-style) makes "every bowler this
+batsman faced" a slice, and a second ordering does the same for bowlers.
+Strike rate and average are computed once for all pairs as whole columns.
+"""
+import numpy as np
+import pandas as pd
+
+STATS = ("runs", "balls", "dismissals", "fours", "sixes", "dots")
+METRICS = {
+    "sr": "Strike Rate",
+    "avg": "Average",
+    "runs": "Runs",
+    "balls": "Balls",
+    "dismissals": "Dismissals",
+    "boundaries": "Boundaries",
+    "dots": "Dots",
+}
+OUTCOMES = ("Dots", "1s, 2s, 3s", "Fours", "Sixes")
+# Rough T20 split used when a pair has no ball-level counts: the share of
+# runs from fours and from sixes, and runs per other scoring ball.
+EST_FOUR_SHARE, EST_SIX_SHARE, EST_RUNS_PER_SHOT = 0.4, 0.2, 1.3
+
+
+def h2h_from_deliveries(deliveries):
+    """Aggregate ball-by-ball data into the store's ``h2h`` table layout.
+
+    ``balls`` counts legal deliveries, and fours, sixes and dots are counted
+    among those only (a four off a no-ball is in ``runs`` but is not a ball
+    faced), so ``dots + fours + sixes <= balls`` always holds.
+    """
+    runs = deliveries["runs_batter"].to_numpy(dtype=np.int64)
+    legal = deliveries["legal"].to_numpy(dtype=bool)
+    frame = pd.DataFrame({
+        "batsman": deliveries["batsman"],
+        "bowler": deliveries["bowler"],
+        "runs": runs,
+        "balls": legal.astype(np.int64),
+        "dismissals": deliveries["is_wicket"].to_numpy(dtype=np.int64),
+        "fours": (legal & (runs == 4)).astype(np.int64),
+        "sixes": (legal & (runs == 6)).astype(np.int64),
+        "dots": (legal & (runs == 0)).astype(np.int64),
+    })
+    return frame.groupby(["batsman", "bowler"], observed=True, sort=False).sum().reset_index()
+
+
+def ball_outcomes(pair):
+    """How a matchup's balls went, as counts in ``OUTCOMES`` order, plus whether they are estimated.
+
+    Every slice counts legal balls and the four add up to ``balls``. Pairs
+    from eras without ball-level counts get an estimate from runs and balls.
+    """
+    balls, runs = int(pair["balls"]), int(pair["runs"])
+    if pd.isna(pair["dots"]):
+        fours = round(runs * EST_FOUR_SHARE / 4)
+        sixes = min(round(runs * EST_SIX_SHARE / 6), max(0, balls - fours))
+        fours = min(fours, balls - sixes)
+        other_runs = max(0, runs - 4 * fours - 6 * sixes)
+        others = min(balls - fours - sixes, round(other_runs / EST_RUNS_PER_SHOT))
+        estimated = True
+    else:
+        fours, sixes, dots = int(pair["fours"]), int(pair["sixes"]), int(pair["dots"])
+        others = max(0, balls - dots - fours - sixes)
+        estimated = False
+    return (balls - others - fours - sixes, others, fours, sixes), estimated
+
+
+class MatchupMatrix:
+    def __init__(self, batsmen, bowlers, bat_codes, bowl_codes, stats):
+        self.batsmen = batsmen  # pd.Index of names
+        self.bowlers = bowlers
+        self.bat_codes = bat_codes
+        self.bowl_codes = bowl_codes
+        self.stats = stats  # {column: float64 array}, NaN where unknown
+        self.bat_offsets = np.searchsorted(bat_codes, np.arange(len(batsmen) + 1))
+        self.by_bowler = np.lexsort((bat_codes, bowl_codes))
+        self.bowl_offsets = np.searchsorted(bowl_codes[self.by_bowler], np.arange(len(bowlers) + 1))
+
+    @classmethod
+    def from_h2h(cls, h2h):
+        bat = pd.Categorical(h2h["batsman"].astype(object))
+        bowl = pd.Categorical(h2h["bowler"].astype(object))
+        bat_codes = bat.codes.astype(np.int32)
+        bowl_codes = bowl.codes.astype(np.int32)
+        order = np.lexsort((bowl_codes, bat_codes))
+        stats = {
+            col: (h2h[col].to_numpy(dtype=np.float64, na_value=np.nan)[order] if col in h2h
+                  else np.full(len(h2h), np.nan))
+            for col in STATS
+        }
+        matrix = cls(pd.Index(bat.categories), pd.Index(bowl.categories), bat_codes[order], bowl_codes[order], stats)
+        matrix._derive()
+        return matrix
+
+    def _derive(self):
+        s = self.stats
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s["sr"] = np.where(s["balls"] > 0, s["runs"] / s["balls"] * 100, np.nan)
+            # No dismissal: the average is undefined (shown as "not out").
+            s["avg"] = np.where(s["dismissals"] > 0, s["runs"] / s["dismissals"], np.nan)
+        s["boundaries"] = s["fours"] + s["sixes"]
+
+    def __len__(self):
+        return len(self.bat_codes)
+
+    # --- Lookups ---
+    def _frame(self, rows):
+        data = {"batsman": self.batsmen[self.bat_codes[rows]], "bowler": self.bowlers[self.bowl_codes[rows]]}
+        data.update({col: values[rows] for col, values in self.stats.items()})
+        return pd.DataFrame(data)
+
+    def for_batsman(self, name):
+        """Every bowler ``name`` has faced, as a DataFrame."""
+        code = self.batsmen.get_indexer([name])[0]
+        if code < 0:
+            return self._frame(np.array([], dtype=np.int64))
+        return self._frame(np.arange(self.bat_offsets[code], self.bat_offsets[code + 1]))
+
+    def for_bowler(self, name):
+        code = self.bowlers.get_indexer([name])[0]
+        if code < 0:
+            return self._frame(np.array([], dtype=np.int64))
+        return self._frame(self.by_bowler[self.bowl_offsets[code]:self.bowl_offsets[code + 1]])
+
+    def pair(self, batsman, bowler):
+        """Stats for one matchup as a dict, or ``None`` if they never met."""
+        bat, bowl = self.batsmen.get_indexer([batsman])[0], self.bowlers.get_indexer([bowler])[0]
+        if bat < 0 or bowl < 0:
+            return None
+        lo, hi = self.bat_offsets[bat], self.bat_offsets[bat + 1]
+        i = lo + np.searchsorted(self.bowl_codes[lo:hi], bowl)
+        if i >= hi or self.bowl_codes[i] != bowl:
+            return None
+        return {col: values[i] for col, values in self.stats.items()}
+
+    # --- Whole-matrix queries ---
+    def rank(self, name, role="batsman", metric="sr", n=5, min_balls=1):
+        """Best and worst ``n`` matchups for a player by ``metric`` (from the batsman's side).
+
+        One slice of the player's row plus an ``argsort`` over it; the result
+        is ``(best, worst)`` DataFrames.
+        """
+        rows = self.for_batsman(name) if role == "batsman" else self.for_bowler(name)
+        rows = rows[(rows["balls"] >= min_balls) & rows[metric].notna()]
+        # A high batting metric is good for the batsman and bad for the bowler.
+        ascending = role != "batsman"
+        ordered = rows.sort_values(metric, ascending=ascending, kind="stable")
+        return ordered.head(n), ordered.iloc[::-1].head(n)
+
+    def heatmap(self, metric="sr", max_batsmen=40, max_bowlers=40, min_balls=1):
+        """Dense batsman x bowler grid of ``metric`` for the most-involved players.
+
+        Players are picked by total balls with ``bincount`` over the codes, so
+        building the grid never touches more than ``max_batsmen * max_bowlers``
+        cells however large the matrix is.
+        """
+        balls = np.nan_to_num(self.stats["balls"])
+        keep = balls >= min_balls
+        bat_balls = np.bincount(self.bat_codes[keep], weights=balls[keep], minlength=len(self.batsmen))
+        bowl_balls = np.bincount(self.bowl_codes[keep], weights=balls[keep], minlength=len(self.bowlers))
+        top_bat = np.argsort(-bat_balls, kind="stable")[:max_batsmen]
+        top_bowl = np.argsort(-bowl_balls, kind="stable")[:max_bowlers]
+        top_bat = top_bat[bat_balls[top_bat] > 0]
+        top_bowl = top_bowl[bowl_balls[top_bowl] > 0]
+
+        bat_pos = np.full(len(self.batsmen), -1)
+        bat_pos[top_bat] = np.arange(len(top_bat))
+        bowl_pos = np.full(len(self.bowlers), -1)
+        bowl_pos[top_bowl] = np.arange(len(top_bowl))
+        rows, cols = bat_pos[self.bat_codes], bowl_pos[self.bowl_codes]
+        sel = keep & (rows >= 0) & (cols >= 0)
+
+        grid = np.full((len(top_bat), len(top_bowl)), np.nan)
+        grid[rows[sel], cols[sel]] = self.stats[metric][sel]
+        return pd.DataFrame(grid, index=self.batsmen[top_bat], columns=self.bowlers[top_bowl])
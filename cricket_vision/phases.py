@@ -0,0 +1,97 @@
+"""Batting and bowling aggregates per innings phase, from ball-by-ball data.
+
+Every delivery is binned by over number into Powerplay / Middle / Death and
+summed per (team, phase) with ``np.bincount`` over integer team codes, so the
+whole era is aggregated in a handful of array passes. The result is a plain
+dict keyed by team, meant to be built once per era and then only looked up.
+"""
+import numpy as np
+import pandas as pd
+
+PHASES = ("Powerplay (1-6)", "Middle (7-15)", "Death (16-20)")
+# First 0-based over of the Middle and Death phases.
+PHASE_STARTS = np.array([6, 15])
+
+
+def phase_codes(overs):
+    """0 = Powerplay, 1 = Middle, 2 = Death for an array of 0-based overs."""
+    return np.searchsorted(PHASE_STARTS, np.asarray(overs), side="right")
+
+
+def _team_sums(flat, n_teams, weights):
+    # ``flat`` is team * len(PHASES) + phase, so one bincount fills the grid.
+    return np.bincount(flat, weights=weights, minlength=n_teams * len(PHASES)).reshape(n_teams, len(PHASES))
+
+
+def team_codes(column, teams):
+    """Positions of ``column``'s values in ``teams`` (-1 if absent), via the categorical codes."""
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype("category")
+    remap = np.append(pd.Index(teams).get_indexer(column.cat.categories), -1)
+    # Missing values have code -1, which picks the trailing -1 in remap.
+    return remap[column.cat.codes.to_numpy()]
+
+
+def _side(deliveries, team_column, labels, teams, phase, runs, wickets, balls, innings_start):
+    codes = team_codes(deliveries[team_column], teams)
+    known = codes >= 0
+    if not known.all():
+        codes, phase, innings_start = codes[known], phase[known], innings_start[known]
+        runs, wickets, balls = runs[known], wickets[known], balls[known]
+
+    n_teams = len(teams)
+    # Both teams are fixed for a whole innings, so counting innings starts per
+    # team counts that team's innings.
+    innings = np.maximum(np.bincount(codes[innings_start], minlength=n_teams), 1)[:, None]
+    flat = codes * len(PHASES) + phase
+    run_sums = _team_sums(flat, n_teams, runs)
+    wicket_sums = _team_sums(flat, n_teams, wickets)
+    ball_sums = _team_sums(flat, n_teams, balls)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(ball_sums > 0, run_sums / ball_sums * 6, np.nan)
+
+    runs_label, wickets_label, rate_label = labels
+    return {
+        team: pd.DataFrame({
+            "Phase": PHASES,
+            runs_label: np.round(run_sums[i] / innings[i], 1),
+            wickets_label: np.round(wicket_sums[i] / innings[i], 2),
+            rate_label: np.round(rate[i], 2),
+        })
+        for i, team in enumerate(teams)
+        if ball_sums[i].sum() > 0
+    }
+
+
+def build_phase_table(deliveries, teams=None):
+    """Return ``{team: {"batting": df, "bowling": df}}`` of per-innings phase averages.
+
+    Teams with no deliveries on one side are left out of that side; teams with
+    none at all are left out entirely.
+    """
+    if deliveries.empty:
+        return {}
+    if teams is None:
+        teams = sorted(set(deliveries["batting_team"].dropna()) | set(deliveries["bowling_team"].dropna()))
+    teams = list(teams)
+
+    phase = phase_codes(deliveries["over"].to_numpy(dtype=np.int64))
+    runs = deliveries["runs_batter"].to_numpy(dtype=np.float64) + deliveries["extras"].to_numpy(dtype=np.float64)
+    wickets = deliveries["is_wicket"].to_numpy(dtype=np.float64)
+    balls = deliveries["legal"].to_numpy(dtype=np.float64)
+    # Deliveries are stored in match/innings/over/ball order, so an innings
+    # starts wherever the (match, innings) id changes.
+    innings_ids = deliveries["match_id"].to_numpy(dtype=np.int64) * 4 + deliveries["innings"].to_numpy(dtype=np.int64)
+    innings_start = np.empty(len(innings_ids), dtype=bool)
+    innings_start[0] = True
+    np.not_equal(innings_ids[1:], innings_ids[:-1], out=innings_start[1:])
+
+    batting = _side(deliveries, "batting_team", ("Runs / Inns", "Wickets / Inns", "Run Rate"),
+                    teams, phase, runs, wickets, balls, innings_start)
+    bowling = _side(deliveries, "bowling_team", ("Conceded / Inns", "Wickets / Inns", "Economy"),
+                    teams, phase, runs, wickets, balls, innings_start)
+    return {
+        team: {"batting": batting.get(team), "bowling": bowling.get(team)}
+        for team in teams
+        if team in batting or team in bowling
+    }
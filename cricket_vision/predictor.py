@@ -0,0 +1,50 @@
+"""Match Predictor models, usable outside Streamlit.
+
+Every function takes scalars or equal-length NumPy arrays, so the page can
+score one game state and ``cricket_vision.batch`` can score millions.
+Overs use cricket notation: 10.3 means 10 overs and 3 balls.
+"""
+import numpy as np
+
+from cricket_vision.projection import prior_model
+from cricket_vision.winprob import BALLS_PER_INNINGS
+
+
+def overs_to_balls(overs):
+    overs = np.asarray(overs, dtype=np.float64)
+    whole = np.floor(overs)
+    return (whole * 6 + np.round((overs - whole) * 10)).astype(np.int64)
+
+
+def chase_win_probability(table, target, score, overs, wickets):
+    """Chasing side's win probability (0-1) from a ``wptable.WinProbTable``."""
+    runs_left = np.asarray(target) - np.asarray(score)
+    balls_left = BALLS_PER_INNINGS - overs_to_balls(overs)
+    wickets_left = 10 - np.asarray(wickets)
+    return table.lookup(runs_left, balls_left, wickets_left)
+
+
+def rating_adjusted_probability(state_prob, rating_prob, balls_left):
+    """Shift a chase probability by the teams' rating edge, fading it out as the chase runs down.
+
+    The chase model only sees the game state, so it treats every pair of
+    teams alike. The rating edge (``rating_prob`` against an even 0.5) is
+    added in log-odds, weighted by the share of the innings still to come;
+    decided chases (probability 0 or 1) are left alone.
+    """
+    state_prob = np.asarray(state_prob, dtype=np.float64)
+    weight = np.clip(np.asarray(balls_left, dtype=np.float64) / BALLS_PER_INNINGS, 0.0, 1.0)
+    p = np.clip(state_prob, 1e-6, 1 - 1e-6)
+    q = np.clip(np.asarray(rating_prob, dtype=np.float64), 1e-6, 1 - 1e-6)
+    logit = np.log(p / (1 - p)) + weight * np.log(q / (1 - q))
+    adjusted = np.where((state_prob <= 0) | (state_prob >= 1), state_prob, 1 / (1 + np.exp(-logit)))
+    return float(adjusted) if adjusted.ndim == 0 else adjusted
+
+
+def project_first_innings(runs, overs, wickets, model=None):
+    """Projected first-innings total as ``(projected, low, high)`` from a ``projection.ProjectionModel``.
+
+    Without a model the untrained prior is used: current rate plus a
+    late-innings lift, less a wickets penalty.
+    """
+    return (model or prior_model()).project(runs, overs_to_balls(overs), wickets)
@@ -0,0 +1,193 @@
+"""Per-section render timings for the Streamlit pages.
+
+Each page creates a profiler and marks where its sections start::
+
+    prof = page_profiler("Home")
+    prof.section("load")
+    ...
+    prof.section("leaders")
+    ...
+    prof.done()
+
+A section runs until the next mark, so existing page code needs no
+re-indenting.
+
+Sections only cover full runs of the page script. A fragment that reruns
+on its own (a widget inside it changed, or its timer fired) runs just its
+function, so each fragment is timed separately by wrapping it, under
+``st.fragment``::
+
+    @st.fragment
+    @prof.fragment("bowler")
+    def bowler_panel(key):
+        ...
+
+A fragment's timing is recorded on every call, whether it ran as part of
+the page or by itself. The time between marks covers everything the section does,
+including data access, DataFrame and figure building, and serializing
+elements to the browser (Streamlit marshals each element as it is called).
+Timings go into process-wide histograms, which are exported as Prometheus
+text or JSON. They are served on ``/metrics`` and ``/metrics.json`` and
+shown in the developer panel.
+
+Profiling is off unless ``CRICKET_VISION_PROFILE=1``. When it is off,
+``page_profiler`` returns a shared object whose methods do nothing.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.environ.get("CRICKET_VISION_PROFILE", "") not in ("", "0")
+METRICS_PORT = int(os.environ.get("CRICKET_VISION_METRICS_PORT", "9464"))
+# Upper bounds in seconds, Prometheus style (the last bucket is +Inf).
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the ``q`` quantile."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, n in zip(BUCKETS + (self.max,), self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}  # (page, kind, section) -> Histogram; kind is "section" or "fragment"
+
+    def observe(self, page, section, seconds, kind="section"):
+        with self._lock:
+            hist = self.histograms.get((page, kind, section))
+            if hist is None:
+                hist = self.histograms[page, kind, section] = Histogram()
+            hist.observe(seconds)
+
+    def summary(self):
+        with self._lock:
+            return [
+                {"page": page, "kind": kind, "section": section, "count": h.count, "mean_ms": h.total / h.count * 1000,
+                 "p50_ms": h.quantile(0.5) * 1000, "p95_ms": h.quantile(0.95) * 1000, "max_ms": h.max * 1000}
+                for (page, kind, section), h in sorted(self.histograms.items())
+            ]
+
+    def to_json(self):
+        return json.dumps(self.summary(), indent=2)
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP cricket_vision_section_seconds Time spent rendering each page section or fragment run.",
+            "# TYPE cricket_vision_section_seconds histogram",
+        ]
+        with self._lock:
+            for (page, kind, section), h in sorted(self.histograms.items()):
+                labels = f'page="{page}",kind="{kind}",section="{section}"'
+                cumulative = 0
+                for bound, n in zip(BUCKETS + ("+Inf",), h.counts):
+                    cumulative += n
+                    lines.append(f'cricket_vision_section_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"cricket_vision_section_seconds_sum{{{labels}}} {h.total:.6f}")
+                lines.append(f"cricket_vision_section_seconds_count{{{labels}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class PageProfiler:
+    def __init__(self, page, registry=REGISTRY):
+        self.page = page
+        self.registry = registry
+        self._start = self._mark = time.perf_counter()
+        self._section = None
+
+    def section(self, name):
+        """Close the running section (if any) and start ``name``."""
+        now = time.perf_counter()
+        if self._section is not None:
+            self.registry.observe(self.page, self._section, now - self._mark)
+        self._section, self._mark = name, now
+
+    def done(self):
+        self.section(None)
+        self.registry.observe(self.page, "total", self._mark - self._start)
+
+    def fragment(self, name):
+        """Decorator timing each call of a fragment function as fragment ``name``."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.registry.observe(self.page, name, time.perf_counter() - start, kind="fragment")
+            return timed
+        return wrap
+
+
+class _NullProfiler:
+    def section(self, name):
+        pass
+
+    def fragment(self, name):
+        return lambda fn: fn
+
+    def done(self):
+        pass
+
+
+_NULL = _NullProfiler()
+
+
+def page_profiler(page):
+    return PageProfiler(page) if ENABLED else _NULL
+
+
+# --- Metrics endpoint ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = REGISTRY.to_prometheus(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = REGISTRY.to_json(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):  # keep the Streamlit console quiet
+        pass
+
+
+def serve_metrics(port=METRICS_PORT, host="127.0.0.1"):
+    """Serve ``/metrics`` and ``/metrics.json`` on a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
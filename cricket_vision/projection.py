@@ -0,0 +1,225 @@
+"""First-innings score projection trained on an era's innings progressions.
+
+Every first innings in the era's ball-by-ball data contributes one training
+row per completed over: the score and wickets at that point, and the runs
+the innings went on to add. For each over count a least-squares fit gives
+runs still to come as ``a + b * runs + c * wickets``, and the 10% and 90%
+quantiles of the fit's residuals give the range around the projection.
+Part-way through an over the two neighbouring fits are interpolated.
+
+Eras with little or no ball-by-ball data would give noisy fits, so each
+over's coefficients and range are shrunk towards a prior worth
+``PRIOR_INNINGS`` innings. The prior is the old rule of thumb (current run
+rate plus 1.5, less 0.1 per wicket, for the remaining overs; 175 before a
+ball is bowled), so an era with no deliveries projects exactly as before.
+
+Models are trained offline and saved under ``data/.artifacts/projection/``,
+named after the era's content version (``store.era_version``) they were
+trained on and ``FORMAT``::
+
+    python -m cricket_vision.projection [era ...] [--evaluate]
+
+The app keeps each loaded model in its per-era resource cache
+(``session.py``), which drops it with the era version, so inference is a
+few array lookups and nothing is refit during a page rerun.
+"""
+import argparse
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from cricket_vision.winprob import BALLS_PER_INNINGS
+from cricket_vision.wptable import ARTIFACT_DIRNAME
+
+FORMAT = 1
+OVERS = BALLS_PER_INNINGS // 6
+QUANTILES = (0.1, 0.9)
+PRIOR_INNINGS = 50.0
+PRIOR_TOTAL = 175.0  # before a ball is bowled
+# Half-width of the prior range, in runs per remaining over.
+PRIOR_SPREAD = 1.6
+
+
+@dataclass(frozen=True)
+class ProjectionModel:
+    coef: np.ndarray  # (OVERS + 1, 3): intercept, runs, wickets -> runs still to come, by overs completed
+    low: np.ndarray  # (OVERS + 1,) range offsets around the projection
+    high: np.ndarray
+    n_innings: int
+
+    def __post_init__(self):
+        # (intercept, runs, wickets, low, high) per over, as plain floats for the scalar path.
+        table = np.column_stack([self.coef, self.low, self.high]).tolist()
+        object.__setattr__(self, "_rows", table)
+
+    def project(self, runs, balls, wickets):
+        """``(projected, low, high)`` final totals from legal ``balls`` bowled; scalars or arrays."""
+        if np.ndim(runs) == np.ndim(balls) == np.ndim(wickets) == 0:
+            return self._project_one(float(runs), int(balls), float(wickets))
+        runs = np.asarray(runs, dtype=np.float64)
+        balls = np.clip(np.asarray(balls, dtype=np.int64), 0, BALLS_PER_INNINGS)
+        wickets = np.clip(np.asarray(wickets, dtype=np.float64), 0, 10)
+        over = np.minimum(balls // 6, OVERS - 1)
+        frac = (balls - over * 6) / 6.0  # 1.0 only at the end of the innings
+
+        def at(values):
+            return (1 - frac) * values[over] + frac * values[over + 1]
+
+        out = wickets >= 10
+        to_come = at(self.coef[:, 0]) + at(self.coef[:, 1]) * runs + at(self.coef[:, 2]) * wickets
+        projected = runs + np.where(out, 0.0, np.maximum(to_come, 0.0))
+        low = np.maximum(projected + np.where(out, 0.0, at(self.low)), runs)
+        high = np.maximum(projected + np.where(out, 0.0, at(self.high)), projected)
+        return tuple(np.round(x).astype(np.int64) for x in (projected, low, high))
+
+    def _project_one(self, runs, balls, wickets):
+        # Same as the array path without NumPy's per-call overhead (a page
+        # rerun or a live delivery scores one state).
+        balls = min(max(balls, 0), BALLS_PER_INNINGS)
+        wickets = min(max(wickets, 0.0), 10.0)
+        if wickets >= 10:
+            total = round(runs)
+            return total, total, total
+        over = min(balls // 6, OVERS - 1)
+        frac = (balls - over * 6) / 6.0
+        a, b = self._rows[over], self._rows[over + 1]
+        c0, c1, c2, low, high = ((1 - frac) * x + frac * y for x, y in zip(a, b))
+        projected = runs + max(c0 + c1 * runs + c2 * wickets, 0.0)
+        # round() and np.round both round halves to even.
+        return round(projected), round(max(projected + low, runs)), round(max(projected + high, projected))
+
+
+def prior_model():
+    overs = np.arange(OVERS + 1, dtype=np.float64)
+    left = OVERS - overs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_run = np.where(overs > 0, left / overs, 0.0)
+    coef = np.stack([1.5 * left, per_run, -0.1 * left], axis=1)
+    coef[0] = (PRIOR_TOTAL, 0.0, 0.0)
+    return ProjectionModel(coef=coef, low=-PRIOR_SPREAD * left, high=PRIOR_SPREAD * left, n_innings=0)
+
+
+# --- Training ---
+def innings_progressions(deliveries):
+    """One row per (first innings, completed over): ``innings``, ``over``, ``runs``, ``wickets``, ``final``.
+
+    Over 0 is the state before the first ball. States after the tenth
+    wicket are left out.
+    """
+    first = deliveries[deliveries["innings"].to_numpy(dtype=np.int64) == 1]
+    empty = {name: np.zeros(0, dtype=np.int64) for name in ("innings", "over", "runs", "wickets", "final")}
+    if first.empty:
+        return empty
+    _, innings = np.unique(first["match_id"].to_numpy(dtype=np.int64), return_inverse=True)
+    runs = first["runs_batter"].to_numpy(dtype=np.int64) + first["extras"].to_numpy(dtype=np.int64)
+    legal = first["legal"].to_numpy(dtype=bool)
+    wicket = first["is_wicket"].to_numpy(dtype=np.int64)
+    n_innings = int(innings.max()) + 1
+    final = np.bincount(innings, weights=runs, minlength=n_innings).astype(np.int64)
+
+    # Running totals within each innings (deliveries are stored in playing order).
+    starts = np.flatnonzero(np.r_[True, innings[1:] != innings[:-1]])
+    def running(values):
+        total = np.cumsum(values)
+        before = np.r_[0, total][starts]
+        return total - np.repeat(before, np.diff(np.r_[starts, len(values)]))
+
+    cum_runs, cum_wickets, cum_balls = running(runs), running(wicket), running(legal.astype(np.int64))
+    over_end = legal & (cum_balls % 6 == 0) & (cum_wickets < 10)
+    rows = {
+        "innings": np.r_[np.arange(n_innings), innings[over_end]],
+        "over": np.r_[np.zeros(n_innings, dtype=np.int64), cum_balls[over_end] // 6],
+        "runs": np.r_[np.zeros(n_innings, dtype=np.int64), cum_runs[over_end]],
+        "wickets": np.r_[np.zeros(n_innings, dtype=np.int64), cum_wickets[over_end]],
+    }
+    rows["final"] = final[rows["innings"]]
+    keep = rows["over"] < OVERS
+    return {name: values[keep] for name, values in rows.items()}
+
+
+def fit(progressions):
+    """Per-over least squares, shrunk towards ``prior_model()``."""
+    prior = prior_model()
+    coef, low, high = prior.coef.copy(), prior.low.copy(), prior.high.copy()
+    over = progressions["over"]
+    X = np.stack([np.ones(len(over)), progressions["runs"], progressions["wickets"]], axis=1).astype(np.float64)
+    y = (progressions["final"] - progressions["runs"]).astype(np.float64)
+    for o in range(OVERS):
+        rows = over == o
+        n = int(rows.sum())
+        if n < 3:
+            continue
+        beta = np.linalg.lstsq(X[rows], y[rows], rcond=None)[0]
+        weight = n / (n + PRIOR_INNINGS)
+        coef[o] = weight * beta + (1 - weight) * prior.coef[o]
+        residuals = y[rows] - X[rows] @ coef[o]
+        q_low, q_high = np.quantile(residuals, QUANTILES)
+        low[o] = weight * q_low + (1 - weight) * prior.low[o]
+        high[o] = weight * q_high + (1 - weight) * prior.high[o]
+    n_innings = len(np.unique(progressions["innings"]))
+    return ProjectionModel(coef=coef, low=low, high=high, n_innings=n_innings)
+
+
+def train(deliveries):
+    return fit(innings_progressions(deliveries))
+
+
+def evaluate(model, progressions):
+    """Mean absolute error of the final total and share of innings inside the range."""
+    projected, low, high = model.project(progressions["runs"], progressions["over"] * 6, progressions["wickets"])
+    final = progressions["final"]
+    return {"rows": len(final), "mae": float(np.abs(projected - final).mean()) if len(final) else float("nan"),
+            "coverage": float(((final >= low) & (final <= high)).mean()) if len(final) else float("nan")}
+
+
+# --- Artifacts ---
+def model_path(era, data_dir):
+    return Path(data_dir) / ARTIFACT_DIRNAME / "projection" / f"{era.key}-{era.version}-f{FORMAT}.npz"
+
+
+def save_model(model, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(suffix=".npz", dir=path.parent)
+    with os.fdopen(fd, "wb") as f:
+        np.savez(f, coef=model.coef, low=model.low, high=model.high, n_innings=model.n_innings)
+    os.replace(tmp, path)
+
+
+def load_model(path):
+    with np.load(path) as data:
+        return ProjectionModel(coef=data["coef"], low=data["low"], high=data["high"], n_innings=int(data["n_innings"]))
+
+
+def load_or_train(era, data_dir):
+    """The model for this version of the era, trained on it and saved first if needed."""
+    path = model_path(era, data_dir)
+    if not path.exists():
+        save_model(train(era.deliveries), path)
+    return load_model(path)
+
+
+if __name__ == "__main__":
+    from cricket_vision.store import DATA_DIR, list_eras, load_era
+
+    parser = argparse.ArgumentParser(description="Train first-innings projection models.")
+    parser.add_argument("eras", nargs="*", help="era keys (default: all)")
+    parser.add_argument("--evaluate", action="store_true",
+                        help="also report held-out error (every fifth innings) against the prior")
+    args = parser.parse_args()
+
+    for era_key in args.eras or list(list_eras()):
+        era = load_era(era_key)
+        model = load_or_train(era, DATA_DIR)
+        print(f"{era_key}: {model.n_innings:,} innings -> {model_path(era, DATA_DIR)}")
+        if args.evaluate and model.n_innings:
+            rows = innings_progressions(era.deliveries)
+            held_out = rows["innings"] % 5 == 0
+            split = {name: values[~held_out] for name, values in rows.items()}
+            test = {name: values[held_out] for name, values in rows.items()}
+            for name, candidate in (("prior", prior_model()), ("trained", fit(split))):
+                stats = evaluate(candidate, test)
+                print(f"  {name:8s} MAE {stats['mae']:6.1f} runs, range coverage {stats['coverage']:.0%} "
+                      f"({stats['rows']:,} held-out states)")
@@ -0,0 +1,120 @@
+"""Elo team ratings over an era's match history.
+
+Matches are replayed in (season, match_id) order. Each result moves the two
+teams' ratings towards the outcome by ``K_FACTOR`` times the surprise, a
+constant-time update. Every team also keeps a compact time series: the match
+sequence numbers it played in and its rating after each one, as ``array``
+columns. Ratings as of any point in the history are then a binary search
+over one team's series, with no replay. The store only records seasons, not
+dates, so "as of" means the end of a season (or a match sequence number).
+
+A match with no winner (abandoned, no result) counts towards the history
+but leaves both ratings unchanged.
+"""
+from array import array
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+BASE_RATING = 1500.0
+K_FACTOR = 24.0
+# A rating gap of SCALE points means 10:1 odds.
+SCALE = 400.0
+
+
+def expected_score(rating, opponent):
+    """Probability that a side rated ``rating`` beats one rated ``opponent``."""
+    return 1.0 / (1.0 + 10.0 ** ((opponent - rating) / SCALE))
+
+
+class EloRatings:
+    def __init__(self, k=K_FACTOR, base=BASE_RATING):
+        self.k = k
+        self.base = base
+        self.current = {}  # team -> rating now
+        self._played = {}  # team -> array of match sequence numbers
+        self._after = {}  # team -> array of ratings after those matches
+        self._seasons = array("i")  # season of each match, by sequence number (0 = unknown)
+        self._season_ends = {}  # season -> sequence number of its last match
+
+    @classmethod
+    def from_matches(cls, matches, **params):
+        ratings = cls(**params)
+        ordered = matches.sort_values(["season", "match_id"], kind="stable", na_position="first")
+        for team1, team2, winner, season in ordered[["team1", "team2", "winner", "season"]].itertuples(index=False):
+            ratings.add_match(team1, team2, winner, season)
+        return ratings
+
+    @property
+    def n_matches(self):
+        return len(self._seasons)
+
+    @property
+    def seasons(self):
+        return sorted(self._season_ends)
+
+    # --- Updates ---
+    def add_match(self, team1, team2, winner, season=None):
+        """Fold one result in O(1); returns the match's sequence number."""
+        seq = self.n_matches
+        known_season = season is not None and not pd.isna(season)
+        self._seasons.append(int(season) if known_season else 0)
+        if known_season:
+            self._season_ends[int(season)] = seq
+        if pd.isna(winner) or winner not in (team1, team2):
+            return seq
+        r1, r2 = self.rating(team1), self.rating(team2)
+        shift = self.k * ((winner == team1) - expected_score(r1, r2))
+        self._record(team1, seq, r1 + shift)
+        self._record(team2, seq, r2 - shift)
+        return seq
+
+    def _record(self, team, seq, rating):
+        self.current[team] = rating
+        if team not in self._played:
+            self._played[team], self._after[team] = array("i"), array("f")
+        self._played[team].append(seq)
+        self._after[team].append(rating)
+
+    # --- Queries ---
+    def season_end(self, season):
+        """Sequence number of the last match played up to and including ``season`` (-1 if none)."""
+        return max((seq for s, seq in self._season_ends.items() if s <= season), default=-1)
+
+    def rating(self, team, season=None, seq=None):
+        """Current rating, or the rating after ``season`` / after match ``seq``."""
+        if season is None and seq is None:
+            return self.current.get(team, self.base)
+        if seq is None:
+            seq = self.season_end(season)
+        played = self._played.get(team)
+        i = bisect_right(played, seq) if played is not None else 0
+        return float(self._after[team][i - 1]) if i else self.base
+
+    def win_probability(self, team1, team2, season=None):
+        """Probability that ``team1`` beats ``team2`` on ratings alone."""
+        return expected_score(self.rating(team1, season), self.rating(team2, season))
+
+    def table(self, teams, season=None):
+        """Teams ranked by rating (as of the end of ``season`` if given)."""
+        seq = None if season is None else self.season_end(season)
+        rows = []
+        for team in teams:
+            played = self._played.get(team, ())
+            n = len(played) if seq is None else bisect_right(played, seq)
+            rows.append({"Team": team, "Rating": self.rating(team, seq=seq), "Matches": n})
+        table = pd.DataFrame(rows, columns=["Team", "Rating", "Matches"])
+        return table.sort_values("Rating", ascending=False, ignore_index=True)
+
+    def history(self, team):
+        """``Match`` (sequence number), ``Season`` and ``Rating`` after each of ``team``'s rated matches."""
+        # Copies: a live view would stop the arrays from growing.
+        played = np.array(self._played.get(team, array("i")), dtype=np.int32)
+        after = np.array(self._after.get(team, array("f")), dtype=np.float32)
+        seasons = np.array(self._seasons, dtype=np.int32)[played]
+        return pd.DataFrame({
+            "Match": played,
+            "Season": pd.Series(seasons, dtype="Int32").where(seasons > 0),
+            "Rating": after,
+        })
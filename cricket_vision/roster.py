@@ -0,0 +1,142 @@
+"""Compact in-memory player model with interned identifiers.
+
+Every player of an era gets an integer id, and each name is held once, as
+an interned string in a single table (``names[id]``). Career stats are
+``array("d")`` columns indexed by id, NaN where a stat does not apply, and
+player types are an ``array("b")`` of codes into ``TYPES``. Structures built
+on top (leaderboards, the season index, player lists) refer to players by
+id and so never hold their own copies of the names.
+
+Ids follow name order, so sorting ids sorts players by name and ties in a
+ranking still break alphabetically. Players added later with ``add`` get the
+next free id.
+
+Pages read single players through ``record(name)``, a ``__slots__`` view that
+indexes like a pandas row (``record["runs"]``).
+"""
+import sys
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from cricket_vision.store import SCHEMAS
+
+STATS = tuple(column for column in SCHEMAS["players"] if column not in ("player", "type"))
+INTEGER_STATS = frozenset(column for column in STATS if SCHEMAS["players"][column].startswith("Int"))
+TYPES = ("Batsman", "Bowler", "All-Rounder")
+NO_TYPE = -1
+
+
+class PlayerRecord:
+    """One player's career stats, read straight from the roster's columns."""
+
+    __slots__ = ("roster", "id")
+
+    def __init__(self, roster, pid):
+        self.roster = roster
+        self.id = pid
+
+    @property
+    def name(self):
+        return self.roster.names[self.id]
+
+    @property
+    def type(self):
+        return self.roster.type(self.id)
+
+    def __getitem__(self, stat):
+        if stat == "type":
+            return self.type
+        return self.roster.get(self.id, stat)
+
+    def __repr__(self):
+        return f"PlayerRecord({self.name!r})"
+
+
+class Roster:
+    def __init__(self):
+        self.names = []  # id -> interned name
+        self._ids = {}  # name -> id
+        self.types = array("b")  # id -> index into TYPES (NO_TYPE if unknown)
+        self.stats = {stat: array("d") for stat in STATS}  # stat -> value by id
+
+    @classmethod
+    def from_players(cls, players):
+        """Build from the store's ``players`` table (indexed by name)."""
+        roster = cls()
+        order = np.argsort(players.index.to_numpy(dtype=object), kind="stable")
+        roster.names = [sys.intern(str(name)) for name in players.index.to_numpy(dtype=object)[order]]
+        roster._ids = {name: pid for pid, name in enumerate(roster.names)}
+        codes = {player_type: code for code, player_type in enumerate(TYPES)}
+        types = players["type"].astype(object).to_numpy()[order]
+        roster.types = array("b", [codes.get(player_type, NO_TYPE) for player_type in types])
+        for stat in STATS:
+            column = players[stat].to_numpy(dtype=np.float64, na_value=np.nan)[order]
+            roster.stats[stat] = array("d", column.tobytes())
+        return roster
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __getstate__(self):
+        # Names are re-interned on load; the id map is rebuilt from them.
+        return self.names, self.types, self.stats
+
+    def __setstate__(self, state):
+        names, self.types, self.stats = state
+        self.names = [sys.intern(name) for name in names]
+        self._ids = {name: pid for pid, name in enumerate(self.names)}
+
+    # --- Ids and names ---
+    def id(self, name):
+        """Id of ``name``; ``KeyError`` if the player is unknown."""
+        return self._ids[name]
+
+    def add(self, name):
+        """Id of ``name``, adding the player (with no stats) if new."""
+        pid = self._ids.get(name)
+        if pid is None:
+            pid = len(self.names)
+            name = sys.intern(name)
+            self.names.append(name)
+            self._ids[name] = pid
+            self.types.append(NO_TYPE)
+            for column in self.stats.values():
+                column.append(np.nan)
+        return pid
+
+    def names_of(self, ids):
+        return [self.names[pid] for pid in ids]
+
+    # --- Fields ---
+    def type(self, pid):
+        code = self.types[pid]
+        return None if code == NO_TYPE else TYPES[code]
+
+    def set_type(self, pid, player_type):
+        self.types[pid] = TYPES.index(player_type) if player_type is not None else NO_TYPE
+
+    def get(self, pid, stat):
+        """``stat`` for player ``pid``: int for counting stats, float otherwise, NaN if not recorded."""
+        value = self.stats[stat][pid]
+        return int(value) if stat in INTEGER_STATS and value == value else value
+
+    def set(self, pid, stat, value):
+        self.stats[stat][pid] = np.nan if value is None or pd.isna(value) else float(value)
+
+    def record(self, name):
+        return PlayerRecord(self, self.id(name))
+
+    # --- Whole columns ---
+    def type_mask(self, types):
+        """Bool array over ids: players whose type is one of ``types``."""
+        codes = np.frombuffer(self.types, dtype=np.int8)
+        return np.isin(codes, [TYPES.index(player_type) for player_type in types])
+
+    def column(self, stat):
+        # A copy: a live view would stop the column from growing.
+        return np.array(self.stats[stat], dtype=np.float64)
@@ -0,0 +1,132 @@
+"""Autocomplete search over an era's player names.
+
+Each name is split into lower-cased words ("RG Sharma" -> "rg", "sharma"),
+plus its initials ("rs") and the whole name run together ("rgsharma"). All
+of these go into one sorted array next to the roster id they came from, so
+the players with a word starting with some prefix are one ``bisect`` range.
+A player matches a query when every query word prefixes one of their
+words, in any order: "sharma", "r sharma", "sharma rg", "rgsh" and "rs"
+all find "RG Sharma". Dots and other punctuation are ignored.
+
+When that finds fewer than ``k`` players, a fuzzy pass over character
+trigrams fills in the names sharing the most trigrams with the query (for
+typos such as "kohly"), once the query has ``FUZZY_MIN_CHARS`` letters.
+Trigrams found in more than ``COMMON_TRIGRAM`` of all names say little and
+are skipped.
+
+Results are ranked: the whole name typed, then the most query words typed
+in full, then the shortest name; ties go by roster id, i.e. name order.
+"""
+import re
+import sys
+from bisect import bisect_left
+
+import numpy as np
+
+COMMON_TRIGRAM = 0.05
+FUZZY_MIN_CHARS = 4
+RESULTS = 20
+_WORD = re.compile(r"[^\W_]+")
+
+
+def words(text):
+    return _WORD.findall(text.lower())
+
+
+def _trigrams(parts):
+    grams = set()
+    for part in parts:
+        padded = f" {part} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class PlayerSearch:
+    def __init__(self, names):
+        self.names = names  # roster names, by id
+        entries = set()
+        postings = {}
+        for pid, name in enumerate(names):
+            # Interned, so a surname shared by many players is stored once.
+            parts = [sys.intern(part) for part in words(name)]
+            joined = "".join(parts)
+            entries.update((part, pid, part == joined) for part in parts)
+            if len(parts) > 1:
+                entries.add(("".join(part[0] for part in parts), pid, False))
+                entries.add((joined, pid, True))
+            for trigram in _trigrams(parts):
+                postings.setdefault(trigram, []).append(pid)
+        entries = sorted(entries)
+        self._words = [word for word, _, _ in entries]
+        self._ids = np.array([pid for _, pid, _ in entries], dtype=np.int32)
+        self._whole = np.array([whole for _, _, whole in entries], dtype=bool)  # entry is the entire name
+        self._length = np.array([min(len(name), 255) for name in names], dtype=np.int64)
+        self._trigrams = {trigram: np.array(ids, dtype=np.int32) for trigram, ids in postings.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def _range(self, word, exact=False):
+        lo = bisect_left(self._words, word)
+        return lo, bisect_left(self._words, word + ("\0" if exact else "\uffff"), lo)
+
+    def search(self, query, k=RESULTS, allowed=None):
+        """Up to ``k`` names matching ``query``, best first.
+
+        ``allowed`` is a bool array over roster ids (e.g. batsmen only). An
+        empty query lists the first ``k`` allowed players in name order.
+        """
+        query_words = words(query)
+        if not query_words:
+            ids = np.flatnonzero(allowed)[:k] if allowed is not None else np.arange(min(k, len(self.names)))
+            return [self.names[pid] for pid in ids]
+
+        # Per-player counters over the whole roster: scattering a word's
+        # range into them is linear, where intersecting sorted id sets is not.
+        n = len(self.names)
+        hits = np.zeros(n, dtype=np.int8)
+        full = np.zeros(n, dtype=np.int8)
+        for word in query_words:
+            lo, hi = self._range(word)
+            seen = np.zeros(n, dtype=bool)
+            seen[self._ids[lo:hi]] = True
+            hits += seen
+            lo, hi = self._range(word, exact=True)
+            seen[:] = False
+            seen[self._ids[lo:hi]] = True
+            full += seen
+        ok = hits == len(query_words)
+        if allowed is not None:
+            ok &= allowed
+        matched = np.flatnonzero(ok)
+
+        if len(matched):
+            lo, hi = self._range("".join(query_words), exact=True)
+            whole = np.zeros(n, dtype=bool)
+            whole[self._ids[lo:hi][self._whole[lo:hi]]] = True
+            # One int64 per player: whole name typed, words typed in full,
+            # name length, then id.
+            rank = ((~whole[matched]).astype(np.int64) << 48) | ((len(query_words) - full[matched].astype(np.int64)) << 40) \
+                | (self._length[matched] << 32) | matched
+            if len(matched) > k:
+                rank = rank[np.argpartition(rank, k)[:k]]
+            matched = np.sort(rank) & 0xFFFFFFFF
+        found = [self.names[pid] for pid in matched]
+        if len(found) < k and len("".join(query_words)) >= FUZZY_MIN_CHARS:
+            found += [self.names[pid] for pid in self._fuzzy(query_words, k - len(found), allowed, exclude=matched)]
+        return found
+
+    def _fuzzy(self, query_words, k, allowed, exclude):
+        grams = _trigrams(query_words)
+        limit = max(50, int(COMMON_TRIGRAM * len(self.names)))
+        postings = [self._trigrams[g] for g in grams if g in self._trigrams and len(self._trigrams[g]) <= limit]
+        if not postings:
+            return []
+        ids, shared = np.unique(np.concatenate(postings), return_counts=True)
+        keep = shared >= max(2, (len(grams) + 1) // 2)  # at least half the query's trigrams
+        if allowed is not None:
+            keep &= allowed[ids]
+        keep &= ~np.isin(ids, exclude)
+        ids, shared = ids[keep], shared[keep]
+        order = np.lexsort((ids, self._length[ids], -shared))[:k]
+        return ids[order]
@@ -0,0 +1,106 @@
+"""Prefix-sum index over season figures.
+
+An era's ``seasons`` table is spread into a dense players x seasons array
+covering every year from the first to the last season (gaps are zero), and
+cumulative sums are taken along the season axis. The total for any player
+over any window is then two lookups, and the totals for every player over a
+window are one column difference, so ranking a window is a single
+vectorized ``argsort``.
+"""
+import numpy as np
+import pandas as pd
+
+
+class SeasonIndex:
+    def __init__(self, players, first_season, values):
+        self.players = players  # pd.Index of names, row order of ``values``
+        self.first_season = first_season
+        self.n_seasons = values.shape[1]
+        zero = np.zeros((len(players), 1), dtype=np.int64)
+        # Column j of each holds the sum over the first j seasons.
+        self.cum_values = np.concatenate([zero, np.cumsum(values, axis=1, dtype=np.int64)], axis=1)
+        self.cum_played = np.concatenate([zero, np.cumsum(values > 0, axis=1, dtype=np.int64)], axis=1)
+
+    @classmethod
+    def from_seasons(cls, players, seasons):
+        """Build from the store's ``seasons`` table, rows in ``players`` order."""
+        players = pd.Index(players)
+        if seasons.empty:
+            return cls(players, 0, np.zeros((len(players), 0), dtype=np.int64))
+        season = seasons["season"].to_numpy(dtype=np.int64)
+        first = int(season.min())
+        n_seasons = int(season.max()) - first + 1
+        rows = players.get_indexer(seasons["player"].astype(object))
+        known = rows >= 0
+        flat = rows[known] * n_seasons + (season[known] - first)
+        values = np.bincount(flat, weights=seasons["value"].to_numpy(dtype=np.float64)[known],
+                             minlength=len(players) * n_seasons)
+        return cls(players, first, values.astype(np.int64).reshape(len(players), n_seasons))
+
+    @property
+    def last_season(self):
+        return self.first_season + self.n_seasons - 1
+
+    def _columns(self, first, last):
+        lo = np.clip(first - self.first_season, 0, self.n_seasons)
+        hi = np.clip(last - self.first_season + 1, lo, self.n_seasons)
+        return lo, hi
+
+    # --- Per-player (O(1)) ---
+    def total(self, player, first, last):
+        row = self.players.get_loc(player)
+        lo, hi = self._columns(first, last)
+        return int(self.cum_values[row, hi] - self.cum_values[row, lo])
+
+    def seasons_played(self, player, first, last):
+        row = self.players.get_loc(player)
+        lo, hi = self._columns(first, last)
+        return int(self.cum_played[row, hi] - self.cum_played[row, lo])
+
+    def per_season(self, player, first, last):
+        """Average over the seasons actually played in the window (NaN if none)."""
+        played = self.seasons_played(player, first, last)
+        return self.total(player, first, last) / played if played else np.nan
+
+    # --- Every player at once ---
+    def totals(self, first, last):
+        lo, hi = self._columns(first, last)
+        return self.cum_values[:, hi] - self.cum_values[:, lo]
+
+    def played(self, first, last):
+        lo, hi = self._columns(first, last)
+        return self.cum_played[:, hi] - self.cum_played[:, lo]
+
+    def rank(self, first, last, mask=None, k=None, per_season=False):
+        """Players ordered by window total (or per-season average), best first.
+
+        ``mask`` is a boolean array over ``players`` (e.g. bowlers only);
+        players who did not play in the window are left out.
+        """
+        totals = self.totals(first, last)
+        played = self.played(first, last)
+        keep = played > 0 if mask is None else (played > 0) & mask
+        rows = np.flatnonzero(keep)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            score = totals[rows] / played[rows] if per_season else totals[rows]
+        if k is not None and k < len(rows):
+            top = np.argpartition(-score, k)[:k]
+            rows, score = rows[top], score[top]
+        order = np.argsort(-score, kind="stable")
+        return pd.DataFrame({
+            "player": self.players[rows[order]],
+            "total": totals[rows[order]],
+            "seasons": played[rows[order]],
+            "score": score[order],
+        })
+
+    def player_rank(self, player, first, last, mask=None):
+        """1-based rank of ``player`` by window total among ``mask``, or None."""
+        row = self.players.get_loc(player)
+        totals = self.totals(first, last)
+        peers = self.played(first, last) > 0
+        if mask is not None:
+            peers &= mask
+        if not peers[row]:
+            return None
+        return int((totals[peers] > totals[row]).sum()) + 1
@@ -0,0 +1,105 @@
+"""Hand-entered era data the on-disk store is seeded from.
+
+This is the nested ``players`` / ``matches`` layout the app originally kept
+in memory. It is only read by ``python -m cricket_vision.store`` when the
+Parquet files under ``data/`` are (re)built; the pages never import it.
+The Future Era is not entered by hand but simulated from the other two
+(``simulate.py``).
+"""
+
+# --- Data Store (ENHANCED) ---
+# I've added more details like 'venue' in matches and 'h2h' stats in players.
+def recorded_datasets():
+    datasets = {
+        "historicData": {
+            "name": "Historic Era (2008-2016)",
+            "teams": ["Chennai Super Kings", "Mumbai Indians", "Royal Challengers Bangalore", "Kolkata Knight Riders", "Kings XI Punjab", "Rajasthan Royals", "Deccan Chargers", "Pune Warriors"],
+            "players": {
+                "SR Tendulkar": { "type": "Batsman", "seasons": { 2010: 618, 2011: 553, 2012: 324, 2013: 287 }, "stats": { "runs": 2334, "avg": 34.83, "sr": 119.81, "dismissals": 67 }, "h2h": { "SL Malinga": {"runs": 45, "balls": 30, "dismissals": 2}, "A Mishra": {"runs": 60, "balls": 45, "dismissals": 1} } },
+                "CH Gayle": { "type": "Batsman", "seasons": { 2011: 608, 2012: 733, 2013: 720, 2015: 491 }, "stats": { "runs": 3420, "avg": 43.29, "sr": 152.75, "dismissals": 79 }, "h2h": { "Harbhajan Singh": {"runs": 80, "balls": 40, "dismissals": 1} } },
+                "V Sehwag": { "type": "Batsman", "seasons": { 2011: 424, 2012: 495, 2014: 455 }, "stats": { "runs": 2728, "avg": 27.55, "sr": 155.44, "dismissals": 99 }, "h2h": {} },
+                "G Gambhir": { "type": "Batsman", "seasons": { 2012: 590, 2016: 501 }, "stats": { "runs": 4217, "avg": 31.01, "sr": 123.88, "dismissals": 136 }, "h2h": {} },
+                "SK Raina": { "type": "Batsman", "seasons": { 2010: 520, 2013: 548, 2014: 523 }, "stats": { "runs": 5528, "avg": 32.51, "sr": 136.76, "dismissals": 170 }, "h2h": {} },
+                "SL Malinga": { "type": "Bowler", "seasons": { 2011: 28, 2012: 22, 2013: 20, 2015: 24 }, "stats": { "wickets": 170, "econ": 7.14, "avg": 19.8, "overs": 471.1 } },
+                "A Mishra": { "type": "Bowler", "seasons": { 2011: 19, 2013: 21, 2016: 13 }, "stats": { "wickets": 166, "econ": 7.35, "avg": 23.95, "overs": 541.1 } },
+                "Harbhajan Singh": { "type": "Bowler", "seasons": { 2013: 24, 2015: 18 }, "stats": { "wickets": 150, "econ": 7.07, "avg": 26.44, "overs": 569.2 } },
+                "DJ Bravo": { "type": "All-Rounder", "seasons": { 2013: 32, 2015: 26 }, "stats": { "runs": 1538, "avg": 24.81, "sr": 128.93, "dismissals": 62, "wickets": 183, "econ": 8.38, "bowl_avg": 23.82, "overs": 543.2 }, "h2h": {} },
+                "SR Watson": { "type": "All-Rounder", "seasons": { 2013: 543, 2016: 179 }, "stats": { "runs": 3874, "avg": 30.99, "sr": 139.53, "dismissals": 125, "wickets": 92, "econ": 7.93, "bowl_avg": 29.15, "overs": 343.4 }, "h2h": {} },
+            },
+            "matches": [
+                { "team1": "Mumbai Indians", "team2": "Chennai Super Kings", "winner": "Mumbai Indians", "venue": "Wankhede Stadium, Mumbai" },
+                { "team1": "Mumbai Indians", "team2": "Chennai Super Kings", "winner": "Chennai Super Kings", "venue": "MA Chidambaram Stadium, Chennai" },
+                { "team1": "Royal Challengers Bangalore", "team2": "Kolkata Knight Riders", "winner": "Kolkata Knight Riders", "venue": "Eden Gardens, Kolkata" },
+                { "team1": "Kings XI Punjab", "team2": "Rajasthan Royals", "winner": "Kings XI Punjab", "venue": "Sawai Mansingh Stadium, Jaipur" },
+                { "team1": "Deccan Chargers", "team2": "Pune Warriors", "winner": "Deccan Chargers", "venue": "DY Patil Stadium, Mumbai" },
+                { "team1": "Mumbai Indians", "team2": "Kolkata Knight Riders", "winner": "Mumbai Indians", "venue": "Wankhede Stadium, Mumbai" },
+            ]
+        },
+        "modernData": {
+            "name": "Modern Era (2017-2022)",
+            "teams": ["Chennai Super Kings", "Mumbai Indians", "Royal Challengers Bangalore", "Kolkata Knight Riders", "Delhi Capitals", "Punjab Kings", "Rajasthan Royals", "Sunrisers Hyderabad", "Gujarat Titans"],
+            "players": {
+                "V Kohli": { "type": "Batsman", "seasons": { 2018: 530, 2019: 464, 2020: 466, 2021: 405, 2022: 341 }, "stats": { "runs": 6624, "avg": 36.2, "sr": 129.15, "dismissals": 183 }, "h2h": {"JJ Bumrah": {"runs": 140, "balls": 105, "dismissals": 4}, "K Rabada": {"runs": 90, "balls": 60, "dismissals": 2}, "R Ashwin": {"runs": 120, "balls": 110, "dismissals": 1}} },
+                "RG Sharma": { "type": "Batsman", "seasons": { 2018: 286, 2019: 405, 2020: 332, 2021: 381, 2022: 268 }, "stats": { "runs": 5879, "avg": 29.54, "sr": 129.89, "dismissals": 199 }, "h2h": {"YS Chahal": {"runs": 95, "balls": 70, "dismissals": 3}} },
+                "KL Rahul": { "type": "Batsman", "seasons": { 2018: 659, 2020: 670, 2022: 616 }, "stats": { "runs": 3889, "avg": 47.43, "sr": 136.22, "dismissals": 82 }, "h2h": {} },
+                "S Dhawan": { "type": "Batsman", "seasons": { 2019: 521, 2020: 618, 2022: 460 }, "stats": { "runs": 6244, "avg": 35.08, "sr": 126.35, "dismissals": 178 }, "h2h": {} },
+                "DA Warner": { "type": "Batsman", "seasons": { 2017: 641, 2019: 692, 2020: 548 }, "stats": { "runs": 5881, "avg": 41.13, "sr": 140.69, "dismissals": 143 }, "h2h": {} },
+                "JJ Bumrah": { "type": "Bowler", "seasons": { 2018: 17, 2019: 19, 2020: 27, 2021: 21, 2022: 15 }, "stats": { "wickets": 145, "econ": 7.39, "avg": 23.31, "overs": 457.1 } },
+                "YS Chahal": { "type": "Bowler", "seasons": { 2018: 12, 2019: 18, 2020: 21, 2021: 18, 2022: 27 }, "stats": { "wickets": 170, "econ": 7.61, "avg": 21.69, "overs": 483.1 } },
+                "K Rabada": { "type": "Bowler", "seasons": { 2019: 25, 2020: 30, 2022: 23 }, "stats": { "wickets": 99, "econ": 8.21, "avg": 20.52, "overs": 382.2 } },
+                "R Ashwin": { "type": "Bowler", "seasons": { 2018: 14, 2019: 15, 2022: 12 }, "stats": { "wickets": 157, "econ": 6.94, "avg": 28.46, "overs": 649.3 } },
+                "AD Russell": { "type": "All-Rounder", "seasons": { 2018: 316, 2019: 510, 2022: 335 }, "stats": { "runs": 2035, "avg": 29.07, "sr": 177.88, "dismissals": 70, "wickets": 89, "econ": 9.19, "bowl_avg": 26.5, "overs": 271.1 }, "h2h": {} },
+            },
+            "matches": [
+                { "team1": "Mumbai Indians", "team2": "Chennai Super Kings", "winner": "Mumbai Indians", "venue": "Wankhede Stadium, Mumbai" },
+                { "team1": "Gujarat Titans", "team2": "Rajasthan Royals", "winner": "Gujarat Titans", "venue": "Narendra Modi Stadium, Ahmedabad" },
+                { "team1": "Delhi Capitals", "team2": "Sunrisers Hyderabad", "winner": "Delhi Capitals", "venue": "Arun Jaitley Stadium, Delhi" },
+                { "team1": "Royal Challengers Bangalore", "team2": "Punjab Kings", "winner": "Royal Challengers Bangalore", "venue": "M. Chinnaswamy Stadium, Bengaluru" },
+            ]
+        }
+    }
+    return datasets
+
+
+# --- Future Era ---
+# Simulated ball by ball from the two recorded eras (see simulate.py). These
+# hand-entered players join the squads by name, playing to their figures
+# here; the rest come from the recorded eras.
+FUTURE_FIRST_SEASON = 2023
+FUTURE_SEASONS = 3
+FUTURE_TEAMS = ["Gujarat Titans", "Lucknow Super Giants", "Rajasthan Royals", "Royal Challengers Bangalore", "Delhi Capitals", "Punjab Kings", "Kolkata Knight Riders", "Sunrisers Hyderabad", "Chennai Super Kings", "Mumbai Indians"]
+FUTURE_PLAYERS = {
+    "JC Buttler": { "type": "Batsman", "stats": { "runs": 4000, "avg": 38.5, "sr": 150.1, "dismissals": 105 } },
+    "Shubman Gill": { "type": "Batsman", "stats": { "runs": 4000, "avg": 40.0, "sr": 140.0, "dismissals": 100 } },
+    "H Pandya": { "type": "All-Rounder", "stats": { "runs": 3000, "avg": 30.0, "sr": 148.0, "dismissals": 100, "wickets": 80, "econ": 8.9, "bowl_avg": 30.0, "overs": 300 } },
+    "R Khan": { "type": "Bowler", "stats": { "wickets": 180, "econ": 6.5, "avg": 20.0, "overs": 600 } },
+}
+HOME_GROUNDS = {
+    "Gujarat Titans": "Narendra Modi Stadium, Ahmedabad",
+    "Lucknow Super Giants": "Ekana Cricket Stadium, Lucknow",
+    "Rajasthan Royals": "Sawai Mansingh Stadium, Jaipur",
+    "Royal Challengers Bangalore": "M. Chinnaswamy Stadium, Bengaluru",
+    "Delhi Capitals": "Arun Jaitley Stadium, Delhi",
+    "Punjab Kings": "PCA Stadium, Mohali",
+    "Kolkata Knight Riders": "Eden Gardens, Kolkata",
+    "Sunrisers Hyderabad": "Rajiv Gandhi International Stadium, Hyderabad",
+    "Chennai Super Kings": "MA Chidambaram Stadium, Chennai",
+    "Mumbai Indians": "Wankhede Stadium, Mumbai",
+}
+
+
+def future_era(datasets, n_seasons=FUTURE_SEASONS, seed=0, workers=None):
+    from cricket_vision.simulate import simulate_era
+
+    last_season = FUTURE_FIRST_SEASON + n_seasons - 1
+    return simulate_era(
+        [datasets["historicData"], datasets["modernData"]], FUTURE_TEAMS, FUTURE_FIRST_SEASON, n_seasons,
+        name=f"Future Era (Simulated {FUTURE_FIRST_SEASON}-{last_season})", anchors=FUTURE_PLAYERS,
+        venues=HOME_GROUNDS, seed=seed, workers=workers,
+    )
+
+
+def get_datasets():
+    datasets = recorded_datasets()
+    datasets["futureData"] = future_era(datasets)
+    return datasets
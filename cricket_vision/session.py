@@ -0,0 +1,356 @@
+"""Streamlit glue: which era a session is looking at and the shared era data.
+
+Sessions only keep ``active_data_key`` in ``st.session_state``. The era
+tables themselves are loaded once per server process through
+``st.cache_resource`` and shared, read-only, by every session, and so are
+the structures derived from them, which come from a prebuilt snapshot
+(``derived.py``) rather than being rebuilt at startup.
+
+Each cached resource is keyed by era *and* the era's content version and
+registered, with what it is computed from, in ``RESOURCES``; the era
+watcher (``watcher.py``) moves an era to a new version when its files
+change. The public ``get_*`` accessors take just the era key.
+"""
+import os
+
+import pandas as pd
+import streamlit as st
+
+from cricket_vision import derived, projection, sqlstore
+from cricket_vision.live import LiveMatchService, resolve_source
+from cricket_vision.profiling import ENABLED as PROFILING, REGISTRY, serve_metrics
+from cricket_vision.similar import SimilarityIndex
+from cricket_vision.store import BATTING_TYPES, DATA_DIR, era_version, list_eras, load_era
+from cricket_vision.watcher import ALL_ERAS, EraWatcher, ResourceGraph, StaleVersion
+from cricket_vision.winprob import fit_outcome_model
+from cricket_vision.wptable import load_or_build
+
+DEFAULT_ERA = "modernData"
+WATCH_INTERVAL = float(os.environ.get("CRICKET_VISION_WATCH_SECONDS", 2))  # 0 = never reload
+
+RESOURCES = ResourceGraph(lambda key: era_version(key, DATA_DIR), lambda: list(era_options()))
+
+
+def era_resource(name, spinner=False, max_entries=None, **graph_options):
+    """``st.cache_resource`` for ``fn(key, version, *args)``, registered in ``RESOURCES`` as ``name``."""
+    def register(fn):
+        cached = st.cache_resource(show_spinner=spinner, max_entries=max_entries)(fn)
+        return RESOURCES.resource(name, max_entries=max_entries, **graph_options)(cached)
+    return register
+
+
+@st.cache_resource(show_spinner=False)
+def get_watcher():
+    watcher = EraWatcher(RESOURCES, DATA_DIR, WATCH_INTERVAL)
+    return watcher.start() if WATCH_INTERVAL > 0 else watcher
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _era_options(listing):
+    return list_eras()
+
+
+def era_options():
+    return _era_options(get_watcher().listing)
+
+
+@era_resource("era", warm=True, spinner="Loading era...")
+def _era(key, version):
+    # Eras are read from disk the first time any session switches to them.
+    era = load_era(key)
+    if era.version != version:
+        raise StaleVersion(key)  # not cached; the graph moves the era on and retries
+    return era
+
+
+def get_era(key):
+    return RESOURCES.get("era", key)
+
+
+def active_era():
+    get_watcher()
+    return get_era(st.session_state.active_data_key)
+
+
+@era_resource("derived", depends_on=["era"], warm=True, spinner="Loading era indexes...")
+def _derived(key, version):
+    # Loaded from the era's prebuilt snapshot; built (and saved) only when the
+    # era's data changed since the snapshot was made.
+    return derived.load_or_build(RESOURCES.get_at("era", key, version), DATA_DIR)
+
+
+def get_derived(key):
+    return RESOURCES.get("derived", key)
+
+
+def get_roster(key):
+    return get_derived(key).roster
+
+
+def get_player_groups(key):
+    return get_derived(key).player_groups
+
+
+def get_bowler_mask(key):
+    return get_derived(key).bowler_mask
+
+
+def get_leaderboards(key):
+    return get_derived(key).leaderboards
+
+
+def get_season_index(key):
+    return get_derived(key).season_index
+
+
+def get_h2h_index(key):
+    return get_derived(key).h2h_index
+
+
+def get_phase_table(key):
+    return get_derived(key).phase_table
+
+
+def get_matchup_matrix(key):
+    return get_derived(key).matchup_matrix
+
+
+def get_ratings(key):
+    return get_derived(key).ratings
+
+
+@era_resource("outcome_model", depends_on=["era"], warm=True)
+def _outcome_model(key, version):
+    return fit_outcome_model(RESOURCES.get_at("era", key, version).deliveries)
+
+
+def get_outcome_model(key):
+    return RESOURCES.get("outcome_model", key)
+
+
+@era_resource("winprob_table", depends_on=["era", "outcome_model"], warm=True,
+              spinner="Building win-probability table...")
+def _winprob_table(key, version):
+    # The table file is named for the version of the era it is built from.
+    return load_or_build(RESOURCES.get_at("era", key, version), DATA_DIR,
+                         lambda: RESOURCES.get_at("outcome_model", key, version))
+
+
+def get_winprob_table(key):
+    return RESOURCES.get("winprob_table", key)
+
+
+@era_resource("projection_model", depends_on=["era"], warm=True, spinner="Training score projection...")
+def _projection_model(key, version):
+    return projection.load_or_train(RESOURCES.get_at("era", key, version), DATA_DIR)
+
+
+def get_projection_model(key):
+    return RESOURCES.get("projection_model", key)
+
+
+@era_resource("live_service", depends_on=["winprob_table", "projection_model"], on_evict=LiveMatchService.stop,
+              max_entries=8)
+def _live_service(key, version, source):
+    # One follower per (era, feed) for the whole server; every session
+    # watching the same feed reads the same state. Followers of quiet or
+    # missing feeds end on their own (``live.IDLE_TIMEOUT``).
+    return LiveMatchService(source, RESOURCES.get_at("winprob_table", key, version),
+                            RESOURCES.get_at("projection_model", key, version)).start()
+
+
+def get_live_service(key, source):
+    """The follower for ``source``; ``ValueError`` unless it is an allowed feed."""
+    source = resolve_source(source)
+    service = RESOURCES.get("live_service", key, source)
+    if service.finished:
+        # The live panel (a fragment) keeps showing why it stopped; a full
+        # page run starts a new follower.
+        _live_service.clear(key, RESOURCES.version(key), source)
+        service = RESOURCES.get("live_service", key, source)
+    return service
+
+
+@era_resource("similarity_index", depends_on=["era"], warm=True, across_eras=True,
+              spinner="Indexing similar players...")
+def _similarity_index(key, versions):
+    # One index over every era so within- and cross-era queries share a scale.
+    return SimilarityIndex.from_eras(RESOURCES.get_at("era", era_key, version) for era_key, version in versions)
+
+
+def get_similarity_index():
+    return RESOURCES.get("similarity_index", ALL_ERAS)
+
+
+# --- SQL aggregations ---
+# Filtered aggregations (team form by venue and season, a player's numbers
+# by ground) run against the era's SQLite file. Results are cached per
+# query and parameters and shared by every session; callers must not
+# mutate them.
+@era_resource("era_db", depends_on=["era"], warm=True, spinner="Indexing era for queries...")
+def _era_db(key, version):
+    return sqlstore.load_or_build(RESOURCES.get_at("era", key, version), DATA_DIR)
+
+
+def get_era_db(key):
+    return RESOURCES.get("era_db", key)
+
+
+@era_resource("season_span", depends_on=["era_db"])
+def _season_span(key, version):
+    return RESOURCES.get_at("era_db", key, version).season_span()
+
+
+def get_match_season_span(key):
+    return RESOURCES.get("season_span", key)
+
+
+@era_resource("query", depends_on=["era_db"], max_entries=512)
+def _query(key, version, name, params):
+    return RESOURCES.get_at("era_db", key, version).query(name, **dict(params))
+
+
+def run_query(key, name, **params):
+    return RESOURCES.get("query", key, name, tuple(sorted(params.items())))
+
+
+# --- Figures ---
+# Keyed by era plus the selection they show and shared by every session, so
+# a rerun that changes nothing else reuses the figure as-is. Callers must
+# not mutate them. ``figures`` is imported on first use, which defers
+# plotly.express and its data modules (about 50-80 ms, once per process);
+# plotly itself is already loaded by ``import streamlit``.
+@era_resource("archetype_figure", depends_on=["era"], warm=True, max_entries=16)
+def _archetype_figure(key, version):
+    from cricket_vision import figures
+
+    players = RESOURCES.get_at("era", key, version).players
+    is_archetype = players['type'].isin(BATTING_TYPES) & (players['runs'].fillna(0) > 100)
+    if not is_archetype.any():
+        return None
+    return figures.archetype_figure(players[is_archetype])
+
+
+def get_archetype_figure(key):
+    return RESOURCES.get("archetype_figure", key)
+
+
+@era_resource("season_figure", depends_on=["era"], max_entries=512)
+def _season_figure(key, version, player, season_range, label, kind):
+    from cricket_vision import figures
+
+    seasons = RESOURCES.get_at("era", key, version).seasons
+    in_range = (seasons['player'] == player) & seasons['season'].between(*season_range)
+    if not in_range.any():
+        return None
+    return figures.season_figure(seasons.loc[in_range, ['season', 'value']], player, label, kind)
+
+
+def get_season_figure(key, player, season_range, label, kind="line"):
+    return RESOURCES.get("season_figure", key, player, season_range, label, kind)
+
+
+@era_resource("h2h_pie", depends_on=["derived"], max_entries=256)
+def _h2h_pie(key, version, team1, team2):
+    from cricket_vision import figures
+
+    wins = RESOURCES.get_at("derived", key, version).h2h_index.lookup(team1, team2)['wins']
+    return figures.h2h_pie(team1, team2, wins[team1], wins[team2])
+
+
+def get_h2h_pie(key, team1, team2):
+    return RESOURCES.get("h2h_pie", key, team1, team2)
+
+
+@era_resource("h2h_matrix_figure", depends_on=["era", "derived"], warm=True, max_entries=16)
+def _h2h_matrix_figure(key, version):
+    from cricket_vision import figures
+
+    era = RESOURCES.get_at("era", key, version)
+    h2h_index = RESOURCES.get_at("derived", key, version).h2h_index
+    return figures.grid_heatmap(h2h_index.win_matrix(era.teams), 500, text_auto=True, color_continuous_scale="Blues")
+
+
+def get_h2h_matrix_figure(key):
+    return RESOURCES.get("h2h_matrix_figure", key)
+
+
+@era_resource("rating_history_figure", depends_on=["derived"], max_entries=64)
+def _rating_history_figure(key, version, teams):
+    from cricket_vision import figures
+
+    ratings = RESOURCES.get_at("derived", key, version).ratings
+    return figures.rating_history_figure({team: ratings.history(team) for team in teams}, ratings.base)
+
+
+def get_rating_history_figure(key, teams):
+    return RESOURCES.get("rating_history_figure", key, teams)
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def get_outcome_donut(title, labels, values):
+    # Keyed by content: the breakdown is derived on the page from one matchup.
+    from cricket_vision import figures
+
+    return figures.outcome_donut(title, list(labels), list(values))
+
+
+@era_resource("matchup_heatmap_figure", depends_on=["derived"], spinner="Drawing matchup heatmap...", max_entries=64)
+def _matchup_heatmap_figure(key, version, metric, label):
+    from cricket_vision import figures
+
+    matrix = RESOURCES.get_at("derived", key, version).matchup_matrix
+    return figures.grid_heatmap(matrix.heatmap(metric=metric), 600, color_continuous_scale="RdYlGn",
+                                labels={'x': 'Bowler', 'y': 'Batsman', 'color': label})
+
+
+def get_matchup_heatmap_figure(key, metric, label):
+    return RESOURCES.get("matchup_heatmap_figure", key, metric, label)
+
+
+# --- Developer profiling ---
+@st.cache_resource(show_spinner=False)
+def get_metrics_server():
+    try:
+        return serve_metrics()
+    except OSError:  # port taken (e.g. a second server); the sidebar panel still works
+        return None
+
+
+def player_picker(key, label, group=None, widget_key=None):
+    """Search box plus a selectbox of the best matches; returns the chosen name (or None).
+
+    ``group`` names a ``derived.PlayerGroups`` field to pick from (default:
+    everyone). However large the era, the browser only ever gets the top
+    ``search.RESULTS`` names.
+    """
+    data = get_derived(key)
+    allowed = None if group is None else getattr(data.player_groups, group)
+    widget_key = widget_key or label
+    query = st.text_input("Search players", key=f"{widget_key}_search", placeholder="Name or initials, e.g. rg sharma")
+    options = data.search.search(query, allowed=allowed)
+    if query and not options:
+        st.caption("No players match.")
+    return st.selectbox(label, options, index=0 if options else None, key=widget_key)
+
+
+def profiling_panel():
+    """Sidebar tables of section and fragment timings; only shown with CRICKET_VISION_PROFILE=1."""
+    if not PROFILING:
+        return
+    server = get_metrics_server()
+    with st.sidebar.expander("⏱️ Render Profile"):
+        summary = pd.DataFrame(REGISTRY.summary())
+        if summary.empty:
+            st.caption("No timings recorded yet.")
+        else:
+            for kind, caption in (("section", "Full page runs, by section"),
+                                  ("fragment", "Fragment runs (with the page or on their own)")):
+                rows = summary[summary["kind"] == kind].drop(columns="kind")
+                if not rows.empty:
+                    st.caption(caption)
+                    st.dataframe(rows.round(2), hide_index=True)
+        if server is not None:
+            host, port = server.server_address[:2]
+            st.caption(f"Metrics at http://{host}:{port}/metrics (Prometheus) and /metrics.json")
+        st.download_button("Download metrics", REGISTRY.to_prometheus(), file_name="cricket_vision.prom")
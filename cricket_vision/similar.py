@@ -0,0 +1,149 @@
+"""Nearest-neighbour "similar players" index.
+
+Every player in every era becomes one feature vector covering batting,
+bowling and the shape of their season-by-season output. Features are
+standardized over all eras together, so distances are comparable across
+eras, and each group is scaled to carry the same total weight however many
+columns it has. Missing stats (a batsman's economy) sit at the mean.
+
+The vectors are one contiguous ``float32`` matrix; a query is a single
+matrix-vector product plus ``argpartition``, and ``query_many`` does the
+all-pairs version in row blocks so memory stays bounded.
+"""
+import numpy as np
+import pandas as pd
+
+FEATURE_GROUPS = {
+    "batting": ["log_runs", "bat_avg", "sr", "log_dismissals"],
+    "bowling": ["log_wickets", "econ", "bowl_avg", "log_overs"],
+    "trajectory": ["log_seasons", "slope", "peak_at", "spread"],
+}
+FEATURES = [col for cols in FEATURE_GROUPS.values() for col in cols]
+
+
+def season_shape(seasons):
+    """Per-player career shape from ``seasons``, independent of scale and calendar.
+
+    ``slope`` is the trend of output (relative to the player's own mean) over
+    career position 0..1, ``peak_at`` where in the career the best season
+    fell, and ``spread`` the coefficient of variation.
+    """
+    df = seasons[["player", "season", "value"]].astype({"player": object, "season": "int64", "value": "float64"})
+    df = df.sort_values(["player", "season"], kind="stable", ignore_index=True)
+    grouped = df.groupby("player", sort=False)
+    n = grouped["value"].transform("size").to_numpy()
+    mean = grouped["value"].transform("mean").to_numpy()
+    pos = grouped.cumcount().to_numpy() / np.maximum(n - 1, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = np.where(mean > 0, df["value"].to_numpy() / mean, 0.0)
+    parts = pd.DataFrame({"player": df["player"].to_numpy(), "x": pos, "y": y, "xy": pos * y, "xx": pos * pos})
+    sums = parts.groupby("player", sort=False).agg(
+        n=("x", "size"), x=("x", "sum"), y=("y", "sum"), xy=("xy", "sum"), xx=("xx", "sum"), y_std=("y", "std"))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var_x = sums["xx"] - sums["x"] ** 2 / sums["n"]
+        slope = (sums["xy"] - sums["x"] * sums["y"] / sums["n"]) / var_x
+    peak = grouped["value"].idxmax()
+    return pd.DataFrame({
+        "log_seasons": np.log1p(sums["n"]),
+        "slope": slope.where(var_x > 0),
+        "peak_at": pd.Series(pos[peak.to_numpy()], index=peak.index),
+        "spread": sums["y_std"],
+    }, index=sums.index)
+
+
+def player_features(players, seasons):
+    """Raw (unstandardized) feature table for one era, indexed by player."""
+    numeric = players.drop(columns="type").astype("float64")
+    features = pd.DataFrame({
+        "log_runs": np.log1p(numeric["runs"]),
+        "bat_avg": numeric["bat_avg"],
+        "sr": numeric["sr"],
+        "log_dismissals": np.log1p(numeric["dismissals"]),
+        "log_wickets": np.log1p(numeric["wickets"]),
+        "econ": numeric["econ"],
+        "bowl_avg": numeric["bowl_avg"],
+        "log_overs": np.log1p(numeric["overs"]),
+    }, index=players.index)
+    return features.join(season_shape(seasons))[FEATURES]
+
+
+class SimilarityIndex:
+    def __init__(self, labels, raw):
+        # era (key), era_name, player, type; rows grouped by era as from_eras builds them
+        self.labels = labels.reset_index(drop=True)
+        raw = np.asarray(raw, dtype=np.float64)
+        mean = np.nanmean(raw, axis=0) if len(raw) else np.zeros(raw.shape[1])
+        std = np.nanstd(raw, axis=0) if len(raw) else np.ones(raw.shape[1])
+        z = (raw - np.nan_to_num(mean)) / np.where(np.nan_to_num(std) > 0, std, 1.0)
+        weights = np.concatenate([np.full(len(cols), 1 / np.sqrt(len(cols))) for cols in FEATURE_GROUPS.values()])
+        self.vectors = np.ascontiguousarray(np.nan_to_num(z) * weights, dtype=np.float32)
+        self.sq_norms = np.einsum("ij,ij->i", self.vectors, self.vectors)
+        self.era_codes, self.eras = pd.factorize(self.labels["era"])
+        starts = np.flatnonzero(np.diff(self.era_codes, prepend=-1))
+        self.era_bounds = list(zip(starts, np.append(starts[1:], len(self.era_codes))))
+        self._positions = {key: i for i, key in enumerate(zip(self.labels["era"], self.labels["player"]))}
+
+    @classmethod
+    def from_eras(cls, eras):
+        labels, raw = [], []
+        for era in eras:
+            labels.append(pd.DataFrame({"era": era.key, "era_name": era.name, "player": era.players.index,
+                                        "type": era.players["type"].astype(object).to_numpy()}))
+            raw.append(player_features(era.players, era.seasons).to_numpy())
+        if not labels:
+            return cls(pd.DataFrame(columns=["era", "era_name", "player", "type"]), np.empty((0, len(FEATURES))))
+        return cls(pd.concat(labels, ignore_index=True), np.concatenate(raw))
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def position(self, era, player):
+        return self._positions.get((era, player))
+
+    def _sq_distances(self, rows, lo=0, hi=None):
+        """Squared distances from ``rows`` to players ``lo:hi``, shape (len(rows), hi - lo)."""
+        d2 = self.vectors[rows] @ self.vectors[lo:hi].T
+        d2 *= -2
+        d2 += self.sq_norms[lo:hi]
+        d2 += self.sq_norms[rows, None]
+        return np.maximum(d2, 0, out=d2)
+
+    def query(self, era, player, k=5, same_era=True):
+        """The ``k`` players closest to ``player``, nearest first, as a DataFrame."""
+        i = self.position(era, player)
+        if i is None:
+            return self._result(np.array([], dtype=np.int64), np.array([]))
+        # Eras are stored contiguously, so a within-era query only scans its own rows.
+        lo, hi = self.era_bounds[self.era_codes[i]] if same_era else (0, len(self))
+        d2 = self._sq_distances([i], lo, hi)[0]
+        d2[i - lo] = np.inf
+        k = min(k, hi - lo - 1)
+        nearest = np.argpartition(d2, k)[:k] if k < len(d2) else np.arange(len(d2))
+        nearest = nearest[np.argsort(d2[nearest], kind="stable")]
+        return self._result(nearest + lo, np.sqrt(d2[nearest]))
+
+    def query_many(self, k=5, block=1024):
+        """Nearest ``k`` for every player (any era); ``(indices, distances)`` of shape (n, k).
+
+        Rows are processed ``block`` at a time so the distance buffer is at
+        most ``block * n`` floats.
+        """
+        n = len(self)
+        k = max(min(k, n - 1), 0)
+        indices = np.empty((n, k), dtype=np.int64)
+        distances = np.empty((n, k), dtype=np.float32)
+        for start in range(0, n, block):
+            rows = np.arange(start, min(start + block, n))
+            d2 = self._sq_distances(rows)
+            d2[np.arange(len(rows)), rows] = np.inf
+            part = np.argpartition(d2, k, axis=1)[:, :k]
+            part_d2 = np.take_along_axis(d2, part, axis=1)
+            order = np.argsort(part_d2, axis=1, kind="stable")
+            indices[rows] = np.take_along_axis(part, order, axis=1)
+            distances[rows] = np.sqrt(np.take_along_axis(part_d2, order, axis=1))
+        return indices, distances
+
+    def _result(self, rows, distances):
+        out = self.labels.iloc[rows].reset_index(drop=True)
+        out["distance"] = distances
+        return out
@@ -0,0 +1,392 @@
+"""Ball-by-ball season simulator for the Future Era.
+
+Future seasons are played one delivery at a time. Each delivery's outcome is
+drawn from the ball-outcome model (``winprob.OutcomeModel``, fitted on the
+source eras' deliveries, or its T20 prior where they have none) for the
+phase and wickets down, tilted by who is on strike and who is bowling:
+
+* the batter's strike rate and the bowler's economy, over the source eras'
+  averages, scale every scoring outcome;
+* the batter's balls per dismissal and the bowler's balls per wicket do the
+  same for the wicket;
+* the dot-ball share absorbs the difference.
+
+The model itself is first scaled so that an average batter facing an
+average bowler scores and falls at the source bowlers' economy and strike
+rate.
+
+Players keep their career figures as their skill: the source eras' players
+still active in its last season carry on, as do any named ``anchors``, and
+every squad is filled up with prospects whose figures are drawn from the
+source eras' batters and bowlers (log-normal per figure). Skills drift a
+little from one season to the next.
+
+Each season is a double round robin. All of its matches are simulated at
+once as NumPy arrays, one step per delivery across every innings still in
+progress, and seasons are spread across a process pool. Each season draws
+from its own random stream spawned from ``seed``, so the output is the same
+whatever the number of workers. The result is one era in the nested
+``get_datasets()`` layout (plus ``deliveries``)::
+
+    python -m cricket_vision.simulate --seasons 10 --workers 4
+"""
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cricket_vision.matchups import h2h_from_deliveries
+from cricket_vision.phases import phase_codes
+from cricket_vision.store import tables_from_nested
+from cricket_vision.winprob import (
+    BALLS_PER_INNINGS,
+    OUTCOME_LEGAL,
+    OUTCOME_RUNS,
+    OUTCOME_WICKET,
+    OUTCOMES,
+    fit_outcome_model,
+    wicket_buckets,
+)
+
+# Players per role in a playing XI, in batting order.
+SQUAD = {"Batsman": 5, "All-Rounder": 2, "Bowler": 4}
+BOWLERS_USED = 5  # four overs each
+OVERS = BALLS_PER_INNINGS // 6
+# Standard deviation of each skill's log change from one season to the next.
+SKILL_DRIFT = 0.05
+# Prospects' figures never spread less than this (log scale), however
+# alike the source players are.
+MIN_SPREAD = 0.08
+# A specialist bowler batting: relative scoring and dismissal rate.
+TAIL_RUNS, TAIL_WICKETS = 0.75, 2.5
+MIN_DOT = 0.02
+
+_DOT, _WICKET, _WIDE = OUTCOMES.index("dot"), OUTCOMES.index("wicket"), OUTCOMES.index("wide")
+_SCORING = slice(1, _WICKET)
+_ROTATES = np.isin(np.arange(len(OUTCOMES)), [OUTCOMES.index("1"), OUTCOMES.index("3")])
+_PHASE_OF_OVER = phase_codes(np.arange(OVERS))
+
+# Per player id, each a float array: multipliers on the scoring and wicket
+# probabilities when batting and when bowling.
+Skills = namedtuple("Skills", "bat_runs bat_wickets bowl_runs bowl_wickets")
+
+
+# --- Players ---
+def figures(player):
+    """Strike rate, balls per dismissal, economy and balls per wicket (None where not known)."""
+    stats = player.get("stats", {})
+    bowl_avg = stats.get("avg") if player.get("type") == "Bowler" else stats.get("bowl_avg")
+    bat_avg = None if player.get("type") == "Bowler" else stats.get("avg")
+    sr, econ = stats.get("sr"), stats.get("econ")
+    return {
+        "sr": sr,
+        "balls_per_out": bat_avg / sr * 100 if bat_avg and sr else None,
+        "econ": econ,
+        "balls_per_wicket": bowl_avg / econ * 6 if bowl_avg and econ else None,
+    }
+
+
+def source_distribution(sources):
+    """``{figure: (mean, spread)}`` of each figure's log over every source player."""
+    values = {}
+    for era in sources:
+        for player in era.get("players", {}).values():
+            for name, value in figures(player).items():
+                if value:
+                    values.setdefault(name, []).append(np.log(value))
+    return {name: (float(np.mean(logs)), max(float(np.std(logs)), MIN_SPREAD)) for name, logs in values.items()}
+
+
+def carried_over(sources):
+    """Players of the latest source era who played its last season."""
+    era = sources[-1]
+    last = max((season for p in era.get("players", {}).values() for season in p.get("seasons", {})), default=None)
+    return {name: player for name, player in era.get("players", {}).items() if last in player.get("seasons", {})}
+
+
+def pick_squads(teams, named, distribution, rng):
+    """Fill each team's XI: named players first (in random team order), then prospects.
+
+    Returns ``(names, types, figures_by_id, squads)`` with ``squads`` a
+    ``(teams, 11)`` array of player ids in batting order.
+    """
+    names, types, figs = [], [], []
+    slots = {team: {role: [] for role in SQUAD} for team in teams}
+    for name, player in named.items():
+        role = player.get("type")
+        open_teams = [team for team in teams if len(slots[team].get(role, ())) < SQUAD.get(role, 0)]
+        if not open_teams:
+            continue
+        team = open_teams[int(rng.integers(len(open_teams)))]
+        slots[team][role].append(len(names))
+        names.append(name)
+        types.append(role)
+        figs.append(figures(player))
+    n_prospects = 0
+    for team in teams:
+        for role, size in SQUAD.items():
+            while len(slots[team][role]) < size:
+                n_prospects += 1
+                drawn = {name: float(np.exp(rng.normal(mean, spread))) for name, (mean, spread) in distribution.items()}
+                if role == "Batsman":
+                    drawn["econ"] = drawn["balls_per_wicket"] = None
+                elif role == "Bowler":
+                    drawn["sr"] = drawn["balls_per_out"] = None
+                slots[team][role].append(len(names))
+                names.append(f"Prospect {n_prospects:03d}")
+                types.append(role)
+                figs.append(drawn)
+    squads = np.array([[pid for role in SQUAD for pid in slots[team][role]] for team in teams], dtype=np.int64)
+    return names, types, figs, squads
+
+
+def base_skills(figs, distribution):
+    """Multipliers relative to the source eras' average player."""
+    average = {name: np.exp(mean) for name, (mean, _) in distribution.items()}
+
+    def ratio(value, name, default, invert=False):
+        if not value:
+            return default
+        return average[name] / value if invert else value / average[name]
+
+    return Skills(
+        bat_runs=np.array([ratio(f["sr"], "sr", TAIL_RUNS) for f in figs]),
+        bat_wickets=np.array([ratio(f["balls_per_out"], "balls_per_out", TAIL_WICKETS, invert=True) for f in figs]),
+        bowl_runs=np.array([ratio(f["econ"], "econ", 1.0) for f in figs]),
+        bowl_wickets=np.array([ratio(f["balls_per_wicket"], "balls_per_wicket", 1.0, invert=True) for f in figs]),
+    )
+
+
+def season_skills(base, n_seasons, rng):
+    """``n_seasons`` Skills, each a random-walk step on from the last."""
+    walks = {field: np.exp(np.cumsum(rng.normal(0, SKILL_DRIFT, (n_seasons, len(values))), axis=0)) * values
+             for field, values in base._asdict().items()}
+    return [Skills(**{field: walk[i] for field, walk in walks.items()}) for i in range(n_seasons)]
+
+
+def calibrate(probs, distribution):
+    """Scale the outcome model's scoring and wicket rates to the source bowlers' economy and strike rate."""
+    # One delivery averaged over the innings: phases by their overs, wicket buckets alike.
+    weights = np.bincount(_PHASE_OF_OVER, minlength=len(probs)) / OVERS
+    mean = np.einsum("p,pbo->o", weights, probs) / probs.shape[1]
+    legal = 1 - mean[_WIDE]
+    runs_per_ball = (mean[_SCORING] * OUTCOME_RUNS[_SCORING]).sum() / legal
+    scaled = probs.copy()
+    scaled[..., _SCORING] *= np.exp(distribution["econ"][0]) / 6 / runs_per_ball
+    scaled[..., _WICKET] *= legal / mean[_WICKET] / np.exp(distribution["balls_per_wicket"][0])
+    scaled[..., _DOT] = np.maximum(1 - scaled[..., _DOT + 1:].sum(axis=-1), MIN_DOT)
+    return scaled / scaled.sum(axis=-1, keepdims=True)
+
+
+# --- Matches ---
+def _play_innings(batting, bowling, skills, probs, rng, target=None):
+    """Play one innings of every match at once.
+
+    ``batting`` is ``(matches, 11)`` player ids in order, ``bowling``
+    ``(matches, OVERS)`` the bowler of each over. Returns the deliveries as
+    parallel arrays (in playing order within each match) and the totals.
+    """
+    n = len(batting)
+    runs, wickets, legal = (np.zeros(n, dtype=np.int64) for _ in range(3))
+    striker, other = np.zeros(n, dtype=np.int64), np.ones(n, dtype=np.int64)
+    live = np.arange(n)
+    steps = []
+    while live.size:
+        over = legal[live] // 6
+        batter = batting[live, striker[live]]
+        bowler = bowling[live, over]
+        p = probs[_PHASE_OF_OVER[over], wicket_buckets(wickets[live])]
+        p[:, _SCORING] *= (skills.bat_runs[batter] * skills.bowl_runs[bowler])[:, None]
+        p[:, _WICKET] *= skills.bat_wickets[batter] * skills.bowl_wickets[bowler]
+        p[:, _DOT] = np.maximum(1 - p[:, _DOT + 1:].sum(axis=1), MIN_DOT)
+        cum = np.cumsum(p, axis=1)
+        outcome = (cum < rng.random(live.size)[:, None] * cum[:, -1:]).sum(axis=1)
+        steps.append((live, over, legal[live] % 6 + 1, batter, bowler, outcome))
+
+        runs[live] += OUTCOME_RUNS[outcome]
+        legal[live] += OUTCOME_LEGAL[outcome]
+        wickets[live] += OUTCOME_WICKET[outcome]
+        # The next batter takes the dismissed striker's end; the batters
+        # cross on an odd run and swap ends after the over.
+        on_strike = np.where(OUTCOME_WICKET[outcome] == 1, wickets[live] + 1, striker[live])
+        swap = _ROTATES[outcome] ^ ((OUTCOME_LEGAL[outcome] == 1) & (legal[live] % 6 == 0))
+        striker[live] = np.where(swap, other[live], on_strike)
+        other[live] = np.where(swap, on_strike, other[live])
+
+        done = (legal[live] >= BALLS_PER_INNINGS) | (wickets[live] >= 10)
+        if target is not None:
+            done |= runs[live] >= target[live]
+        live = live[~done]
+
+    match, over, ball, batter, bowler, outcome = (np.concatenate(column) for column in zip(*steps))
+    order = np.argsort(match, kind="stable")
+    balls = {"match": match, "over": over, "ball": ball, "batsman": batter, "bowler": bowler, "outcome": outcome}
+    return {column: values[order] for column, values in balls.items()}, runs
+
+
+def _bowling_orders(squads, teams_bowling, bowl_rank, rng):
+    # The team's five best bowlers, in a random order repeated every five overs.
+    options = np.take_along_axis(squads[teams_bowling], bowl_rank[teams_bowling], axis=1)[:, :BOWLERS_USED]
+    shuffled = np.take_along_axis(options, rng.permuted(np.tile(np.arange(BOWLERS_USED), (len(options), 1)), axis=1), axis=1)
+    return np.tile(shuffled, OVERS // BOWLERS_USED)
+
+
+def simulate_season(fixtures, squads, bowl_rank, skills, probs, seed):
+    """Play every fixture (``(matches, 2)`` team indexes) of one season.
+
+    Returns the deliveries as parallel arrays (``match`` indexes
+    ``fixtures``) and each match's winning team index (-1 for a tie).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(fixtures)
+    bats_first = rng.integers(0, 2, n)
+    first, second = fixtures[np.arange(n), bats_first], fixtures[np.arange(n), 1 - bats_first]
+    innings = []
+    totals = []
+    for innings_no, (batting, fielding) in enumerate(((first, second), (second, first)), start=1):
+        target = totals[0] + 1 if totals else None
+        balls, total = _play_innings(squads[batting], _bowling_orders(squads, fielding, bowl_rank, rng),
+                                     skills, probs, rng, target)
+        balls["innings"] = np.full(len(balls["match"]), innings_no)
+        balls["batting_team"], balls["bowling_team"] = batting[balls["match"]], fielding[balls["match"]]
+        innings.append(balls)
+        totals.append(total)
+    deliveries = {column: np.concatenate([balls[column] for balls in innings]) for column in innings[0]}
+    order = np.lexsort((np.arange(len(deliveries["match"])), deliveries["innings"], deliveries["match"]))
+    winner = np.where(totals[1] > totals[0], second, np.where(totals[1] < totals[0], first, -1))
+    return {column: values[order] for column, values in deliveries.items()}, winner
+
+
+def _simulate_season_args(args):
+    return simulate_season(*args)
+
+
+def fixtures_for(n_teams, rng):
+    """Double round robin, in random order; the first team is at home."""
+    pairs = np.array([(a, b) for a in range(n_teams) for b in range(n_teams) if a != b], dtype=np.int64)
+    return pairs[rng.permutation(len(pairs))]
+
+
+# --- Era ---
+def simulate_era(sources, teams, first_season, n_seasons, name=None, anchors=None, venues=None, seed=0,
+                 workers=None):
+    """Simulate ``n_seasons`` seasons from ``first_season``; returns one era in the ``get_datasets()`` layout.
+
+    ``sources`` are eras in that layout (oldest first). ``anchors`` are extra
+    named players (same layout) to place in squads; ``venues`` maps a team
+    to its home ground.
+    """
+    player_seed, *season_seeds = np.random.SeedSequence(seed).spawn(n_seasons + 1)
+    rng = np.random.default_rng(player_seed)
+    distribution = source_distribution(sources)
+    named = {**carried_over(sources), **(anchors or {})}
+    names, types, figs, squads = pick_squads(teams, named, distribution, rng)
+    skills = season_skills(base_skills(figs, distribution), n_seasons, rng)
+    # Each XI's bowling options, best first: specialists, then all-rounders,
+    # each by fewest balls per wicket.
+    roles = np.array(types)
+    bowler_order = np.select([roles == "Batsman", roles == "All-Rounder"], [np.inf, 100.0], 0.0) + 1 / skills[0].bowl_wickets
+    bowl_rank = np.argsort(bowler_order[squads], axis=1, kind="stable")
+    model = fit_outcome_model(pd.concat([tables_from_nested(era)["deliveries"] for era in sources]))
+    probs = calibrate(model.probs, distribution)
+
+    jobs = [(fixtures_for(len(teams), rng), squads, bowl_rank, skills[i], probs, season_seeds[i])
+            for i in range(n_seasons)]
+    workers = min(workers or os.cpu_count() or 1, n_seasons)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_season_args, jobs))
+    else:
+        results = [simulate_season(*job) for job in jobs]
+    return _assemble(sources, teams, first_season, name, venues or {}, names, types, jobs, results)
+
+
+def _assemble(sources, teams, first_season, name, venues, names, types, jobs, results):
+    teams_arr, names_arr = np.array(teams, dtype=object), np.array(names, dtype=object)
+    matches, parts = [], []
+    for i, ((fixtures, *_), (balls, winner)) in enumerate(zip(jobs, results)):
+        match_ids = len(matches) + np.arange(len(fixtures))
+        for match_id, (home, away), won in zip(match_ids, fixtures, winner):
+            matches.append({"match_id": int(match_id), "season": first_season + i, "team1": teams[home],
+                            "team2": teams[away], "winner": teams[won] if won >= 0 else None,
+                            "venue": venues.get(teams[home], f"{teams[home]} Home Ground")})
+        parts.append({**balls, "match": match_ids[balls["match"]], "season": np.full(len(balls["match"]), first_season + i)})
+    balls = {column: np.concatenate([part[column] for part in parts]) for column in parts[0]}
+
+    outcome = balls["outcome"]
+    legal = OUTCOME_LEGAL[outcome] == 1
+    runs_batter = np.where(legal, OUTCOME_RUNS[outcome], 0)
+    extras = np.where(outcome == _WIDE, OUTCOME_RUNS[outcome], 0)
+    is_wicket = OUTCOME_WICKET[outcome] == 1
+    deliveries = pd.DataFrame({
+        "match_id": balls["match"], "innings": balls["innings"], "over": balls["over"], "ball": balls["ball"],
+        "batting_team": teams_arr[balls["batting_team"]], "bowling_team": teams_arr[balls["bowling_team"]],
+        "batsman": names_arr[balls["batsman"]], "bowler": names_arr[balls["bowler"]],
+        "runs_batter": runs_batter, "extras": extras, "legal": legal, "is_wicket": is_wicket,
+    })
+
+    n = len(names)
+    total = lambda ids, weights: np.bincount(ids, weights=weights, minlength=n).astype(np.int64)
+    bat_runs, balls_faced, outs = (total(balls["batsman"], w) for w in (runs_batter, legal, is_wicket))
+    conceded, balls_bowled, wickets = (total(balls["bowler"], w) for w in (runs_batter + extras, legal, is_wicket))
+    season_code = balls["season"] - first_season
+    n_seasons = len(jobs)
+    season_runs = np.bincount(balls["batsman"] * n_seasons + season_code, weights=runs_batter,
+                              minlength=n * n_seasons).reshape(n, n_seasons).astype(np.int64)
+    season_wickets = np.bincount(balls["bowler"] * n_seasons + season_code, weights=is_wicket,
+                                 minlength=n * n_seasons).reshape(n, n_seasons).astype(np.int64)
+
+    ratio = lambda a, b, scale=1: round(float(scale * a / b), 2) if b else None
+    players = {}
+    for pid, (player, role) in enumerate(zip(names, types)):
+        stats = {}
+        if role != "Bowler":
+            stats.update(runs=int(bat_runs[pid]), avg=ratio(bat_runs[pid], outs[pid]),
+                         sr=ratio(bat_runs[pid], balls_faced[pid], 100), dismissals=int(outs[pid]))
+        if role != "Batsman":
+            stats.update({"wickets": int(wickets[pid]), "econ": ratio(conceded[pid], balls_bowled[pid], 6),
+                          "avg" if role == "Bowler" else "bowl_avg": ratio(conceded[pid], wickets[pid]),
+                          "overs": round(float(balls_bowled[pid] // 6 + balls_bowled[pid] % 6 / 10), 1)})
+        by_season = season_wickets[pid] if role == "Bowler" else season_runs[pid]
+        players[player] = {"type": role, "seasons": {first_season + i: int(v) for i, v in enumerate(by_season)},
+                           "stats": stats, "h2h": {}}
+    for row in h2h_from_deliveries(deliveries).itertuples(index=False):
+        players[row.batsman]["h2h"][row.bowler] = {
+            "runs": int(row.runs), "balls": int(row.balls), "dismissals": int(row.dismissals),
+            "fours": int(row.fours), "sixes": int(row.sixes), "dots": int(row.dots),
+        }
+
+    last_season = first_season + n_seasons - 1
+    return {
+        "name": name or f"Simulated Era ({first_season}-{last_season})",
+        "teams": list(teams),
+        "players": players,
+        "matches": matches,
+        "deliveries": deliveries,
+    }
+
+
+if __name__ == "__main__":
+    from cricket_vision.seed import FUTURE_SEASONS, future_era, recorded_datasets
+    from cricket_vision.store import DATA_DIR, write_era
+
+    parser = argparse.ArgumentParser(description="Simulate the Future Era ball by ball.")
+    parser.add_argument("--seasons", type=int, default=FUTURE_SEASONS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--write", action="store_true", help="write the result to the store as futureData")
+    args = parser.parse_args()
+
+    datasets = recorded_datasets()
+    start = time.perf_counter()
+    era = future_era(datasets, n_seasons=args.seasons, seed=args.seed, workers=args.workers)
+    seconds = time.perf_counter() - start
+    print(f"{era['name']}: {len(era['matches']):,} matches, {len(era['deliveries']):,} deliveries, "
+          f"{len(era['players'])} players in {seconds:.2f} s")
+    if args.write:
+        write_era("futureData", era, order=len(datasets))
+        print(f"Wrote futureData to {DATA_DIR}")
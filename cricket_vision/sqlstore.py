@@ -0,0 +1,213 @@
+"""Embedded SQLite copy of an era for filtered aggregations.
+
+Questions such as "win rate by venue for one team, within a season range"
+or "a batter's numbers at each ground" filter on team, venue, season and
+player before aggregating. Over the era DataFrames each of them is a full
+scan; here they are an index range scan. The file holds three tables:
+
+    matches       one row per match
+    team_results  one row per (team, match): opponent, season, venue, won
+    balls         the deliveries, with each match's season and venue copied on
+
+with indexes on team, venue, season and player. It is built once per era
+version at ``data/.artifacts/sql/<era>-<version>-f<FORMAT>.sqlite`` (the
+version is ``store.era_version``, so it is rebuilt exactly when the data
+changes) and opened read-only and ``immutable``, so SQLite takes no locks.
+
+Queries are the named statements in ``QUERIES``. Each database keeps a
+small pool of connections that any thread may borrow, one query at a time.
+Streamlit runs every rerun on a new thread, so connections are pooled per
+database rather than per thread; SQLite keeps each statement prepared in
+its connection's statement cache, so a rerun only binds parameters and steps.
+Build ahead of time with ``python -m cricket_vision.sqlstore [era ...]``.
+"""
+import os
+import queue
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+FORMAT = 1
+ARTIFACT_DIRNAME = ".artifacts"
+POOL_SIZE = 4  # idle connections kept per database
+
+SCHEMA = """
+CREATE TABLE matches (
+    match_id INTEGER NOT NULL, season INTEGER, team1 TEXT, team2 TEXT, winner TEXT, venue TEXT
+);
+CREATE TABLE team_results (
+    team TEXT NOT NULL, opponent TEXT NOT NULL, match_id INTEGER NOT NULL,
+    season INTEGER, venue TEXT, won INTEGER NOT NULL, decided INTEGER NOT NULL
+);
+CREATE TABLE balls (
+    match_id INTEGER NOT NULL, season INTEGER, venue TEXT, innings INTEGER, over INTEGER,
+    batting_team TEXT, bowling_team TEXT, batsman TEXT, bowler TEXT,
+    runs_batter INTEGER, extras INTEGER, legal INTEGER, is_wicket INTEGER
+);
+"""
+# Created after the bulk insert, which is much faster than maintaining them
+# row by row. They carry every column their queries read, so a query never
+# touches the tables themselves, and rows come out grouped by venue.
+INDEXES = """
+CREATE INDEX matches_match ON matches (match_id);
+CREATE INDEX matches_season ON matches (season);
+CREATE INDEX matches_venue ON matches (venue, season);
+CREATE INDEX team_results_venue ON team_results (team, venue, season, won, decided);
+CREATE INDEX team_results_season ON team_results (team, season, won, decided);
+CREATE INDEX balls_batsman ON balls (batsman, venue, season, match_id, runs_batter, legal, is_wicket);
+CREATE INDEX balls_bowler ON balls (bowler, venue, season, match_id, runs_batter, extras, legal, is_wicket);
+"""
+
+# The aggregations take :first and :last, an inclusive season range (NULL
+# for all seasons); matches with no recorded season are always kept.
+_SEASONS = "(:first IS NULL OR season IS NULL OR season BETWEEN :first AND :last)"
+QUERIES = {
+    "season_span": "SELECT MIN(season) AS first, MAX(season) AS last FROM matches",
+    "team_venues": f"""
+        SELECT venue AS Venue, COUNT(*) AS Matches, SUM(won) AS Won, SUM(decided) - SUM(won) AS Lost,
+               ROUND(100.0 * SUM(won) / NULLIF(SUM(decided), 0), 1) AS "Win %"
+        FROM team_results
+        WHERE team = :team AND venue IS NOT NULL AND {_SEASONS}
+        GROUP BY venue ORDER BY Matches DESC, Venue""",
+    "team_seasons": f"""
+        SELECT season AS Season, COUNT(*) AS Matches, SUM(won) AS Won, SUM(decided) - SUM(won) AS Lost,
+               ROUND(100.0 * SUM(won) / NULLIF(SUM(decided), 0), 1) AS "Win %"
+        FROM team_results
+        WHERE team = :team AND season IS NOT NULL AND {_SEASONS}
+        GROUP BY season ORDER BY season""",
+    "batter_venues": f"""
+        SELECT venue AS Venue, COUNT(DISTINCT match_id) AS Matches, SUM(runs_batter) AS Runs,
+               SUM(legal) AS Balls, ROUND(100.0 * SUM(runs_batter) / NULLIF(SUM(legal), 0), 1) AS "Strike Rate",
+               SUM(is_wicket) AS Dismissals
+        FROM balls
+        WHERE batsman = :player AND {_SEASONS}
+        GROUP BY venue ORDER BY Runs DESC, Venue""",
+    "bowler_venues": f"""
+        SELECT venue AS Venue, COUNT(DISTINCT match_id) AS Matches, SUM(legal) AS Balls,
+               SUM(runs_batter + extras) AS Runs, SUM(is_wicket) AS Wickets,
+               ROUND(6.0 * SUM(runs_batter + extras) / NULLIF(SUM(legal), 0), 2) AS Economy
+        FROM balls
+        WHERE bowler = :player AND {_SEASONS}
+        GROUP BY venue ORDER BY Wickets DESC, Economy, Venue""",
+}
+
+
+def _rows(df):
+    # Plain Python values, NULL for missing ones, as sqlite3 binds them.
+    df = df.astype(object)
+    return df.where(df.notna(), None).itertuples(index=False, name=None)
+
+
+def team_results(matches):
+    """Each match twice, once from each side's point of view."""
+    winner = matches["winner"].astype(object)
+    sides = []
+    for team, opponent in (("team1", "team2"), ("team2", "team1")):
+        sides.append(pd.DataFrame({
+            "team": matches[team].astype(object),
+            "opponent": matches[opponent].astype(object),
+            "match_id": matches["match_id"].astype(object),
+            "season": matches["season"].astype(object),
+            "venue": matches["venue"].astype(object),
+            "won": (winner == matches[team].astype(object)).astype(int),
+            "decided": winner.notna().astype(int),
+        }))
+    return pd.concat(sides, ignore_index=True)
+
+
+def balls(era):
+    columns = ["match_id", "innings", "over", "batting_team", "bowling_team", "batsman", "bowler",
+               "runs_batter", "extras", "legal", "is_wicket"]
+    deliveries = era.deliveries[columns].astype({"legal": int, "is_wicket": int})
+    venues = era.matches[["match_id", "season", "venue"]].drop_duplicates("match_id")
+    merged = deliveries.merge(venues, on="match_id", how="left", sort=False)
+    return merged[["match_id", "season", "venue", *columns[1:]]]
+
+
+def build_database(era, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(suffix=".sqlite", dir=path.parent)
+    os.close(fd)
+    try:
+        with sqlite3.connect(tmp) as conn:
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.executescript(SCHEMA)
+            tables = {"matches": era.matches[["match_id", "season", "team1", "team2", "winner", "venue"]],
+                      "team_results": team_results(era.matches), "balls": balls(era)}
+            for table, df in tables.items():
+                marks = ", ".join("?" * len(df.columns))
+                conn.executemany(f"INSERT INTO {table} VALUES ({marks})", _rows(df))
+            conn.executescript(INDEXES)
+            conn.execute("ANALYZE")
+        conn.close()
+        os.replace(tmp, path)  # readers never see a half-built file
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class EraDatabase:
+    """Read-only access to one era's SQLite file, shareable across threads."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._idle = queue.LifoQueue(maxsize=POOL_SIZE)
+
+    @contextmanager
+    def _connection(self):
+        # Borrow an idle connection (the most recently used, so one is enough
+        # while queries don't overlap) or open another; concurrent queries
+        # each get their own, so none waits on another's scan.
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(f"{self.path.as_uri()}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+        try:
+            yield conn
+        finally:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def query(self, name, **params):
+        """Run the named statement in ``QUERIES``; returns a DataFrame."""
+        params = {"first": None, "last": None, **params}
+        with self._connection() as conn:
+            cursor = conn.execute(QUERIES[name], params)
+            rows = cursor.fetchall()
+        return pd.DataFrame(rows, columns=[column[0] for column in cursor.description])
+
+    def season_span(self):
+        """``(first, last)`` season with a recorded match, or ``None``."""
+        with self._connection() as conn:
+            first, last = conn.execute(QUERIES["season_span"]).fetchone()
+        return None if first is None else (first, last)
+
+
+def database_path(era, data_dir):
+    return Path(data_dir) / ARTIFACT_DIRNAME / "sql" / f"{era.key}-{era.version}-f{FORMAT}.sqlite"
+
+
+def load_or_build(era, data_dir):
+    path = database_path(era, data_dir)
+    if not path.exists():
+        build_database(era, path)
+    return EraDatabase(path)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from cricket_vision.store import DATA_DIR, list_eras, load_era
+
+    for era_key in sys.argv[1:] or list(list_eras()):
+        era = load_era(era_key)
+        start = time.perf_counter()
+        db = load_or_build(era, DATA_DIR)
+        print(f"{era_key}: {db.path} ({db.path.stat().st_size / 2**20:.1f} MB, {time.perf_counter() - start:.1f} s)")
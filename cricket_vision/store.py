@@ -0,0 +1,333 @@
+"""Columnar on-disk store for the era datasets.
+
+Each era lives in its own directory under ``data/``::
+
+    data/<era_key>/era.json          display name, teams and sidebar order
+    data/<era_key>/players.parquet   one row per player, career stats
+    data/<era_key>/seasons.parquet   one row per (player, season)
+    data/<era_key>/h2h.parquet       one row per (batsman, bowler)
+    data/<era_key>/matches.parquet   one row per match
+    data/<era_key>/deliveries.parquet one row per ball (empty if the era has
+                                     no ball-by-ball data)
+
+Listing eras only reads the small ``era.json`` files; the Parquet tables of an
+era are read the first time that era is asked for. Rebuild the files from the
+hand-entered seed data with ``python -m cricket_vision.store``.
+
+The Parquet files are the compressed archive. At load time each era is
+expanded once into an uncompressed Arrow IPC snapshot under
+``data/.snapshots/<era_key>-<version>/`` and memory-mapped from there, so
+every Streamlit worker process reading the same era shares one copy of the
+data through the OS page cache. ``version`` is a hash of the era's files.
+
+Snapshots, and the artifacts other modules build per era version under
+``data/.artifacts/<kind>/<era_key>-<version>...``, are deleted by
+``prune_versions`` once the era has been on a newer version for a while.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+DATA_DIR = Path(os.environ.get("CRICKET_VISION_DATA_DIR", Path(__file__).resolve().parent.parent / "data"))
+SNAPSHOT_DIRNAME = ".snapshots"
+SNAPSHOT_ATTEMPTS = 3
+ARTIFACT_DIRNAME = ".artifacts"  # derived, sqlstore, wptable and projection write here
+# How long an era's files must have been unchanged before the snapshots and
+# artifacts of its older versions are deleted, in seconds. By then every
+# server process watching the same data directory has moved on.
+PRUNE_AFTER = 600.0
+
+BATTING_TYPES = ("Batsman", "All-Rounder")
+BOWLING_TYPES = ("Bowler", "All-Rounder")
+
+# Column -> dtype for every table. Nullable dtypes are used where a stat only
+# applies to some player types (a pure bowler has no strike rate).
+SCHEMAS = {
+    "players": {
+        "player": "string",
+        "type": "category",
+        "runs": "Int32",
+        "bat_avg": "Float64",
+        "sr": "Float64",
+        "dismissals": "Int32",
+        "wickets": "Int32",
+        "econ": "Float64",
+        "bowl_avg": "Float64",
+        "overs": "Float64",
+    },
+    "seasons": {"player": "string", "season": "int16", "value": "int32"},
+    # Boundary and dot counts are only known where the h2h was derived from
+    # ball-by-ball data.
+    "h2h": {
+        "batsman": "string",
+        "bowler": "string",
+        "runs": "int32",
+        "balls": "int32",
+        "dismissals": "int32",
+        "fours": "Int32",
+        "sixes": "Int32",
+        "dots": "Int32",
+    },
+    "matches": {
+        "match_id": "int32",
+        "season": "Int16",
+        "team1": "string",
+        "team2": "string",
+        "winner": "string",
+        "venue": "string",
+    },
+    # Stored in match/innings/over/ball order. 'over' is 0-based (0-19);
+    # 'legal' is False for wides and no-balls.
+    "deliveries": {
+        "match_id": "int32",
+        "innings": "int8",
+        "over": "int8",
+        "ball": "int8",
+        "batting_team": "category",
+        "bowling_team": "category",
+        "batsman": "category",
+        "bowler": "category",
+        "runs_batter": "int8",
+        "extras": "int8",
+        "legal": "bool",
+        "is_wicket": "bool",
+    },
+}
+
+
+# Era tables are backed by read-only memory maps: treat them as immutable and
+# copy before modifying.
+@dataclass(frozen=True)
+class Era:
+    key: str
+    version: str
+    name: str
+    teams: list
+    players: pd.DataFrame  # indexed by player name
+    seasons: pd.DataFrame
+    h2h: pd.DataFrame
+    matches: pd.DataFrame
+    deliveries: pd.DataFrame
+
+
+# --- Reading ---
+def _read_meta(era_dir):
+    with open(era_dir / "era.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_eras(data_dir=DATA_DIR):
+    """Return ``{era_key: display_name}`` in sidebar order without loading any tables."""
+    metas = []
+    for meta_path in Path(data_dir).glob("*/era.json"):
+        meta = _read_meta(meta_path.parent)
+        metas.append((meta.get("order", 0), meta_path.parent.name, meta["name"]))
+    return {key: name for _, key, name in sorted(metas)}
+
+
+def era_version(key, data_dir=DATA_DIR):
+    """Content hash of an era's files; changes whenever any table is rewritten."""
+    era_dir = Path(data_dir) / key
+    digest = hashlib.sha256()
+    for path in [era_dir / "era.json"] + [era_dir / f"{table}.parquet" for table in SCHEMAS]:
+        if path.exists():
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _snapshot_dir(key, version, data_dir):
+    return Path(data_dir) / SNAPSHOT_DIRNAME / f"{key}-{version}"
+
+
+def _build_snapshot(key, version, data_dir):
+    target = _snapshot_dir(key, version, data_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Write into a private temp dir and rename it into place, so concurrent
+    # workers never map a half-written snapshot.
+    tmp = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=target.parent))
+    os.chmod(tmp, 0o755)
+    for table in SCHEMAS:
+        arrow_table = pq.read_table(Path(data_dir) / key / f"{table}.parquet")
+        with ipc.new_file(tmp / f"{table}.arrow", arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+    try:
+        os.rename(tmp, target)
+    except OSError:
+        # Another process won the race; its snapshot is identical.
+        shutil.rmtree(tmp, ignore_errors=True)
+    return target
+
+
+def _arrow_dtype(arrow_type):
+    # Dictionary columns become pandas Categoricals (only the small integer
+    # codes are copied); everything else stays ArrowDtype and keeps pointing
+    # into the memory map.
+    return None if pa.types.is_dictionary(arrow_type) else pd.ArrowDtype(arrow_type)
+
+
+def _map_table(snapshot_dir, table):
+    source = pa.memory_map(str(snapshot_dir / f"{table}.arrow"))
+    return ipc.open_file(source).read_all().to_pandas(types_mapper=_arrow_dtype)
+
+
+def load_era(key, data_dir=DATA_DIR):
+    era_dir = Path(data_dir) / key
+    if not (era_dir / "era.json").exists():
+        raise KeyError(f"Unknown era '{key}' (no {era_dir / 'era.json'})")
+    for _ in range(SNAPSHOT_ATTEMPTS):
+        version = era_version(key, data_dir)
+        meta = _read_meta(era_dir)
+        snapshot_dir = _snapshot_dir(key, version, data_dir)
+        if snapshot_dir.exists():
+            break
+        snapshot_dir = _build_snapshot(key, version, data_dir)
+        # The files may have been rewritten while the snapshot was copied from
+        # them; it is only kept if they still hash to the version it is named for.
+        if era_version(key, data_dir) == version:
+            break
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+    else:
+        raise RuntimeError(f"Era '{key}' kept changing while its snapshot was built")
+    return Era(
+        key=key,
+        version=version,
+        name=meta["name"],
+        teams=list(meta["teams"]),
+        players=_map_table(snapshot_dir, "players").set_index("player"),
+        seasons=_map_table(snapshot_dir, "seasons"),
+        h2h=_map_table(snapshot_dir, "h2h"),
+        matches=_map_table(snapshot_dir, "matches"),
+        deliveries=_map_table(snapshot_dir, "deliveries"),
+    )
+
+
+# --- Pruning ---
+def _era_files(key, data_dir):
+    era_dir = Path(data_dir) / key
+    return [path for path in [era_dir / "era.json"] + [era_dir / f"{table}.parquet" for table in SCHEMAS]
+            if path.exists()]
+
+
+def _is_version(text):
+    return len(text) == 16 and all(c in "0123456789abcdef" for c in text)
+
+
+def prune_versions(key, data_dir=DATA_DIR, current=None, after=PRUNE_AFTER):
+    """Delete the snapshots and artifacts of every version of era ``key`` but ``current``.
+
+    ``current`` defaults to hashing the era's files. Returns the deleted
+    paths, or ``None`` (deleting nothing) while the files changed less than
+    ``after`` seconds ago: other processes may still be on an older version
+    and open its files. Files already mapped stay readable once deleted.
+    """
+    files = _era_files(key, data_dir)
+    if not files:
+        return None
+    changed = max(path.stat().st_mtime for path in files)
+    if time.time() - changed < after:
+        return None
+    current = current or era_version(key, data_dir)
+    data_dir = Path(data_dir)
+    candidates = [*(data_dir / SNAPSHOT_DIRNAME).glob(f"{key}-*"), *(data_dir / ARTIFACT_DIRNAME).glob(f"*/{key}-*")]
+    removed = []
+    for path in candidates:
+        version, rest = path.name[len(key) + 1:len(key) + 17], path.name[len(key) + 17:]
+        if not _is_version(version) or rest[:1] not in ("", "-", ".") or version == current:
+            continue  # not ours (another era's key with a dash), or still in use
+        try:
+            if path.stat().st_mtime >= changed:
+                continue  # built from files written since ``current`` was hashed
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+        except OSError:  # e.g. gone already, or still mapped on Windows
+            continue
+        removed.append(path)
+    return removed
+
+
+# --- Building from the nested seed layout ---
+def tables_from_nested(era_data):
+    """Flatten one era of the nested ``get_datasets()`` layout into typed tables."""
+    players, seasons, h2h = [], [], []
+    for name, data in era_data.get("players", {}).items():
+        stats = data.get("stats", {})
+        ptype = data.get("type")
+        # Pure bowlers keep their bowling average under 'avg'.
+        if ptype == "Bowler":
+            bat_avg, bowl_avg = None, stats.get("avg")
+        else:
+            bat_avg, bowl_avg = stats.get("avg"), stats.get("bowl_avg")
+        players.append({
+            "player": name,
+            "type": ptype,
+            "runs": stats.get("runs"),
+            "bat_avg": bat_avg,
+            "sr": stats.get("sr"),
+            "dismissals": stats.get("dismissals"),
+            "wickets": stats.get("wickets"),
+            "econ": stats.get("econ"),
+            "bowl_avg": bowl_avg,
+            "overs": stats.get("overs"),
+        })
+        for season, value in data.get("seasons", {}).items():
+            seasons.append({"player": name, "season": season, "value": value})
+        for bowler, rec in data.get("h2h", {}).items():
+            h2h.append({"batsman": name, "bowler": bowler, **rec})
+
+    matches = [
+        {"match_id": m.get("match_id", i), "season": m.get("season"), **{k: m.get(k) for k in ("team1", "team2", "winner", "venue")}}
+        for i, m in enumerate(era_data.get("matches", []))
+    ]
+
+    rows = {
+        "players": players,
+        "seasons": seasons,
+        "h2h": h2h,
+        "matches": matches,
+        "deliveries": era_data.get("deliveries", []),
+    }
+    tables = {
+        table: pd.DataFrame(rows[table], columns=list(schema)).astype(schema)
+        for table, schema in SCHEMAS.items()
+    }
+    # Consumers rely on deliveries being grouped by innings in playing order.
+    tables["deliveries"] = tables["deliveries"].sort_values(
+        ["match_id", "innings", "over", "ball"], kind="stable", ignore_index=True
+    )
+    return tables
+
+
+def write_era(key, era_data, data_dir=DATA_DIR, order=0):
+    era_dir = Path(data_dir) / key
+    era_dir.mkdir(parents=True, exist_ok=True)
+    for table, df in tables_from_nested(era_data).items():
+        df.to_parquet(era_dir / f"{table}.parquet", index=False)
+    meta = {"name": era_data["name"], "teams": era_data.get("teams", []), "order": order}
+    with open(era_dir / "era.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+        f.write("\n")
+
+
+def build_store(datasets, data_dir=DATA_DIR):
+    for order, (key, era_data) in enumerate(datasets.items()):
+        write_era(key, era_data, data_dir=data_dir, order=order)
+
+
+if __name__ == "__main__":
+    from cricket_vision.seed import get_datasets
+
+    build_store(get_datasets())
+    print(f"Wrote {', '.join(list_eras())} to {DATA_DIR}")
@@ -0,0 +1,318 @@
+"""Pick up rewritten era files without restarting the server.
+
+Every cached per-era resource (the loaded tables, the derived indexes, the
+models, the SQLite file, the figures) is keyed by the era key *and* the
+era's content version (``store.era_version``), and declares in a
+``ResourceGraph`` which other resources it is computed from::
+
+    era ─┬─ derived ── h2h / rating / matchup figures
+         ├─ outcome_model ── winprob_table ─┐
+         ├─ projection_model ───────────────┴─ live_service
+         ├─ era_db ─┬─ season_span
+         │          └─ query
+         ├─ archetype_figure, season_figure
+         └─ similarity_index (keyed by every era's version)
+
+``EraWatcher`` polls each era directory's file sizes and modification
+times. Once a change has held still for a full poll (so a half-written era
+is never read), it hashes the files; only a new hash counts. The graph
+then, on the watcher's thread:
+
+1. builds the new version of every resource that was in use for the old
+   one, in dependency order, while sessions keep getting the old version;
+2. switches the era to the new version;
+3. evicts the old version's entries, stopping any live feed followers.
+
+Live feed followers are not rebuilt ahead of the switch; the page starts a
+new one for the new version when it next asks. A resource that finds the
+files already hold a newer version than it was asked for raises
+``StaleVersion``, and the graph moves the era on before retrying.
+
+Sessions on other eras use other keys, so none of their entries are
+rebuilt or evicted, and nobody waits on the rebuild.
+
+Once an era has then held still for ``store.PRUNE_AFTER``, the watcher
+deletes the snapshots and artifacts of its older versions
+(``store.prune_versions``).
+"""
+import threading
+from collections import OrderedDict, defaultdict, namedtuple
+from pathlib import Path
+
+from cricket_vision.store import SCHEMAS, era_version, prune_versions
+
+ALL_ERAS = "*"  # era key of resources built from every era
+STALE_RETRIES = 3
+
+Resource = namedtuple("Resource", "fn depends_on warm across_eras on_evict max_entries")
+
+
+class StaleVersion(Exception):
+    """A resource was asked for a version of era ``key`` its files no longer have."""
+
+    def __init__(self, key):
+        super().__init__(f"Era '{key}' changed on disk")
+        self.key = key
+
+
+class ResourceGraph:
+    """Versioned per-era resources and what each is computed from.
+
+    Resources are cached functions called as ``fn(key, version, *args)``
+    with a ``clear(*args)`` method dropping one entry, as
+    ``st.cache_resource`` provides. ``get`` calls one at the era's current
+    version and remembers the call, so a refresh knows exactly which
+    entries exist. Calls are remembered in the same least-recently-used
+    order, and up to the same ``max_entries``, as the cache keeps them.
+    """
+
+    def __init__(self, version_of, era_keys):
+        self._version_of = version_of  # era key -> content version
+        self._era_keys = era_keys  # () -> keys of every era, for ALL_ERAS
+        self._versions = {}
+        self._resources = {}
+        # name -> {(key, version, args): value}, oldest first; the value is
+        # only kept for resources with ``on_evict``.
+        self._calls = defaultdict(OrderedDict)
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+
+    def resource(self, name, depends_on=(), warm=False, across_eras=False, on_evict=None, max_entries=None):
+        """Register a cached function. ``warm`` ones are rebuilt ahead of a switch."""
+        def register(fn):
+            self._resources[name] = Resource(fn, tuple(depends_on), warm, across_eras, on_evict, max_entries)
+            return fn
+        return register
+
+    # --- Versions ---
+    def version(self, key):
+        if key == ALL_ERAS:
+            return tuple((era_key, self.version(era_key)) for era_key in self._era_keys())
+        version = self._versions.get(key)
+        if version is None:
+            # Hashed outside the lock: another thread doing the same is harmless.
+            version = self._version_of(key)
+            with self._lock:
+                version = self._versions.setdefault(key, version)
+        return version
+
+    def known(self, key):
+        return key in self._versions
+
+    # --- Lookups ---
+    def get(self, name, key, *args):
+        """Resource ``name`` of era ``key`` at its current version."""
+        for _ in range(STALE_RETRIES):
+            try:
+                return self.get_at(name, key, self.version(key), *args)
+            except StaleVersion as stale:
+                # The files changed before the watcher noticed; move the era
+                # on now rather than build the new data under the old version.
+                try:
+                    self.refresh(stale.key, self._version_of(stale.key))
+                except StaleVersion:
+                    pass
+        return self.get_at(name, key, self.version(key), *args)
+
+    def get_at(self, name, key, version, *args):
+        """Resource ``name`` at a given version; resources use this for their dependencies."""
+        resource = self._resources[name]
+        value = resource.fn(key, version, *args)
+        kept = value if resource.on_evict is not None else None
+        entry = (key, version, args)
+        with self._lock:
+            calls = self._calls[name]
+            previous = calls.get(entry, kept)
+            calls[entry] = kept
+            calls.move_to_end(entry)
+            dropped = []
+            while resource.max_entries and len(calls) > resource.max_entries:
+                dropped.append(calls.popitem(last=False))
+        if previous is not kept:
+            # The cache had already let the old value go and built this one.
+            resource.on_evict(previous)
+        for old_entry, old_value in dropped:
+            self._drop(name, old_entry, old_value)
+        return value
+
+    def _drop(self, name, entry, value):
+        resource = self._resources[name]
+        if value is not None:
+            resource.on_evict(value)
+        resource.fn.clear(entry[0], entry[1], *entry[2])
+
+    def _take(self, name, key, version, remove=False):
+        # The (entry, value) calls of ``name`` at ``key`` and ``version``.
+        with self._lock:
+            calls = self._calls[name]
+            found = [(entry, value) for entry, value in calls.items() if entry[:2] == (key, version)]
+            if remove:
+                for entry, _ in found:
+                    del calls[entry]
+        return found
+
+    def downstream(self, name):
+        """``name`` and everything computed from it, each after its dependencies."""
+        reached = {name}
+        changed = True
+        while changed:
+            changed = False
+            for other, resource in self._resources.items():
+                if other not in reached and reached.intersection(resource.depends_on):
+                    reached.add(other)
+                    changed = True
+        order = []
+        while len(order) < len(reached):
+            for other in reached:
+                if other not in order and all(dep in order or dep not in reached
+                                              for dep in self._resources[other].depends_on):
+                    order.append(other)
+        return order
+
+    def _entries(self, key, version):
+        # (name, entry key, entry version) of every resource that may have
+        # entries built from era ``key`` at ``version``, dependencies first.
+        entries = []
+        for name in self.downstream("era"):
+            if not self._resources[name].across_eras:
+                entries.append((name, key, version))
+                continue
+            with self._lock:
+                across = {entry[:2] for entry in self._calls[name]}
+            entries.extend((name, entry_key, versions) for entry_key, versions in across
+                           if (key, version) in versions)
+        return entries
+
+    # --- Refresh ---
+    def refresh(self, key, new_version):
+        """Move era ``key`` to ``new_version``; returns whether anything changed.
+
+        Raises ``StaleVersion`` (leaving the era where it was) if the files
+        change again while the new version is being built.
+        """
+        with self._refreshing:
+            old_version = self._versions.get(key)
+            if old_version == new_version:
+                return False
+            if old_version is not None:
+                try:
+                    self._warm(key, old_version, new_version)
+                except StaleVersion:
+                    self.evict(key, new_version)
+                    raise
+            with self._lock:
+                self._versions[key] = new_version
+            if old_version is not None:
+                self.evict(key, old_version)
+            return True
+
+    def _warm(self, key, old_version, new_version):
+        for name, entry_key, version in self._entries(key, old_version):
+            if not self._resources[name].warm:
+                continue
+            next_version = new_version if entry_key == key else tuple(
+                (era_key, new_version if era_key == key else v) for era_key, v in version)
+            for (_, _, args), _ in self._take(name, entry_key, version):
+                self.get_at(name, entry_key, next_version, *args)
+
+    def forget(self, key):
+        """Drop an era that no longer exists, with everything built from it."""
+        with self._lock:
+            version = self._versions.pop(key, None)
+        if version is not None:
+            self.evict(key, version)
+
+    def evict(self, key, version):
+        for name, entry_key, entry_version in self._entries(key, version):
+            for entry, value in self._take(name, entry_key, entry_version, remove=True):
+                self._drop(name, entry, value)
+
+
+# --- Watcher ---
+def _signature(era_dir):
+    # Cheap stand-in for the content hash: name, mtime and size of each file.
+    signature = []
+    for path in [era_dir / "era.json"] + [era_dir / f"{table}.parquet" for table in SCHEMAS]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class EraWatcher:
+    """Polls the era directories every ``interval`` seconds and refreshes ``graph``.
+
+    ``listing`` changes whenever an era is added, removed or has its
+    ``era.json`` rewritten, so the era list can be cached on it.
+    """
+
+    def __init__(self, graph, data_dir, interval=2.0):
+        self.graph = graph
+        self.data_dir = Path(data_dir)
+        self.interval = interval
+        self.error = None
+        self.listing = ()
+        self._signatures = {}  # era key -> last settled signature
+        self._unsettled = {}  # era key -> a newer signature, until it holds for a poll
+        self._pruned = {}  # era key -> signature its older versions were deleted at
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="era-watcher", daemon=True)
+        self.poll()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+                self.prune()
+                self.error = None
+            except Exception as exc:  # keep serving the versions already loaded
+                self.error = exc
+
+    def poll(self):
+        """Check every era once; returns the keys that moved to a new version."""
+        current = {path.parent.name: _signature(path.parent) for path in self.data_dir.glob("*/era.json")}
+        self.listing = tuple(sorted((key, signature[:1]) for key, signature in current.items()))
+        for key in self._signatures.keys() - current.keys():
+            del self._signatures[key]
+            self._unsettled.pop(key, None)
+            self._pruned.pop(key, None)
+            self.graph.forget(key)
+        refreshed = []
+        for key, signature in current.items():
+            known = self._signatures.setdefault(key, signature)
+            if signature == known:
+                self._unsettled.pop(key, None)
+            elif self._unsettled.get(key) != signature:
+                self._unsettled[key] = signature  # still being written, perhaps
+            else:
+                del self._unsettled[key]
+                self._signatures[key] = signature
+                # Eras no session has opened yet are hashed when first opened.
+                try:
+                    if self.graph.known(key) and self.graph.refresh(key, era_version(key, self.data_dir)):
+                        refreshed.append(key)
+                except StaleVersion:
+                    pass  # rewritten again mid-rebuild; the next polls pick that up
+        return refreshed
+
+    def prune(self):
+        """Delete older versions of each settled era, once per version; returns the deleted paths."""
+        removed = []
+        for key, signature in self._signatures.items():
+            if key in self._unsettled or self._pruned.get(key) == signature:
+                continue
+            current = self.graph.version(key) if self.graph.known(key) else None
+            pruned = prune_versions(key, self.data_dir, current)
+            if pruned is not None:  # None: changed too recently to tell
+                self._pruned[key] = signature
+                removed.extend(pruned)
+        return removed
@@ -0,0 +1,150 @@
+"""Monte Carlo win probability for a chasing side.
+
+Ball outcomes are drawn from a table of probabilities conditioned on the
+innings phase and on how many wickets have fallen. The table is estimated
+from an era's deliveries, smoothed towards a generic T20 prior so sparse or
+missing ball-by-ball data still gives sensible odds. Thousands of chases are
+played out together as NumPy arrays, one delivery per step.
+"""
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+
+from cricket_vision.phases import PHASES, phase_codes
+
+# Outcome of a single delivery, as indices into the probability table.
+OUTCOMES = ("dot", "1", "2", "3", "4", "6", "wicket", "wide")
+OUTCOME_RUNS = np.array([0, 1, 2, 3, 4, 6, 0, 1])
+OUTCOME_LEGAL = np.array([1, 1, 1, 1, 1, 1, 1, 0])
+OUTCOME_WICKET = np.array([0, 0, 0, 0, 0, 0, 1, 0])
+
+# Wickets fallen 0-2, 3-5, 6-9.
+WICKET_BUCKET_STARTS = np.array([3, 6])
+N_WICKET_BUCKETS = len(WICKET_BUCKET_STARTS) + 1
+
+BALLS_PER_INNINGS = 120
+
+# Generic T20 outcome rates per phase; rows follow PHASES, columns OUTCOMES.
+PRIOR = np.array([
+    [0.46, 0.28, 0.05, 0.005, 0.14, 0.04, 0.020, 0.005],
+    [0.33, 0.40, 0.08, 0.005, 0.10, 0.05, 0.030, 0.005],
+    [0.28, 0.33, 0.09, 0.005, 0.13, 0.09, 0.070, 0.005],
+])
+PRIOR = PRIOR / PRIOR.sum(axis=1, keepdims=True)
+# How many deliveries' worth of weight the prior carries in each cell.
+PRIOR_STRENGTH = 200.0
+
+
+def wicket_buckets(wickets_down):
+    return np.searchsorted(WICKET_BUCKET_STARTS, np.asarray(wickets_down), side="right")
+
+
+# Outcomes are sampled from a 16-bit random draw through a per-cell inverse
+# CDF table, so probabilities are exact to 1/65536.
+SAMPLE_BITS = 16
+
+
+@dataclass(frozen=True)
+class OutcomeModel:
+    probs: np.ndarray  # (len(PHASES), N_WICKET_BUCKETS, len(OUTCOMES))
+    n_deliveries: int
+
+    @cached_property
+    def sampling_table(self):
+        """``(cells, 2**SAMPLE_BITS)`` table mapping a random draw to an outcome index."""
+        cdf = np.cumsum(self.probs.reshape(-1, len(OUTCOMES)), axis=-1)
+        draws = (np.arange(1 << SAMPLE_BITS) + 0.5) / (1 << SAMPLE_BITS)
+        return np.stack([np.searchsorted(row, draws, side="right") for row in cdf]).clip(max=len(OUTCOMES) - 1).astype(np.int8)
+
+
+def prior_model():
+    probs = np.repeat(PRIOR[:, None, :], N_WICKET_BUCKETS, axis=1)
+    return OutcomeModel(probs=probs, n_deliveries=0)
+
+
+def delivery_outcomes(deliveries):
+    """Map each delivery to an index into OUTCOMES."""
+    runs = deliveries["runs_batter"].to_numpy(dtype=np.int64)
+    outcome = np.select([runs == 0, runs == 1, runs == 2, runs == 3, runs == 4, runs >= 5],
+                        [0, 1, 2, 3, 4, 5], default=0)
+    outcome = np.where(~deliveries["legal"].to_numpy(dtype=bool), 7, outcome)
+    return np.where(deliveries["is_wicket"].to_numpy(dtype=bool), 6, outcome)
+
+
+def wickets_down_before(deliveries):
+    """Wickets already fallen in the innings when each delivery is bowled."""
+    wickets = deliveries["is_wicket"].to_numpy(dtype=np.int64)
+    innings_ids = deliveries["match_id"].to_numpy(dtype=np.int64) * 4 + deliveries["innings"].to_numpy(dtype=np.int64)
+    running = np.cumsum(wickets) - wickets
+    # Subtract the running total at each innings' first delivery
+    # (deliveries are stored grouped by innings).
+    starts = np.flatnonzero(np.r_[True, innings_ids[1:] != innings_ids[:-1]])
+    lengths = np.diff(np.r_[starts, len(wickets)])
+    return running - np.repeat(running[starts], lengths)
+
+
+def fit_outcome_model(deliveries):
+    """Estimate outcome probabilities per (phase, wickets bucket) from deliveries."""
+    if deliveries.empty:
+        return prior_model()
+    n_outcomes = len(OUTCOMES)
+    phase = phase_codes(deliveries["over"].to_numpy(dtype=np.int64))
+    bucket = wicket_buckets(wickets_down_before(deliveries))
+    flat = (phase * N_WICKET_BUCKETS + bucket) * n_outcomes + delivery_outcomes(deliveries)
+    counts = np.bincount(flat, minlength=len(PHASES) * N_WICKET_BUCKETS * n_outcomes)
+    counts = counts.reshape(len(PHASES), N_WICKET_BUCKETS, n_outcomes).astype(np.float64)
+    smoothed = counts + PRIOR[:, None, :] * PRIOR_STRENGTH
+    return OutcomeModel(probs=smoothed / smoothed.sum(axis=-1, keepdims=True), n_deliveries=len(deliveries))
+
+
+@dataclass(frozen=True)
+class WinProbability:
+    win: float
+    low: float
+    high: float
+    n_sims: int
+
+
+def _wilson_interval(p, n, z=1.96):
+    centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def simulate_chase(runs_left, balls_left, wickets_left, model=None, n_sims=10_000, seed=0):
+    """Play out ``n_sims`` chases at once and return the chasing side's win odds (0-1)."""
+    if runs_left <= 0:
+        return WinProbability(1.0, 1.0, 1.0, 0)
+    if wickets_left <= 0 or balls_left <= 0:
+        return WinProbability(0.0, 0.0, 0.0, 0)
+
+    model = model or prior_model()
+    table = model.sampling_table
+    rng = np.random.default_rng(seed)
+    # Lookups replace searchsorted inside the loop.
+    phase_of_ball = phase_codes(np.arange(BALLS_PER_INNINGS + 1) // 6) * N_WICKET_BUCKETS
+    bucket_of_wickets = wicket_buckets(np.arange(11))
+
+    # State of the chases still in progress; finished ones are dropped each step.
+    needed = np.full(n_sims, runs_left, dtype=np.int64)
+    balls = np.full(n_sims, balls_left, dtype=np.int64)
+    wickets_down = np.full(n_sims, 10 - wickets_left, dtype=np.int64)
+    wins = 0
+
+    while needed.size:
+        cell = phase_of_ball[BALLS_PER_INNINGS - balls] + bucket_of_wickets[wickets_down]
+        draw = rng.integers(0, 1 << SAMPLE_BITS, size=needed.size, dtype=np.uint16)
+        outcome = table[cell, draw]
+
+        needed -= OUTCOME_RUNS[outcome]
+        balls -= OUTCOME_LEGAL[outcome]
+        wickets_down += OUTCOME_WICKET[outcome]
+        won = needed <= 0
+        wins += int(won.sum())
+        still = ~won & (balls > 0) & (wickets_down < 10)
+        needed, balls, wickets_down = needed[still], balls[still], wickets_down[still]
+
+    win = wins / n_sims
+    low, high = _wilson_interval(win, n_sims)
+    return WinProbability(win, low, high, n_sims)
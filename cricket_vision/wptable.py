@@ -0,0 +1,139 @@
+"""Precomputed chase win-probability table.
+
+The chase state space is small: runs needed (0-300) x balls left (0-120) x
+wickets in hand (0-10). Instead of simulating on every request, the table is
+filled once per era by dynamic programming over the same ball-outcome model
+the Monte Carlo simulator uses (``winprob.OutcomeModel``), giving the model's
+probability for every state. It is stored quantized as a ``uint16`` ``.npy``
+file (about 0.8 MB, so within ``RESOLUTION`` of the computed value) and
+memory-mapped, so a lookup is an array index.
+
+Tables live under ``data/.artifacts/`` and are named after the era's
+content version (``store.era_version``) they were built from, so a table
+is never read for other data than its own. Build them ahead of time with
+``python -m cricket_vision.wptable [era ...]``.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from cricket_vision.phases import phase_codes
+from cricket_vision.winprob import (
+    BALLS_PER_INNINGS,
+    OUTCOME_LEGAL,
+    OUTCOME_RUNS,
+    OUTCOME_WICKET,
+    OUTCOMES,
+    fit_outcome_model,
+    wicket_buckets,
+)
+
+MAX_RUNS = 300
+SCALE = np.iinfo(np.uint16).max
+RESOLUTION = 0.5 / SCALE  # largest rounding error of a stored probability
+ARTIFACT_DIRNAME = ".artifacts"
+# Terms kept of the wide series in build_table; the first dropped term is
+# below p_wide ** WIDE_TERMS (about 2e-16 at a 5% wide rate).
+WIDE_TERMS = 12
+
+_WIDE = OUTCOMES.index("wide")
+_WICKET = OUTCOMES.index("wicket")
+_SCORING = [i for i in range(len(OUTCOMES)) if OUTCOME_LEGAL[i] and not OUTCOME_WICKET[i]]
+
+
+def build_table(model, max_runs=MAX_RUNS):
+    """Return ``P[wickets_left, balls_left, runs_left]`` as float64 in [0, 1]."""
+    n_w, n_b, n_r = 11, BALLS_PER_INNINGS + 1, max_runs + 1
+    table = np.zeros((n_w, n_b, n_r))
+    table[:, :, 0] = 1.0  # nothing left to score: already won
+    pad = int(OUTCOME_RUNS.max())
+    # Per wickets-in-hand row (1..10), which wickets bucket applies.
+    buckets = wicket_buckets(10 - np.arange(1, n_w))
+
+    for balls_left in range(1, n_b):
+        probs = model.probs[phase_codes((BALLS_PER_INNINGS - balls_left) // 6), buckets]  # (10, outcomes)
+        prev = table[:, balls_left - 1, :]
+        # Left-pad with wins so "runs_left - runs_scored <= 0" reads as 1.
+        padded = np.concatenate([np.ones((n_w, pad)), prev[:, 1:]], axis=1)
+
+        base = np.zeros((n_w - 1, n_r - 1))
+        for o in _SCORING:
+            start = pad - OUTCOME_RUNS[o]
+            base += probs[:, [o]] * padded[1:, start:start + n_r - 1]
+        base += probs[:, [_WICKET]] * prev[:-1, 1:]
+
+        # A wide costs no ball: P[r] = base[r] + p_wide * P[r - 1], P[0] = 1.
+        # Unrolled as a truncated geometric series so it stays vectorized
+        # over r: term k is p_wide**k * base[r - k] (or p_wide**r at r == k).
+        p_wide = probs[:, [_WIDE]]
+        current = base.copy()
+        term = base
+        for k in range(1, WIDE_TERMS):
+            edge = np.full((n_w - 1, 1), 1.0 if k == 1 else 0.0)
+            term = p_wide * np.concatenate([edge, term[:, :-1]], axis=1)
+            current += term
+        table[1:, balls_left, 1:] = current
+    return np.clip(table, 0.0, 1.0)
+
+
+class WinProbTable:
+    """Read-only view over a (memory-mapped) quantized table."""
+
+    def __init__(self, quantized):
+        self._q = quantized
+
+    @property
+    def max_runs(self):
+        return self._q.shape[2] - 1
+
+    def lookup(self, runs_left, balls_left, wickets_left):
+        """Chasing side's win probability (0-1); accepts scalars or NumPy arrays."""
+        runs = np.asarray(runs_left)
+        balls = np.clip(np.asarray(balls_left), 0, BALLS_PER_INNINGS)
+        wickets = np.clip(np.asarray(wickets_left), 0, 10)
+        prob = self._q[wickets, balls, np.clip(runs, 0, self.max_runs)] / SCALE
+        # Beyond the table the chase is out of reach for practical purposes.
+        prob = np.where(runs > self.max_runs, 0.0, prob)
+        prob = np.where(runs <= 0, 1.0, prob)
+        return float(prob) if prob.ndim == 0 else prob
+
+
+def table_path(era, data_dir):
+    return Path(data_dir) / ARTIFACT_DIRNAME / "winprob" / f"{era.key}-{era.version}.npy"
+
+
+def save_table(table, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(suffix=".npy", dir=path.parent)
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, np.round(table * SCALE).astype(np.uint16))
+    os.replace(tmp, path)
+
+
+def load_table(path):
+    return WinProbTable(np.load(path, mmap_mode="r"))
+
+
+def load_or_build(era, data_dir, model_factory=None):
+    """Map the table for this version of the era, building it first if needed.
+
+    ``model_factory`` (default: fit the era's deliveries) is only called
+    when a build is needed.
+    """
+    path = table_path(era, data_dir)
+    if not path.exists():
+        model = model_factory() if model_factory is not None else fit_outcome_model(era.deliveries)
+        save_table(build_table(model), path)
+    return load_table(path)
+
+
+if __name__ == "__main__":
+    from cricket_vision.store import DATA_DIR, list_eras, load_era
+
+    for era_key in sys.argv[1:] or list(list_eras()):
+        era = load_era(era_key)
+        load_or_build(era, DATA_DIR)
+        print(f"{era_key}: {table_path(era, DATA_DIR)}")
@@ -1,128 +1,190 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+
+from cricket_vision.profiling import page_profiler
+from cricket_vision.session import (
+    active_era,
+    get_archetype_figure,
+    get_bowler_mask,
+    get_roster,
+    get_season_figure,
+    get_season_index,
+    get_similarity_index,
+    player_picker,
+    profiling_panel,
+    run_query,
+)
+
+prof = page_profiler("Player Analysis")
 
 # --- Page Setup ---
+prof.section("setup")
 st.set_page_config(page_title="Player Analysis", page_icon="📊", layout="wide")
 st.title("📊 Player Performance Analysis")
 st.markdown("Dive deep into individual player statistics and compare performance archetypes.")
 
 # --- Load Data from Session State ---
+prof.section("load")
 if 'active_data_key' not in st.session_state:
     st.warning("No dataset selected. Please go to the Home page to select a dataset.")
     st.stop()
 
-active_data = st.session_state.datasets[st.session_state.active_data_key]
-players = active_data.get('players', {})
+active_data = active_era()
+players = active_data.players
 
-if not players:
+if players.empty:
     st.warning("No player data available for the selected era.")
     st.stop()
 
 # --- Helper Functions ---
-def get_player_lists(players_dict):
-    batsmen = sorted([p for p, d in players_dict.items() if d.get('type') in ['Batsman', 'All-Rounder']])
-    bowlers = sorted([p for p, d in players_dict.items() if d.get('type') in ['Bowler', 'All-Rounder']])
-    return batsmen, bowlers
-
-batsmen, bowlers = get_player_lists(players)
+def fmt_stat(value, spec=""):
+    return "N/A" if pd.isna(value) else format(value, spec)
+
+def window_summary(key, player, unit, season_range, bowlers_only):
+    # Season figures are runs for batting types and wickets for bowlers.
+    season_index = get_season_index(key)
+    peers = get_bowler_mask(key) if bowlers_only else ~get_bowler_mask(key)
+    if not peers[season_index.players.get_loc(player)]:
+        return None
+    played = season_index.seasons_played(player, *season_range)
+    if not played:
+        return f"No {unit} recorded in {season_range[0]}-{season_range[1]}."
+    rank = season_index.player_rank(player, *season_range, mask=peers)
+    return (f"{season_index.total(player, *season_range)} {unit} in {season_range[0]}-{season_range[1]} "
+            f"({season_index.per_season(player, *season_range):.1f} per season, #{rank} in the era)")
+
+def ground_table(key, query, player, season_range):
+    # From the era's ball-by-ball data, so eras without it show nothing.
+    grounds = run_query(key, query, player=player, first=season_range[0], last=season_range[1])
+    if not grounds.empty:
+        with st.expander(f"By Ground ({season_range[0]}-{season_range[1]})"):
+            st.dataframe(grounds, use_container_width=True, hide_index=True)
 
 # --- Player Selection ---
-col1, col2 = st.columns(2)
-with col1:
-    selected_batsman = st.selectbox("Select a Batsman", batsmen, index=0 if batsmen else -1)
-with col2:
-    selected_bowler = st.selectbox("Select a Bowler", bowlers, index=0 if bowlers else -1)
+# Only the season range is shared by both panels; each player picker lives
+# in its own fragment below, so changing one reruns just that panel.
+prof.section("selection")
+season_index = get_season_index(active_data.key)
+season_range = (season_index.first_season, season_index.last_season)
+if season_index.n_seasons > 1:
+    season_range = st.slider("Season range", season_index.first_season, season_index.last_season, season_range)
 
 st.markdown("---")
 
 # --- Player Stats Display ---
-col_batsman, col_bowler = st.columns(2)
+prof.section("player_stats")
 
-# Batsman Analysis
-with col_batsman:
+@st.fragment
+@prof.fragment("batsman")
+def batsman_panel(key, season_range):
+    roster = get_roster(key)
+    selected_batsman = player_picker(key, "Select a Batsman", "batsmen")
     st.subheader(f"🏏 Batting Analysis: {selected_batsman}")
-    if selected_batsman and selected_batsman in players:
-        player_data = players[selected_batsman]
-        stats = player_data.get('stats', {})
+    if selected_batsman and selected_batsman in roster:
+        stats = roster.record(selected_batsman)
         
         # Display metrics
         metric_cols = st.columns(2)
-        metric_cols[0].metric("Total Runs", f"{stats.get('runs', 'N/A')}")
-        metric_cols[1].metric("Strike Rate", f"{stats.get('sr', 'N/A'):.2f}")
-        metric_cols[0].metric("Batting Avg", f"{stats.get('avg', 'N/A'):.2f}")
-        metric_cols[1].metric("Dismissals", f"{stats.get('dismissals', 'N/A')}")
+        metric_cols[0].metric("Total Runs", fmt_stat(stats['runs']))
+        metric_cols[1].metric("Strike Rate", fmt_stat(stats['sr'], ".2f"))
+        metric_cols[0].metric("Batting Avg", fmt_stat(stats['bat_avg'], ".2f"))
+        metric_cols[1].metric("Dismissals", fmt_stat(stats['dismissals']))
         
         # Chart
-        seasons = player_data.get('seasons', {})
-        if seasons:
-            season_df = pd.DataFrame(list(seasons.items()), columns=['Season', 'Runs'])
-            fig = px.line(season_df, x='Season', y='Runs', title=f"Runs per Season for {selected_batsman}", markers=True)
-            fig.update_layout(height=300)
+        summary = window_summary(key, selected_batsman, "runs", season_range, bowlers_only=False)
+        if summary:
+            st.caption(summary)
+        fig = get_season_figure(key, selected_batsman, season_range, "Runs", "line")
+        if fig is not None:
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No seasonal run data available for this player.")
+        ground_table(key, "batter_venues", selected_batsman, season_range)
     else:
         st.info("Select a batsman to see their analysis.")
 
-# Bowler Analysis
-with col_bowler:
+@st.fragment
+@prof.fragment("bowler")
+def bowler_panel(key, season_range):
+    roster = get_roster(key)
+    selected_bowler = player_picker(key, "Select a Bowler", "bowlers")
     st.subheader(f"🔥 Bowling Analysis: {selected_bowler}")
-    if selected_bowler and selected_bowler in players:
-        player_data = players[selected_bowler]
-        stats = player_data.get('stats', {})
+    if selected_bowler and selected_bowler in roster:
+        stats = roster.record(selected_bowler)
         
         # Display metrics
         metric_cols = st.columns(2)
-        metric_cols[0].metric("Total Wickets", f"{stats.get('wickets', 'N/A')}")
-        metric_cols[1].metric("Economy", f"{stats.get('econ', 'N/A'):.2f}")
-        # Use 'bowl_avg' for all-rounders if 'avg' is batting avg
-        bowl_avg = stats.get('bowl_avg', stats.get('avg', 'N/A'))
-        metric_cols[0].metric("Bowling Avg", f"{bowl_avg:.2f}" if isinstance(bowl_avg, (int, float)) else "N/A")
-        metric_cols[1].metric("Overs Bowled", f"{stats.get('overs', 'N/A')}")
+        metric_cols[0].metric("Total Wickets", fmt_stat(stats['wickets']))
+        metric_cols[1].metric("Economy", fmt_stat(stats['econ'], ".2f"))
+        metric_cols[0].metric("Bowling Avg", fmt_stat(stats['bowl_avg'], ".2f"))
+        metric_cols[1].metric("Overs Bowled", fmt_stat(stats['overs']))
 
         # Chart
-        seasons = player_data.get('seasons', {})
-        if seasons:
-            season_df = pd.DataFrame(list(seasons.items()), columns=['Season', 'Wickets'])
-            fig = px.bar(season_df, x='Season', y='Wickets', title=f"Wickets per Season for {selected_bowler}")
-            fig.update_layout(height=300)
+        summary = window_summary(key, selected_bowler, "wickets", season_range, bowlers_only=True)
+        if summary:
+            st.caption(summary)
+        fig = get_season_figure(key, selected_bowler, season_range, "Wickets", "bar")
+        if fig is not None:
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No seasonal wicket data available for this player.")
+        ground_table(key, "bowler_venues", selected_bowler, season_range)
     else:
         st.info("Select a bowler to see their analysis.")
 
+col_batsman, col_bowler = st.columns(2)
+with col_batsman:
+    batsman_panel(active_data.key, season_range)
+with col_bowler:
+    bowler_panel(active_data.key, season_range)
+
 st.markdown("---")
 
 # --- Player Archetype Analysis ---
+prof.section("archetypes")
 st.subheader("🎯 Player Archetypes (Batsmen)")
 st.markdown("This scatter plot classifies batsmen based on their career strike rate and batting average. The size of the bubble represents the total runs scored.")
 
-archetype_data = []
-for name, data in players.items():
-    if data.get('type') in ['Batsman', 'All-Rounder'] and data.get('stats', {}).get('runs', 0) > 100:
-        stats = data['stats']
-        archetype_data.append({
-            'Player': name,
-            'Average': stats.get('avg', 0),
-            'Strike Rate': stats.get('sr', 0),
-            'Runs': stats.get('runs', 1) # Use 1 to avoid size 0
-        })
-
-if archetype_data:
-    archetype_df = pd.DataFrame(archetype_data)
-    fig = px.scatter(
-        archetype_df,
-        x="Average",
-        y="Strike Rate",
-        size="Runs",
-        color="Player",
-        hover_name="Player",
-        size_max=60,
-        title="Batsman Archetypes: Average vs. Strike Rate"
-    )
-    fig.update_layout(height=500)
-    st.plotly_chart(fig, use_container_width=True)
+# Built once per era; large eras get a WebGL scatter with a density layer.
+archetype_fig = get_archetype_figure(active_data.key)
+if archetype_fig is not None:
+    st.plotly_chart(archetype_fig, use_container_width=True)
 else:
     st.info("Not enough batsman data to generate the archetype plot for this era.")
+
+st.markdown("---")
+
+# --- Similar Players ---
+prof.section("similar_players")
+st.subheader("🧬 Similar Players")
+st.markdown("Nearest players by batting, bowling and season-by-season trajectory, compared on a common scale across every era.")
+
+@st.fragment
+@prof.fragment("similar_players")
+def similar_players_panel(key):
+    sim_cols = st.columns([2, 1, 1])
+    with sim_cols[0]:
+        similar_to = player_picker(key, "Find players similar to")
+    with sim_cols[1]:
+        n_similar = st.slider("How many", 1, 15, 5)
+    with sim_cols[2]:
+        scope = st.radio("Search", ["This era", "All eras"], horizontal=True)
+
+    if similar_to is None:
+        return
+    similar_df = get_similarity_index().query(key, similar_to, k=n_similar, same_era=scope == "This era")
+    if not similar_df.empty:
+        st.dataframe(
+            similar_df[['player', 'era_name', 'type', 'distance']]
+            .rename(columns={'player': 'Player', 'era_name': 'Era', 'type': 'Role', 'distance': 'Distance'})
+            .round({'Distance': 3}),
+            use_container_width=True,
+            hide_index=True,
+        )
+    else:
+        st.info("No comparable players found.")
+
+similar_players_panel(active_data.key)
+
+profiling_panel()
+prof.done()
@@ -1,25 +1,92 @@
 import streamlit as st
-import math
+
+from cricket_vision.live import feeds_enabled
+from cricket_vision.profiling import page_profiler
+from cricket_vision.session import (
+    active_era,
+    get_live_service,
+    get_outcome_model,
+    get_projection_model,
+    get_ratings,
+    get_winprob_table,
+    profiling_panel,
+)
+from cricket_vision.predictor import overs_to_balls, project_first_innings, rating_adjusted_probability
+from cricket_vision.winprob import simulate_chase
+from cricket_vision.wptable import RESOLUTION
+
+prof = page_profiler("Match Predictor")
 
 # --- Page Setup ---
+prof.section("setup")
 st.set_page_config(page_title="Match Predictor", page_icon="🔮", layout="wide")
 st.title("🔮 Match Predictor")
 st.markdown("Use simple models to predict match outcomes and final scores based on live-match scenarios.")
 
 # --- Load Data from Session State ---
+prof.section("load")
 if 'active_data_key' not in st.session_state:
     st.warning("No dataset selected. Please go to the Home page to select a dataset.")
     st.stop()
     
-active_data = st.session_state.datasets[st.session_state.active_data_key]
-teams = active_data.get('teams', [])
+active_data = active_era()
+teams = active_data.teams
 
 if not teams:
     st.warning("No team data available for the selected era.")
     st.stop()
 
-# --- Win Probability Predictor ---
+# --- Live Match ---
+prof.section("live")
+# Only this fragment reruns on its timer; the rest of the page is untouched.
+@st.fragment(run_every=1.0)
+@prof.fragment("live")
+def live_panel(service):
+    snap = service.latest
+    if service.error:
+        st.error(f"Feed stopped: {service.error}")
+    if snap.deliveries_seen == 0:
+        st.info("Waiting for the first delivery...")
+        return
+    st.markdown(f"**{snap.batting_team}** batting against **{snap.bowling_team}** — innings {snap.innings}")
+    cols = st.columns(4)
+    cols[0].metric("Score", f"{snap.runs}/{snap.wickets}")
+    cols[1].metric("Overs", f"{snap.overs:.1f}")
+    if snap.win_prob is not None:
+        cols[2].metric("Target", snap.target)
+        cols[3].metric(f"{snap.batting_team} Win Probability", f"{snap.win_prob * 100:.2f}%")
+    elif snap.projected_score is not None:
+        low, high = snap.projected_range
+        cols[2].metric("Projected Score", f"~{snap.projected_score}", help=f"Likely range {low}–{high}")
+    st.caption(f"{snap.deliveries_seen} deliveries received.")
+
 with st.container(border=True):
+    st.subheader("Live Match")
+    if not feeds_enabled():
+        st.caption("Live feeds are off. Set CRICKET_VISION_FEED_DIR (files) or CRICKET_VISION_FEED_HOSTS "
+                   "(host:port list) on the server to follow one.")
+    else:
+        feed_source = st.text_input(
+            "Ball-by-ball feed",
+            placeholder="feed.jsonl (in the feed directory) or tcp://host:port",
+            help="Replay a stored match with: python -m cricket_vision.live replay <era> <match_id> <feed dir>/<file>",
+        )
+        if feed_source:
+            try:
+                service = get_live_service(active_data.key, feed_source)
+            except ValueError as exc:
+                st.error(f"Can't follow this feed: {exc}")
+            else:
+                live_panel(service)
+
+st.markdown("---")
+
+# --- Win Probability Predictor ---
+prof.section("win_probability")
+# Each predictor is a fragment: editing its inputs reruns only that form.
+@st.fragment
+@prof.fragment("win_probability")
+def win_probability_panel(key, teams):
     st.subheader("Win Probability Predictor (Chasing Team)")
     
     cols = st.columns([2, 2, 1])
@@ -38,33 +105,55 @@ with st.container(border=True):
     with cols[2]:
         wickets = st.number_input("Wickets Down", min_value=0, max_value=10, value=3)
 
-    if st.button("Predict Win Probability", use_container_width=True):
-        if batting_team == bowling_team:
-            st.error("Batting and Bowling teams must be different.")
+    # Odds come from the era's precomputed chase table (an array lookup), so
+    # they are recomputed on every input change rather than behind a button.
+    if batting_team == bowling_team:
+        st.error("Batting and Bowling teams must be different.")
+    else:
+        runs_left = target - score
+        balls_left = 120 - int(overs_to_balls(overs))
+        wickets_left = 10 - wickets
+
+        outcome_model = get_outcome_model(key)
+        wp_table = get_winprob_table(key)
+        if runs_left <= wp_table.max_runs:
+            win_prob = wp_table.lookup(runs_left, balls_left, wickets_left) * 100
+            detail = f"table lookup (±{RESOLUTION * 100:.4f} pts)"
         else:
-            runs_left = target - score
-            balls_left = 120 - (math.floor(overs) * 6 + (overs * 10 % 10))
-            wickets_left = 10 - wickets
-            
-            if runs_left <= 0:
-                win_prob = 100.0
-            elif wickets_left == 0 or balls_left <= 0:
-                win_prob = 0.0
-            else:
-                # Replicating the simple logic from your JS code
-                win_prob = 50 + (wickets_left * 4) - (runs_left / balls_left * 20)
-                win_prob = max(5.0, min(95.0, win_prob))
+            # Outside the table's run range: simulate instead.
+            result = simulate_chase(runs_left, balls_left, wickets_left, model=outcome_model)
+            win_prob = result.win * 100
+            detail = f"95% interval {result.low * 100:.1f}% – {result.high * 100:.1f}% from {result.n_sims:,} simulated chases"
 
-            loss_prob = 100 - win_prob
-            
-            res_cols = st.columns(2)
-            res_cols[0].metric(f"{batting_team} Win Probability", f"{win_prob:.2f}%")
-            res_cols[1].metric(f"{bowling_team} Win Probability", f"{loss_prob:.2f}%")
+        # The chase model only sees the game state; the teams' Elo ratings
+        # say who is playing. Their edge fades out as the chase runs down.
+        ratings = get_ratings(key)
+        rating_prob = ratings.win_probability(batting_team, bowling_team)
+        state_prob = win_prob
+        win_prob = rating_adjusted_probability(win_prob / 100, rating_prob, balls_left) * 100
+        loss_prob = 100 - win_prob
+        
+        res_cols = st.columns(2)
+        res_cols[0].metric(f"{batting_team} Win Probability", f"{win_prob:.2f}%")
+        res_cols[1].metric(f"{bowling_team} Win Probability", f"{loss_prob:.2f}%")
+        source = (f"{outcome_model.n_deliveries:,} deliveries from this era" if outcome_model.n_deliveries
+                  else "generic T20 ball-outcome rates (no ball-by-ball data for this era)")
+        st.caption(f"Ball-by-ball chase model built from {source}: {state_prob:.2f}% on the game state alone, {detail}.")
+        if ratings.n_matches:
+            st.caption(f"Team ratings: {batting_team} {ratings.rating(batting_team):.0f}, {bowling_team} "
+                       f"{ratings.rating(bowling_team):.0f} ({rating_prob * 100:.0f}% pre-match for {batting_team}, "
+                       f"from {ratings.n_matches:,} matches).")
+
+with st.container(border=True):
+    win_probability_panel(active_data.key, teams)
 
 st.markdown("---")
 
 # --- First Innings Score Predictor ---
-with st.container(border=True):
+prof.section("first_innings")
+@st.fragment
+@prof.fragment("first_innings")
+def first_innings_panel(key, teams):
     st.subheader("First Innings Score Predictor")
     
     cols = st.columns(2)
@@ -82,13 +171,18 @@ with st.container(border=True):
         fip_wickets = st.number_input("Wickets Down", min_value=0, max_value=10, value=1, key="fip_wickets")
 
     if st.button("Predict Final Score", use_container_width=True):
-        if fip_overs == 0:
-            predicted_score = 175 # Default from your JS
-        else:
-            current_rr = fip_runs / fip_overs
-            remaining_overs = 20 - fip_overs
-            # Replicating the simple logic from your JS code
-            projected_runs = fip_runs + (remaining_overs * (current_rr + 1.5 - (fip_wickets * 0.1)))
-            predicted_score = round(projected_runs)
+        model = get_projection_model(key)
+        predicted_score, low, high = project_first_innings(fip_runs, fip_overs, fip_wickets, model)
         
         st.metric("Predicted Final Score", f"~{predicted_score} Runs")
+        st.caption(
+            f"Likely range {low}–{high} runs (80% of comparable innings)."
+            if model.n_innings else
+            f"Likely range {low}–{high} runs. No ball-by-ball data in this era, so this is a rule-of-thumb estimate."
+        )
+
+with st.container(border=True):
+    first_innings_panel(active_data.key, teams)
+
+profiling_panel()
+prof.done()
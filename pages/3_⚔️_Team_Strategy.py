@@ -1,27 +1,48 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from cricket_vision.profiling import page_profiler
+from cricket_vision.session import (
+    active_era,
+    get_h2h_index,
+    get_h2h_matrix_figure,
+    get_h2h_pie,
+    get_phase_table,
+    get_rating_history_figure,
+    get_match_season_span,
+    get_ratings,
+    profiling_panel,
+    run_query,
+)
+
+prof = page_profiler("Team Strategy")
 
 # --- Page Setup ---
+prof.section("setup")
 st.set_page_config(page_title="Team Strategy", page_icon="⚔️", layout="wide")
 st.title("⚔️ Team Strategy & Head-to-Head")
 st.markdown("Analyze team rivalries and their performance across different phases of an innings.")
 
 # --- Load Data from Session State ---
+prof.section("load")
 if 'active_data_key' not in st.session_state:
     st.warning("No dataset selected. Please go to the Home page to select a dataset.")
     st.stop()
 
-active_data = st.session_state.datasets[st.session_state.active_data_key]
-teams = active_data.get('teams', [])
-matches = active_data.get('matches', [])
+active_data = active_era()
+teams = active_data.teams
 
 if not teams:
     st.warning("No team data available for the selected era.")
     st.stop()
 
 # --- Head-to-Head Analysis ---
-with st.container(border=True):
+prof.section("h2h")
+# The team picks and their results rerun on their own; the matrix below is
+# one cached figure per era.
+@st.fragment
+@prof.fragment("h2h")
+def h2h_panel(key, teams):
+    h2h_index = get_h2h_index(key)
     st.subheader("Head-to-Head (H2H) Analysis")
     
     col1, col2 = st.columns(2)
@@ -34,18 +55,14 @@ with st.container(border=True):
         if team1 == team2:
             st.error("Please select two different teams.")
         else:
-            relevant_matches = [
-                m for m in matches 
-                if (m['team1'] == team1 and m['team2'] == team2) or \
-                   (m['team1'] == team2 and m['team2'] == team1)
-            ]
+            h2h = h2h_index.lookup(team1, team2)
             
-            if not relevant_matches:
+            if h2h is None:
                 st.warning(f"No H2H data available between {team1} and {team2} for this era.")
             else:
-                total_matches = len(relevant_matches)
-                team1_wins = sum(1 for m in relevant_matches if m['winner'] == team1)
-                team2_wins = sum(1 for m in relevant_matches if m['winner'] == team2)
+                total_matches = h2h['total']
+                team1_wins = h2h['wins'][team1]
+                team2_wins = h2h['wins'][team2]
 
                 res_col1, res_col2 = st.columns([1, 1.5])
                 
@@ -53,57 +70,135 @@ with st.container(border=True):
                     st.metric("Total Matches Played", total_matches)
                     st.metric(f"{team1} Wins", team1_wins)
                     st.metric(f"{team2} Wins", team2_wins)
+                    ratings = get_ratings(key)
+                    st.metric(f"{team1} Rated Win Chance", f"{ratings.win_probability(team1, team2) * 100:.0f}%",
+                              help=f"Elo ratings: {team1} {ratings.rating(team1):.0f}, {team2} {ratings.rating(team2):.0f}")
 
                 with res_col2:
-                    win_data = pd.DataFrame({
-                        'Team': [team1, team2],
-                        'Wins': [team1_wins, team2_wins]
-                    })
-                    fig = px.pie(
-                        win_data, 
-                        names='Team', 
-                        values='Wins', 
-                        title=f'H2H Win Distribution: {team1} vs {team2}',
-                        color='Team',
-                        color_discrete_map={team1: '#2563EB', team2: '#F59E0B'}
-                    )
-                    fig.update_layout(height=350)
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(get_h2h_pie(key, team1, team2), use_container_width=True)
+
+                venue_col, season_col = st.columns(2)
+                with venue_col:
+                    st.markdown("#### By Venue")
+                    st.dataframe(h2h['by_venue'], use_container_width=True, hide_index=True)
+                with season_col:
+                    st.markdown("#### By Season")
+                    if h2h['by_season'].empty:
+                        st.info("No season information recorded for these matches.")
+                    else:
+                        st.dataframe(h2h['by_season'], use_container_width=True, hide_index=True)
+
+with st.container(border=True):
+    h2h_panel(active_data.key, teams)
+    with st.expander("All-Teams H2H Matrix"):
+        st.caption("Wins of the row team against the column team.")
+        st.plotly_chart(get_h2h_matrix_figure(active_data.key), use_container_width=True)
 
 st.markdown("---")
 
-# --- Phase Analysis ---
-# NOTE: This uses mock data, as the original dataset doesn't contain ball-by-ball info.
-# In a real project, this would be computed from a detailed dataset.
-phase_data_mock = {
-    "Mumbai Indians": {
-        "batting": {"Powerplay (1-6)": {"runs": 45, "wickets": 1, "rr": 7.5}, "Middle (7-15)": {"runs": 80, "wickets": 2, "rr": 8.88}, "Death (16-20)": {"runs": 60, "wickets": 2, "rr": 12.0}},
-        "bowling": {"Powerplay (1-6)": {"conceded": 50, "wickets": 2, "econ": 8.33}, "Middle (7-15)": {"conceded": 75, "wickets": 3, "econ": 8.33}, "Death (16-20)": {"conceded": 55, "wickets": 3, "econ": 11.0}}
-    },
-    "Chennai Super Kings": {
-        "batting": {"Powerplay (1-6)": {"runs": 52, "wickets": 0, "rr": 8.67}, "Middle (7-15)": {"runs": 75, "wickets": 3, "rr": 8.33}, "Death (16-20)": {"runs": 65, "wickets": 1, "rr": 13.0}},
-        "bowling": {"Powerplay (1-6)": {"conceded": 48, "wickets": 1, "econ": 8.0}, "Middle (7-15)": {"conceded": 80, "wickets": 2, "econ": 8.88}, "Death (16-20)": {"conceded": 50, "wickets": 4, "econ": 10.0}}
-    }
-}
+# --- Team Ratings ---
+prof.section("ratings")
+# Elo ratings are computed with the era's derived data; the table and the
+# "as of" view are lookups into each team's rating series.
+@st.fragment
+@prof.fragment("ratings")
+def ratings_panel(key, teams):
+    ratings = get_ratings(key)
+    st.subheader("Team Ratings")
+    if not ratings.n_matches:
+        st.info("No match results are recorded for this era, so ratings cannot be computed.")
+        return
+    seasons = ratings.seasons
+    as_of = None
+    if len(seasons) > 1:
+        as_of = st.select_slider("Ratings as of the end of season", seasons, value=seasons[-1])
+
+    table_col, chart_col = st.columns([1, 2])
+    with table_col:
+        st.dataframe(ratings.table(teams, as_of).round({'Rating': 0}), use_container_width=True, hide_index=True)
+    with chart_col:
+        shown = st.multiselect("Teams to chart", teams, default=list(ratings.table(teams)['Team'][:4]))
+        if shown:
+            st.plotly_chart(get_rating_history_figure(key, tuple(shown)), use_container_width=True)
+
+with st.container(border=True):
+    ratings_panel(active_data.key, teams)
+
+st.markdown("---")
+
+# --- Team Form ---
+prof.section("team_form")
+# Filtered aggregations over the era's SQLite file (one indexed query
+# each), cached per team and season range.
+@st.fragment
+@prof.fragment("team_form")
+def team_form_panel(key, teams):
+    st.subheader("Team Form by Venue and Season")
+    team_col, range_col = st.columns([1, 2])
+    with team_col:
+        team = st.selectbox("Select Team for Form", teams)
+    first = last = None
+    span = get_match_season_span(key)
+    if span is not None and span[1] > span[0]:
+        with range_col:
+            first, last = st.slider("Seasons", span[0], span[1], span)
+
+    venues = run_query(key, "team_venues", team=team, first=first, last=last)
+    if venues.empty:
+        st.info(f"No match results recorded for {team} in this era.")
+        return
+    venue_col, season_col = st.columns(2)
+    with venue_col:
+        st.markdown("#### Win Rate by Venue")
+        st.dataframe(venues, use_container_width=True, hide_index=True)
+    with season_col:
+        st.markdown("#### Form by Season")
+        seasons = run_query(key, "team_seasons", team=team, first=first, last=last)
+        if seasons.empty:
+            st.info("No season information recorded for these matches.")
+        else:
+            st.dataframe(seasons, use_container_width=True, hide_index=True)
 
 with st.container(border=True):
+    team_form_panel(active_data.key, teams)
+
+st.markdown("---")
+
+# --- Phase Analysis ---
+prof.section("phases")
+# Aggregated once per era from the ball-by-ball deliveries table; picking a
+# team below is only a dictionary lookup.
+@st.fragment
+@prof.fragment("phases")
+def phase_panel(key, teams):
+    phase_table = get_phase_table(key)
     st.subheader("Performance by Innings Phase")
     selected_team_phase = st.selectbox("Select Team for Phase Analysis", teams)
 
-    if selected_team_phase in phase_data_mock:
-        data = phase_data_mock[selected_team_phase]
+    if not phase_table:
+        st.info("No ball-by-ball data is available for this era, so phase analysis cannot be computed.")
+    elif selected_team_phase in phase_table:
+        data = phase_table[selected_team_phase]
         
         col1, col2 = st.columns(2)
         with col1:
             st.markdown(f"#### Batting by Phase: {selected_team_phase}")
-            batting_df = pd.DataFrame(data['batting']).T.reset_index()
-            batting_df.columns = ["Phase", "Runs", "Wickets", "Run Rate"]
-            st.dataframe(batting_df, use_container_width=True, hide_index=True)
+            if data['batting'] is not None:
+                st.dataframe(data['batting'], use_container_width=True, hide_index=True)
+            else:
+                st.info("No batting deliveries recorded.")
         
         with col2:
             st.markdown(f"#### Bowling by Phase: {selected_team_phase}")
-            bowling_df = pd.DataFrame(data['bowling']).T.reset_index()
-            bowling_df.columns = ["Phase", "Runs Conceded", "Wickets", "Economy"]
-            st.dataframe(bowling_df, use_container_width=True, hide_index=True)
+            if data['bowling'] is not None:
+                st.dataframe(data['bowling'], use_container_width=True, hide_index=True)
+            else:
+                st.info("No bowling deliveries recorded.")
     else:
-        st.info(f"No mock phase data available for {selected_team_phase}. This is a demonstrative feature.")
+        st.info(f"No ball-by-ball data recorded for {selected_team_phase} in this era.")
+
+with st.container(border=True):
+    phase_panel(active_data.key, teams)
+
+profiling_panel()
+prof.done()
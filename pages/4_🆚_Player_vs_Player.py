@@ -1,93 +1,139 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
+
+from cricket_vision.matchups import METRICS, OUTCOMES, ball_outcomes
+from cricket_vision.profiling import page_profiler
+from cricket_vision.session import (
+    active_era,
+    get_matchup_heatmap_figure,
+    get_matchup_matrix,
+    get_outcome_donut,
+    get_player_groups,
+    player_picker,
+    profiling_panel,
+)
+
+prof = page_profiler("Player vs Player")
 
 # --- Page Setup ---
+prof.section("setup")
 st.set_page_config(page_title="Player vs Player", page_icon="🆚", layout="wide")
 st.title("🆚 Player vs. Player (H2H)")
 st.markdown("Analyze the head-to-head battle between a specific batsman and bowler.")
 
 # --- Load Data from Session State ---
+prof.section("load")
 if 'active_data_key' not in st.session_state:
     st.warning("No dataset selected. Please go to the Home page to select a dataset.")
     st.stop()
 
-active_data = st.session_state.datasets[st.session_state.active_data_key]
-players = active_data.get('players', {})
+active_data = active_era()
+players = active_data.players
 
-if not players:
+if players.empty:
     st.warning("No player data available for the selected era.")
     st.stop()
 
-# --- Helper Functions to get player lists ---
-def get_player_lists(players_dict):
-    batsmen = sorted([p for p, d in players_dict.items() if d.get('type') in ['Batsman', 'All-Rounder'] and d.get('h2h')])
-    bowlers = sorted([p for p, d in players_dict.items() if d.get('type') in ['Bowler', 'All-Rounder']])
-    return batsmen, bowlers
-
-batsmen_with_h2h, all_bowlers = get_player_lists(players)
-
-if not batsmen_with_h2h:
+if not get_player_groups(active_data.key).batsmen_with_h2h.any():
     st.info("No simulated Player vs. Player data is available for this era.")
     st.stop()
 
-# --- Selection Boxes ---
-col1, col2 = st.columns(2)
-with col1:
-    selected_batsman = st.selectbox("Select Batsman", batsmen_with_h2h)
-with col2:
-    # Filter bowlers to only those the selected batsman has faced
-    available_bowlers = sorted(list(players[selected_batsman].get('h2h', {}).keys()))
-    if not available_bowlers:
-        st.warning(f"No H2H data found for {selected_batsman}.")
-        st.stop()
-    selected_bowler = st.selectbox("Select Bowler", available_bowlers)
-
-
-st.markdown("---")
-
-# --- H2H Analysis ---
-if selected_batsman and selected_bowler:
-    st.header(f"Matchup: {selected_batsman} (Batsman) vs {selected_bowler} (Bowler)")
-    
-    h2h_data = players[selected_batsman].get('h2h', {}).get(selected_bowler)
-    
-    if not h2h_data:
-        st.warning(f"No specific H2H data found for this matchup.")
-    else:
-        runs = h2h_data.get('runs', 0)
-        balls = h2h_data.get('balls', 0)
-        dismissals = h2h_data.get('dismissals', 0)
-        
-        strike_rate = (runs / balls * 100) if balls > 0 else 0
-        average = (runs / dismissals) if dismissals > 0 else "Not Out"
+# --- Matchup ---
+# Picking players reruns only this fragment; changing the ranking metric
+# reruns only the nested rankings fragment.
+prof.section("matchup")
+
+@st.fragment
+@prof.fragment("rankings")
+def rankings_panel(key, batsman):
+    st.subheader(f"📋 Best & Worst Matchups for {batsman}")
+    rank_metric = st.selectbox("Rank by", ["sr", "avg", "runs", "dismissals"], format_func=METRICS.get, key="rank_metric")
+    best, worst = get_matchup_matrix(key).rank(batsman, metric=rank_metric)
+    rank_columns = {'bowler': 'Bowler', 'runs': 'Runs', 'balls': 'Balls', 'dismissals': 'Dismissals', 'sr': 'Strike Rate', 'avg': 'Average'}
+    best_col, worst_col = st.columns(2)
+    with best_col:
+        st.markdown("#### Best")
+        st.dataframe(best[list(rank_columns)].rename(columns=rank_columns).round(2), use_container_width=True, hide_index=True)
+    with worst_col:
+        st.markdown("#### Worst")
+        st.dataframe(worst[list(rank_columns)].rename(columns=rank_columns).round(2), use_container_width=True, hide_index=True)
+
+@st.fragment
+@prof.fragment("matchup")
+def matchup_panel(key):
+    matchups = get_matchup_matrix(key)
+
+    # Selection Boxes
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_batsman = player_picker(key, "Select Batsman", "batsmen_with_h2h")
+        if selected_batsman is None:
+            return
+    with col2:
+        # Filter bowlers to only those the selected batsman has faced
+        available_bowlers = sorted(matchups.for_batsman(selected_batsman)['bowler'])
+        if not available_bowlers:
+            st.warning(f"No H2H data found for {selected_batsman}.")
+            return
+        selected_bowler = st.selectbox("Select Bowler", available_bowlers)
+
+    st.markdown("---")
+
+    # H2H Analysis
+    if selected_batsman and selected_bowler:
+        st.header(f"Matchup: {selected_batsman} (Batsman) vs {selected_bowler} (Bowler)")
         
-        # Display Metrics
-        metric_cols = st.columns(4)
-        metric_cols[0].metric("Runs Scored", runs)
-        metric_cols[1].metric("Balls Faced", balls)
-        metric_cols[2].metric("Dismissals", dismissals)
-        metric_cols[3].metric("Strike Rate", f"{strike_rate:.2f}")
+        h2h_data = matchups.pair(selected_batsman, selected_bowler)
         
-        if isinstance(average, float):
-            st.metric("Average", f"{average:.2f}")
+        if h2h_data is None:
+            st.warning(f"No specific H2H data found for this matchup.")
         else:
-            st.metric("Average", "∞ (Not Out)")
+            runs = int(h2h_data['runs'])
+            balls = int(h2h_data['balls'])
+            dismissals = int(h2h_data['dismissals'])
+            
+            strike_rate = 0 if pd.isna(h2h_data['sr']) else h2h_data['sr']
+            average = "Not Out" if pd.isna(h2h_data['avg']) else float(h2h_data['avg'])
+            
+            # Display Metrics
+            metric_cols = st.columns(4)
+            metric_cols[0].metric("Runs Scored", runs)
+            metric_cols[1].metric("Balls Faced", balls)
+            metric_cols[2].metric("Dismissals", dismissals)
+            metric_cols[3].metric("Strike Rate", f"{strike_rate:.2f}")
+            
+            if isinstance(average, float):
+                st.metric("Average", f"{average:.2f}")
+            else:
+                st.metric("Average", "∞ (Not Out)")
 
-        # Donut chart for simulated run breakdown
-        st.subheader("Simulated Run Breakdown")
-        
-        # Simulate a breakdown for visualization
-        fours = runs // 6
-        sixes = runs // 10
-        singles = runs - (fours * 4) - (sixes * 6)
-        dots = max(0, balls - (fours + sixes + singles))
-        
-        run_labels = ['Dots', '1s, 2s, 3s', 'Fours', 'Sixes']
-        run_values = [dots, singles, fours, sixes]
-        
-        fig = go.Figure(data=[go.Pie(labels=run_labels, values=run_values, hole=.4,
-                                     marker_colors=['#a0aec0', '#4299e1', '#38b2ac', '#ed64a6'])])
-        fig.update_layout(title_text='Runs Distribution (Simulated)', height=400)
-        st.plotly_chart(fig, use_container_width=True)
+            # Donut chart of ball outcomes: real counts when the era has them,
+            # otherwise a rough split estimated from runs and balls.
+            run_values, estimated = ball_outcomes(h2h_data)
+            breakdown_title = 'Ball Outcomes (Estimated)' if estimated else 'Ball Outcomes'
+            st.subheader(breakdown_title)
+            
+            st.plotly_chart(get_outcome_donut(breakdown_title, OUTCOMES, run_values), use_container_width=True)
+
+    st.markdown("---")
+
+    # Best / Worst Matchups
+    rankings_panel(key, selected_batsman)
+
+matchup_panel(active_data.key)
+
+# --- Matchup Heatmap ---
+prof.section("heatmap")
+
+@st.fragment
+@prof.fragment("heatmap")
+def heatmap_panel(key):
+    heat_metric = st.selectbox("Metric", ["sr", "avg", "runs", "dismissals", "balls"], format_func=METRICS.get, key="heat_metric")
+    st.caption("Limited to the 40 batsmen and 40 bowlers involved in the most deliveries.")
+    st.plotly_chart(get_matchup_heatmap_figure(key, heat_metric, METRICS[heat_metric]), use_container_width=True)
+
+with st.expander("🗺️ Matchup Heatmap (all players)"):
+    heatmap_panel(active_data.key)
 
+profiling_panel()
+prof.done()
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cricket_vision.matchups import MatchupMatrix, ball_outcomes, h2h_from_deliveries
+from cricket_vision.store import SCHEMAS
+
+
+def deliveries(runs, legal):
+    n = len(runs)
+    df = pd.DataFrame({
+        "match_id": 0, "innings": 1, "over": np.arange(n) // 6, "ball": np.arange(n) % 6 + 1,
+        "batting_team": "A", "bowling_team": "B", "batsman": "bat", "bowler": "bowl",
+        "runs_batter": runs, "extras": (~np.asarray(legal)).astype(int), "legal": legal, "is_wicket": False,
+    })
+    return df.astype(SCHEMAS["deliveries"])
+
+
+def outcomes_by_ball(df):
+    # The definition both paths must follow: one slice per legal ball faced.
+    legal = df[df["legal"]]["runs_batter"]
+    return ((legal == 0).sum(), legal.isin([1, 2, 3]).sum(), (legal == 4).sum(), (legal == 6).sum())
+
+
+def test_counted_outcomes_match_the_deliveries():
+    # A four and a six off no-balls are runs, not balls faced.
+    df = deliveries([0, 1, 4, 6, 2, 4, 6, 0, 3, 1], [True, True, True, True, True, False, False, True, True, True])
+    pair = MatchupMatrix.from_h2h(h2h_from_deliveries(df)).pair("bat", "bowl")
+    outcomes, estimated = ball_outcomes(pair)
+    assert not estimated
+    assert outcomes == outcomes_by_ball(df)
+    assert sum(outcomes) == pair["balls"] == 8
+    assert pair["fours"] + pair["sixes"] == 2
+
+
+@pytest.mark.parametrize("runs, balls", [(45, 30), (80, 40), (0, 6), (30, 3), (7, 20)])
+def test_estimated_outcomes_are_balls_too(runs, balls):
+    pair = {"runs": runs, "balls": balls, "dots": np.nan, "fours": np.nan, "sixes": np.nan}
+    outcomes, estimated = ball_outcomes(pair)
+    assert estimated
+    assert min(outcomes) >= 0
+    assert sum(outcomes) == balls
+    assert 4 * outcomes[2] + 6 * outcomes[3] <= runs
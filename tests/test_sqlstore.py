@@ -0,0 +1,46 @@
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+import pandas as pd
+
+from cricket_vision import sqlstore
+from cricket_vision.store import SCHEMAS
+
+
+def era():
+    matches = pd.DataFrame({
+        "match_id": [1, 2], "season": [2020, 2021], "team1": ["A", "B"], "team2": ["B", "A"],
+        "winner": ["A", "A"], "venue": ["Eden", "Wankhede"],
+    })
+    deliveries = pd.DataFrame({
+        "match_id": [1, 1, 2], "innings": 1, "over": 0, "ball": [1, 2, 1], "batting_team": "A",
+        "bowling_team": "B", "batsman": "bat", "bowler": "bowl", "runs_batter": [4, 0, 6],
+        "extras": 0, "legal": True, "is_wicket": [False, True, False],
+    })
+    return SimpleNamespace(key="test", version="v1", matches=matches,
+                           deliveries=deliveries.astype(SCHEMAS["deliveries"]))
+
+
+def test_queries_from_different_threads_share_a_connection(tmp_path, monkeypatch):
+    db = sqlstore.load_or_build(era(), tmp_path)
+    opened = []
+    connect = sqlite3.connect
+
+    def counting_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(sqlite3, "connect", counting_connect)
+    results = []
+    for team in ("A", "B"):
+        # A new thread per query, as Streamlit uses for each rerun.
+        thread = threading.Thread(target=lambda team=team: results.append(db.query("team_venues", team=team)))
+        thread.start()
+        thread.join()
+
+    assert len(opened) == 1
+    assert results[0]["Won"].sum() == 2
+    assert results[1]["Won"].sum() == 0
+    assert db.season_span() == (2020, 2021)
+    assert len(opened) == 1
@@ -0,0 +1,41 @@
+import os
+import time
+
+from cricket_vision.store import PRUNE_AFTER, prune_versions
+
+OLD, CURRENT, NEWER = "0" * 16, "1" * 16, "2" * 16
+
+
+def touch(path, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.suffix:
+        path.mkdir()
+    else:
+        path.write_bytes(b"")
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_prune_keeps_the_current_version_and_newer_builds(tmp_path):
+    now = time.time()
+    changed = now - 2 * PRUNE_AFTER
+    era_json = touch(tmp_path / "era" / "era.json", changed)
+    old = [touch(tmp_path / ".snapshots" / f"era-{OLD}", changed - 60),
+           touch(tmp_path / ".artifacts" / "winprob" / f"era-{OLD}.npy", changed - 60),
+           touch(tmp_path / ".artifacts" / "sql" / f"era-{OLD}-f1.sqlite", changed - 60)]
+    kept = [touch(tmp_path / ".snapshots" / f"era-{CURRENT}", changed - 120),
+            touch(tmp_path / ".artifacts" / "winprob" / f"era-{CURRENT}.npy", changed + 60),
+            # Built by another process from files rewritten since ``current`` was hashed.
+            touch(tmp_path / ".snapshots" / f"era-{NEWER}", now),
+            # Another era whose key starts with this one's.
+            touch(tmp_path / ".artifacts" / "winprob" / f"era-b-{OLD}.npy", changed - 60)]
+
+    assert sorted(prune_versions("era", tmp_path, CURRENT)) == sorted(old)
+    assert not any(path.exists() for path in old)
+    assert all(path.exists() for path in kept)
+
+    # Not until the era has held still for PRUNE_AFTER.
+    os.utime(era_json, (now, now))
+    touch(tmp_path / ".snapshots" / f"era-{OLD}", changed)
+    assert prune_versions("era", tmp_path, CURRENT) is None
+    assert (tmp_path / ".snapshots" / f"era-{OLD}").exists()